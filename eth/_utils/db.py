@@ -1,3 +1,12 @@
+import threading
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    TypeVar,
+)
+import weakref
+
 from eth_typing import (
     Hash32,
 )
@@ -5,6 +14,7 @@ from eth_typing import (
 from eth.abc import (
     BlockHeaderAPI,
     ChainDatabaseAPI,
+    DatabaseAPI,
     StateAPI,
 )
 from eth.typing import (
@@ -34,3 +44,42 @@ def apply_state_dict(state: StateAPI, state_dict: AccountState) -> None:
 
         for slot, value in account_data["storage"].items():
             state.set_storage(account, slot, value)
+
+
+TCache = TypeVar('TCache')
+
+
+class CachesByDatabase(Generic[TCache]):
+    """
+    A cache for each database, made by ``cache_factory`` when it is first needed, and
+    dropped once the database is garbage collected. A cache never outlives its database, so
+    it never serves a value to another database that may not hold it.
+
+    Databases are mutable mappings, which can't be hashed, so they are told apart by
+    identity.
+    """
+    def __init__(self, cache_factory: Callable[[], TCache]) -> None:
+        self._cache_factory = cache_factory
+        self._caches: Dict[int, TCache] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, db: DatabaseAPI) -> TCache:
+        with self._lock:
+            try:
+                return self._caches[id(db)]
+            except KeyError:
+                cache = self._cache_factory()
+                self._caches[id(db)] = cache
+                # A new database may get the same id once this one is collected
+                weakref.finalize(db, self._caches.pop, id(db), None)
+                return cache
+
+    def __len__(self) -> int:
+        return len(self._caches)
+
+    def clear(self) -> None:
+        """
+        Drop the caches of all the databases.
+        """
+        with self._lock:
+            self._caches.clear()
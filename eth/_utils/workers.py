@@ -0,0 +1,76 @@
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+)
+import multiprocessing
+import os
+import sys
+import threading
+from typing import (
+    Any,
+    Callable,
+    TypeVar,
+)
+
+
+TReturn = TypeVar('TReturn')
+
+
+class WorkerPool(Executor):
+    """
+    An executor that runs the work in a pool of worker processes. The processes are only
+    started when work is first submitted, and are stopped by :meth:`shutdown`, so a pool
+    that is never used costs nothing.
+
+    The workers are spawned rather than forked, so that they don't inherit the threads,
+    locks and open databases of this process. Everything they need has to be sent along
+    with the work.
+    """
+    def __init__(self, max_workers: int = None, start_method: str = 'spawn') -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._start_method = start_method
+        self._executor: ProcessPoolExecutor = None
+        self._is_shut_down = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Whether the worker processes were started, and not stopped yet.
+        """
+        return self._executor is not None
+
+    def submit(self,
+               __fn: Callable[..., TReturn],
+               *args: Any,
+               **kwargs: Any) -> 'Future[TReturn]':
+        with self._lock:
+            if self._is_shut_down:
+                raise RuntimeError("Cannot submit work to a worker pool after it was shut down")
+            if self._executor is None:
+                self._executor = self._start()
+            return self._executor.submit(__fn, *args, **kwargs)
+
+    def _start(self) -> ProcessPoolExecutor:
+        if sys.version_info >= (3, 7):
+            return ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=multiprocessing.get_context(self._start_method),
+            )
+        else:
+            # Before python 3.7, the workers can only be started with the default method
+            return ProcessPoolExecutor(self.max_workers)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._is_shut_down = True
+            executor, self._executor = self._executor, None
+
+        if executor is None:
+            pass
+        elif cancel_futures:
+            # only available since python 3.9
+            executor.shutdown(wait, cancel_futures=True)
+        else:
+            executor.shutdown(wait)
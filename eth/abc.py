@@ -2,6 +2,7 @@ from abc import (
     ABC,
     abstractmethod
 )
+from concurrent.futures import Executor
 from typing import (
     Any,
     Callable,
@@ -30,7 +31,10 @@ from eth_typing import (
     Hash32,
 )
 
-from eth_utils import ExtendedDebugLogger
+from eth_utils import (
+    ExtendedDebugLogger,
+    ValidationError,
+)
 
 from eth_keys.datatypes import PrivateKey
 
@@ -484,13 +488,28 @@ class BlockImportResult(NamedTuple):
     """
     After importing and persisting a block into the active chain, this information
     becomes available.
+
+    The blocks that were added to or removed from the canonical chain may only be
+    read from the database when they are accessed.
     """
     imported_block: BlockAPI
-    new_canonical_blocks: Tuple[BlockAPI, ...]
-    old_canonical_blocks: Tuple[BlockAPI, ...]
+    new_canonical_blocks: Sequence[BlockAPI]
+    old_canonical_blocks: Sequence[BlockAPI]
     meta_witness: MetaWitnessAPI
 
 
+class LogMatch(NamedTuple):
+    """
+    A log on the canonical chain that matched a log query.
+    """
+    block_number: BlockNumber
+    block_hash: Hash32
+    transaction_index: int
+    # position of the log among all the logs of the block
+    log_index: int
+    log: LogAPI
+
+
 class SchemaAPI(ABC):
     """
     A class representing a database schema that maps values to lookup keys.
@@ -535,6 +554,50 @@ class SchemaAPI(ABC):
         """
         ...
 
+    @staticmethod
+    @abstractmethod
+    def make_transaction_root_to_transactions_lookup_key(transaction_root: Hash32) -> bytes:
+        """
+        Return the lookup key to retrieve all the encoded transactions of a transaction trie
+        at once, from its root hash.
+        """
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def make_receipt_root_to_receipts_lookup_key(receipt_root: Hash32) -> bytes:
+        """
+        Return the lookup key to retrieve all the encoded receipts of a receipt trie
+        at once, from its root hash.
+        """
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def make_bloom_bits_lookup_key(bit: int, section: int) -> bytes:
+        """
+        Return the lookup key to retrieve the rotated bloom bit of a section of the
+        canonical chain.
+        """
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def make_bloom_bits_section_head_lookup_key(section: int) -> bytes:
+        """
+        Return the lookup key to retrieve the hash of the last block of a section whose
+        bloom bits were indexed.
+        """
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def make_code_hash_to_size_lookup_key(code_hash: Hash32) -> bytes:
+        """
+        Return the lookup key to retrieve the size of the code with the given hash.
+        """
+        ...
+
 
 class DatabaseAPI(MutableMapping[bytes, bytes], ABC):
     """
@@ -703,6 +766,20 @@ class HeaderDatabaseAPI(ABC):
         """
         ...
 
+    @abstractmethod
+    def persist_header_chain_in_batches(self,
+                                        headers: Iterable[BlockHeaderAPI],
+                                        genesis_parent_hash: Hash32 = None,
+                                        batch_size: int = None) -> None:
+        """
+        Persist a long chain of headers in the database, committing every ``batch_size``
+        headers in a separate atomic batch.
+
+        :param genesis_parent_hash: *optional* parent hash of the block that is treated as
+            genesis, like in :meth:`persist_header_chain`
+        """
+        ...
+
 
 class ChainDatabaseAPI(HeaderDatabaseAPI):
     """
@@ -798,6 +875,26 @@ class ChainDatabaseAPI(HeaderDatabaseAPI):
         """
         ...
 
+    @abstractmethod
+    def persist_transactions(self, transactions: Sequence[SignedTransactionAPI]) -> Hash32:
+        """
+        Persist the trie of the given transactions, along with a flat copy of the list
+        that can be read back in a single lookup.
+
+        Return the `transaction_root` of the transactions.
+        """
+        ...
+
+    @abstractmethod
+    def persist_receipts(self, receipts: Sequence[ReceiptAPI]) -> Hash32:
+        """
+        Persist the trie of the given receipts, along with a flat copy of the list
+        that can be read back in a single lookup.
+
+        Return the `receipt_root` of the receipts.
+        """
+        ...
+
     @abstractmethod
     def get_block_transactions(
             self,
@@ -862,6 +959,27 @@ class ChainDatabaseAPI(HeaderDatabaseAPI):
         """
         ...
 
+    #
+    # Log API
+    #
+    @abstractmethod
+    def get_logs(
+            self,
+            from_block: BlockNumber,
+            to_block: BlockNumber,
+            addresses: Sequence[Address] = (),
+            topics: Sequence[Optional[Sequence[int]]] = ()) -> Iterable[LogMatch]:
+        """
+        Return the logs of the canonical chain between ``from_block`` and ``to_block``,
+        inclusive, that match the filter, in the order they were emitted.
+
+        :param addresses: the log must come from one of these addresses, or any address
+            if empty
+        :param topics: for each position, the log topic must be one of the given topics,
+            or any topic if ``None`` or empty
+        """
+        ...
+
     #
     # Raw Database API
     #
@@ -1983,6 +2101,15 @@ class AccountDatabaseAPI(ABC):
         """
         ...
 
+    def get_code_size(self, address: Address) -> int:
+        """
+        Return the size of the code at ``address``, without loading the code when the
+        size is already known.
+
+        By default, the code is loaded to take its size.
+        """
+        return len(self.get_code(address))
+
     @abstractmethod
     def get_code_hash(self, address: Address) -> Hash32:
         """
@@ -2103,6 +2230,18 @@ class AccountDatabaseAPI(ABC):
         """
         ...
 
+    def fork(self) -> 'AccountDatabaseAPI':
+        """
+        Return a new, independent account database at the current state root, that reads
+        the same underlying database. Changes made to either one are not seen by the other.
+
+        The fork does not track the witness. Only an account database without pending
+        changes can be forked: persist it first.
+
+        Account databases that don't support forking raise ``NotImplementedError``.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be forked")
+
 
 class TransactionExecutorAPI(ABC):
     """
@@ -2369,6 +2508,14 @@ class StateAPI(ConfigurableAPI):
         """
         ...
 
+    def get_code_size(self, address: Address) -> int:
+        """
+        Return the size of the code at ``address``.
+
+        By default, the code is loaded to take its size.
+        """
+        return len(self.get_code(address))
+
     @abstractmethod
     def get_code_hash(self, address: Address) -> Hash32:
         """
@@ -2456,6 +2603,23 @@ class StateAPI(ConfigurableAPI):
         """
         ...
 
+    def fork(self, ephemeral: bool = False) -> 'StateAPI':
+        """
+        Return a new state at the current state root, whose changes are independent of this
+        one's, for example to simulate transactions. Creating it is cheap: the fork reads
+        the same database and shares the process-wide caches.
+
+        Only a state without pending changes can be forked. See
+        :meth:`eth.abc.AccountDatabaseAPI.fork`.
+
+        :param ephemeral: keep the changes of the fork in an
+            :class:`~eth.db.ephemeral.EphemeralAccountDB`, which makes execution cheaper
+            when the changes are going to be thrown away. They can't be persisted.
+
+        States that don't support forking raise ``NotImplementedError``.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be forked")
+
     #
     # Access self.prev_hashes (Read-only)
     #
@@ -2551,6 +2715,11 @@ class ConsensusContextAPI(ABC):
     instantiated once per chain instance and stays in memory across VM runs.
     """
 
+    # Worker processes that expensive checks, like seal checks, can be handed to. They
+    # belong to the context, and are stopped by close(). Without them, all the work is
+    # done in the current process.
+    worker_pool: Optional[Executor] = None
+
     @abstractmethod
     def __init__(self, db: AtomicDatabaseAPI) -> None:
         """
@@ -2558,6 +2727,14 @@ class ConsensusContextAPI(ABC):
         """
         ...
 
+    def close(self) -> None:
+        """
+        Stop the worker processes of the context, if it has any. No more work can be
+        handed to them afterwards.
+        """
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+
 
 class ConsensusAPI(ABC):
     """
@@ -2589,6 +2766,16 @@ class ConsensusAPI(ABC):
         """
         ...
 
+    def validate_seals(self, headers: Sequence[BlockHeaderAPI]) -> None:
+        """
+        Validate the seals on the given headers, even if their parents are missing.
+
+        By default, each seal is validated in turn with :meth:`validate_seal`. Consensus
+        schemes that can check many seals faster at once should override this.
+        """
+        for header in headers:
+            self.validate_seal(header)
+
     @classmethod
     @abstractmethod
     def get_fee_recipient(cls, header: BlockHeaderAPI) -> Address:
@@ -2622,9 +2809,13 @@ class VirtualMachineAPI(ConfigurableAPI):
                  header: BlockHeaderAPI,
                  chaindb: ChainDatabaseAPI,
                  chain_context: ChainContextAPI,
-                 consensus_context: ConsensusContextAPI) -> None:
+                 consensus_context: ConsensusContextAPI,
+                 previous_hashes: Iterable[Hash32] = None) -> None:
         """
         Initialize the virtual machine.
+
+        :param previous_hashes: the hashes of the ancestors of ``header``, newest first. If
+            not provided, they are looked up in ``chaindb`` when they are needed.
         """
         ...
 
@@ -3032,6 +3223,16 @@ class VirtualMachineAPI(ConfigurableAPI):
         """
         ...
 
+    @abstractmethod
+    def validate_seals(self, headers: Sequence[BlockHeaderAPI]) -> None:
+        """
+        Validate the seals on the given headers, which must all use the rules of this VM.
+        This may be faster than validating them one at a time.
+
+        If several seals are invalid, the error of the first one is raised.
+        """
+        ...
+
     @abstractmethod
     def validate_seal_extension(self,
                                 header: BlockHeaderAPI,
@@ -3066,10 +3267,14 @@ class VirtualMachineAPI(ConfigurableAPI):
         ...
 
     @abstractmethod
-    def state_in_temp_block(self) -> ContextManager[StateAPI]:
+    def state_in_temp_block(self, ephemeral: bool = False) -> ContextManager[StateAPI]:
         """
         Return a :class:`~typing.ContextManager` with the current state wrapped in a temporary
         block.
+
+        :param ephemeral: execute on an ephemeral fork of the state, see
+            :meth:`eth.abc.StateAPI.fork`. Use it when the changes are only inspected
+            while in the context, like with ``eth_call``.
         """
         ...
 
@@ -3212,6 +3417,15 @@ class ChainAPI(ConfigurableAPI):
         """
         ...
 
+    def close(self) -> None:
+        """
+        Release what the chain holds besides its database, like the worker processes of
+        its consensus. The chain should not be used anymore afterwards.
+
+        By default, there is nothing to release.
+        """
+        pass
+
     #
     # Chain API
     #
@@ -3488,6 +3702,25 @@ class ChainAPI(ConfigurableAPI):
         """
         ...
 
+    @abstractmethod
+    def estimate_gas_batch(
+            self,
+            transactions: Sequence[SignedTransactionAPI],
+            at_header: BlockHeaderAPI = None,
+            max_workers: int = 1) -> Tuple[Union[int, VMError, ValidationError], ...]:
+        """
+        Estimate the gas of each of the ``transactions`` on top of the block specified by
+        ``at_header``, like :meth:`estimate_gas`, and return the estimates in order. The
+        estimate of a transaction that fails is replaced by its ``VMError`` or
+        ``ValidationError``.
+
+        The state is built once, and each transaction runs in its own ephemeral fork of
+        it, so the accounts and storage read by one estimate are cached for the next ones.
+        With ``max_workers`` above 1, the estimates run in that many threads, each with
+        its own fork of the state and its own cached accounts.
+        """
+        ...
+
     @abstractmethod
     def import_block(self,
                      block: BlockAPI,
@@ -3497,8 +3730,28 @@ class ChainAPI(ConfigurableAPI):
         Import the given ``block`` and return a 3-tuple
 
         - the imported block
-        - a tuple of blocks which are now part of the canonical chain.
-        - a tuple of blocks which were canonical and now are no longer canonical.
+        - a sequence of blocks which are now part of the canonical chain.
+        - a sequence of blocks which were canonical and now are no longer canonical.
+        """
+        ...
+
+    @abstractmethod
+    def import_blocks(self,
+                      blocks: Iterable[BlockAPI],
+                      perform_validation: bool=True,
+                      persist_every: int=64,
+                      ) -> Tuple[BlockImportResult, ...]:
+        """
+        Import the given ``blocks`` in order, like :meth:`import_block`, and return the
+        result of each import.
+
+        The headers, bodies and state of the blocks are kept in memory, and written to
+        the database in a single atomic batch every ``persist_every`` blocks. If a block
+        fails to import, the blocks before it are still written before the error is
+        raised.
+
+        The transaction senders of the next few blocks are recovered in the
+        :attr:`ConsensusContextAPI.worker_pool` while a block is imported.
         """
         ...
 
@@ -3558,6 +3811,8 @@ class ChainAPI(ConfigurableAPI):
         By default, check the seal validity (Proof-of-Work on Ethereum 1.x mainnet) of all headers.
         This can be expensive. Instead, check a random sample of seals using
         seal_check_random_sample_rate.
+
+        The seals are checked together, after the other checks of every header passed.
         """
         ...
 
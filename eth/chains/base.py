@@ -1,13 +1,25 @@
+from collections import deque
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+import itertools
 import operator
+from queue import Queue
 import random
 from typing import (
     Any,
     Callable,
+    Deque,
     Dict,
     Iterable,
+    List,
+    Optional,
     Sequence,
     Tuple,
     Type,
+    Union,
+    overload,
 )
 
 import logging
@@ -22,6 +34,7 @@ from eth_utils import (
 )
 from eth_utils.toolz import (
     concatv,
+    peek,
     sliding_window,
 )
 
@@ -59,9 +72,11 @@ from eth.consensus import (
 )
 from eth.constants import (
     EMPTY_UNCLE_HASH,
+    MAX_PREV_HEADER_DEPTH,
     MAX_UNCLE_DEPTH,
 )
 
+from eth.db.atomic import AtomicDB
 from eth.db.chain import (
     ChainDB,
 )
@@ -75,6 +90,7 @@ from eth.estimators import (
 from eth.exceptions import (
     HeaderNotFound,
     TransactionNotFound,
+    VMError,
     VMNotFound,
 )
 
@@ -157,23 +173,26 @@ class BaseChain(Configurable, ChainAPI):
 
         header_pairs = sliding_window(2, concatv([root], descendants))
 
-        for index, (parent, child) in enumerate(header_pairs):
+        for parent, child in header_pairs:
             if child.parent_hash != parent.hash:
                 raise ValidationError(
                     f"Invalid header chain; {child} has parent {encode_hex(child.parent_hash)},"
                     f" but expected {encode_hex(parent.hash)}"
                 )
-            should_check_seal = index in indices_to_check_seal
-            vm = self.get_vm(child)
             try:
-                vm.validate_header(child, parent)
+                self.get_vm_class(child).validate_header(child, parent)
             except ValidationError as exc:
                 raise ValidationError(
                     f"{child} is not a valid child of {parent}: {exc}"
                 ) from exc
 
-            if should_check_seal:
-                vm.validate_seal(child)
+        # Checking the seals is the expensive part, so check them all at once
+        headers_to_check_seal = tuple(
+            descendants[index] for index in sorted(indices_to_check_seal)
+        )
+        for _, vm_headers in itertools.groupby(headers_to_check_seal, self.get_vm_class):
+            vm_headers_tuple = tuple(vm_headers)
+            self.get_vm(vm_headers_tuple[0]).validate_seals(vm_headers_tuple)
 
     def validate_chain_extension(self, headers: Tuple[BlockHeaderAPI, ...]) -> None:
         for index, header in enumerate(headers):
@@ -184,10 +203,95 @@ class BaseChain(Configurable, ChainAPI):
             vm.validate_seal_extension(header, parents)
 
 
+class LazyBlockSequence(Sequence[BlockAPI]):
+    """
+    The blocks with the given hashes, in order. A block is only read from the database
+    the first time it is accessed, while the hashes are always available.
+    """
+    def __init__(self,
+                 hashes: Tuple[Hash32, ...],
+                 get_block_by_hash: Callable[[Hash32], BlockAPI],
+                 known_blocks: Iterable[BlockAPI] = ()) -> None:
+        """
+        :param known_blocks: blocks that are already loaded, and don't need to be read
+        """
+        self.hashes = hashes
+        self._get_block_by_hash = get_block_by_hash
+        self._blocks = {block.hash: block for block in known_blocks}
+
+    @overload
+    def __getitem__(self, index: int) -> BlockAPI:
+        ...
+
+    @overload  # noqa: F811
+    def __getitem__(self, index: slice) -> Tuple[BlockAPI, ...]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BlockAPI, Tuple[BlockAPI, ...]]:  # noqa: F811, E501
+        if isinstance(index, slice):
+            return tuple(self._get_block(block_hash) for block_hash in self.hashes[index])
+        else:
+            return self._get_block(self.hashes[index])
+
+    def _get_block(self, block_hash: Hash32) -> BlockAPI:
+        try:
+            return self._blocks[block_hash]
+        except KeyError:
+            block = self._get_block_by_hash(block_hash)
+            self._blocks[block_hash] = block
+            return block
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyBlockSequence):
+            return self.hashes == other.hashes
+        elif isinstance(other, Sequence):
+            return tuple(self) == tuple(other)
+        else:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        # Equal to a tuple of the same blocks, so it must hash like one. That reads all
+        # the blocks from the database.
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(encode_hex(h) for h in self.hashes)})"
+
+
+def _recover_senders(transactions: Sequence[SignedTransactionAPI]) -> Tuple[Address, ...]:
+    """
+    Recover the senders of the transactions, up to the first one that has no valid sender.
+    """
+    senders = []
+    for transaction in transactions:
+        try:
+            senders.append(transaction.get_sender())
+        except Exception:
+            # The same error is raised again, in order, when the block is imported
+            break
+    return tuple(senders)
+
+
+def _wait_for_prefetch(block: BlockAPI,
+                       prefetch: 'Optional[Future[Tuple[Address, ...]]]') -> BlockAPI:
+    if prefetch is not None:
+        for transaction, sender in zip(block.transactions, prefetch.result()):
+            # Fill the cached sender property, as if the sender was recovered here
+            transaction.__dict__['sender'] = sender
+    return block
+
+
 class Chain(BaseChain):
     logger = logging.getLogger("eth.chain.chain.Chain")
     gas_estimator: StaticMethod[Callable[[StateAPI, SignedTransactionAPI], int]] = None
 
+    # How many blocks ahead of the one being imported by import_blocks to prepare
+    # in the worker processes of the consensus context
+    import_prefetch_depth = 8
+
     chaindb_class: Type[ChainDatabaseAPI] = ChainDB
     consensus_context_class: Type[ConsensusContextAPI] = ConsensusContext
 
@@ -205,6 +309,9 @@ class Chain(BaseChain):
         if self.gas_estimator is None:
             self.gas_estimator = get_gas_estimator()
 
+        # The hashes of the most recently imported parent and its ancestors, newest first
+        self._ancestor_hashes: Deque[Hash32] = deque(maxlen=MAX_PREV_HEADER_DEPTH)
+
     #
     # Helpers
     #
@@ -214,6 +321,9 @@ class Chain(BaseChain):
             raise AttributeError("`chaindb_class` not set")
         return cls.chaindb_class
 
+    def close(self) -> None:
+        self.consensus_context.close()
+
     #
     # Chain API
     #
@@ -267,13 +377,41 @@ class Chain(BaseChain):
         vm_class = self.get_vm_class_for_block_number(header.block_number)
         chain_context = ChainContext(self.chain_id)
 
+        if self._ancestor_hashes and self._ancestor_hashes[0] == header.parent_hash:
+            previous_hashes: Tuple[Hash32, ...] = tuple(self._ancestor_hashes)
+        else:
+            previous_hashes = None
+
         return vm_class(
             header=header,
             chaindb=self.chaindb,
             chain_context=chain_context,
-            consensus_context=self.consensus_context
+            consensus_context=self.consensus_context,
+            previous_hashes=previous_hashes,
         )
 
+    def _slide_ancestor_hashes(self, parent_header: BlockHeaderAPI) -> None:
+        """
+        Move the window of ancestor hashes so that it starts at ``parent_header``. When
+        importing blocks in order, this only adds the hash of the parent. The window is
+        rebuilt from the database when ``parent_header`` is not a child of the last
+        parent, for example after a reorg.
+        """
+        newest_hash = self._ancestor_hashes[0] if self._ancestor_hashes else None
+
+        if newest_hash == parent_header.hash:
+            return
+        elif newest_hash == parent_header.parent_hash:
+            self._ancestor_hashes.appendleft(parent_header.hash)
+        else:
+            vm_class = self.get_vm_class_for_block_number(
+                BlockNumber(parent_header.block_number + 1),
+            )
+            self._ancestor_hashes = deque(
+                vm_class.get_prev_hashes(parent_header.hash, self.chaindb),
+                maxlen=MAX_PREV_HEADER_DEPTH,
+            )
+
     #
     # Header API
     #
@@ -438,7 +576,7 @@ class Chain(BaseChain):
             transaction: SignedTransactionAPI,
             at_header: BlockHeaderAPI) -> bytes:
 
-        with self.get_vm(at_header).state_in_temp_block() as state:
+        with self.get_vm(at_header).state_in_temp_block(ephemeral=True) as state:
             computation = state.costless_execute_transaction(transaction)
 
         computation.raise_if_error()
@@ -450,9 +588,43 @@ class Chain(BaseChain):
             at_header: BlockHeaderAPI = None) -> int:
         if at_header is None:
             at_header = self.get_canonical_head()
-        with self.get_vm(at_header).state_in_temp_block() as state:
+        with self.get_vm(at_header).state_in_temp_block(ephemeral=True) as state:
             return self.gas_estimator(state, transaction)
 
+    def estimate_gas_batch(
+            self,
+            transactions: Sequence[SignedTransactionAPI],
+            at_header: BlockHeaderAPI = None,
+            max_workers: int = 1) -> Tuple[Union[int, VMError, ValidationError], ...]:
+        if at_header is None:
+            at_header = self.get_canonical_head()
+        if max_workers < 1:
+            raise ValidationError(f"max_workers must be at least 1, got {max_workers}")
+
+        with self.get_vm(at_header).state_in_temp_block() as state:
+            # Account databases are not thread-safe, so each worker estimates in forks of
+            # its own ephemeral state, which read through the accounts that the previous
+            # estimates of the worker cached
+            worker_states: 'Queue[StateAPI]' = Queue()
+            for _ in range(max_workers):
+                worker_states.put(state.fork(ephemeral=True))
+
+            def estimate_gas(
+                    transaction: SignedTransactionAPI) -> Union[int, VMError, ValidationError]:
+                worker_state = worker_states.get()
+                try:
+                    return self.gas_estimator(worker_state.fork(), transaction)
+                except (VMError, ValidationError) as exc:
+                    return exc
+                finally:
+                    worker_states.put(worker_state)
+
+            if max_workers == 1:
+                return tuple(map(estimate_gas, transactions))
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    return tuple(executor.map(estimate_gas, transactions))
+
     def import_block(self,
                      block: BlockAPI,
                      perform_validation: bool=True
@@ -467,6 +639,8 @@ class Chain(BaseChain):
                 f"its parent block at {block.header.parent_hash!r}"
             )
 
+        self._slide_ancestor_hashes(parent_header)
+
         base_header_for_import = self.create_header_from_parent(parent_header)
         # Make a copy of the empty header, adding in the expected amount of gas used. This
         #   allows for richer logging in the VM.
@@ -494,16 +668,13 @@ class Chain(BaseChain):
             encode_hex(imported_block.hash),
         )
 
-        new_canonical_blocks = tuple(
-            self.get_block_by_hash(header_hash)
-            for header_hash
-            in new_canonical_hashes
-        )
-        old_canonical_blocks = tuple(
-            self.get_block_by_hash(header_hash)
-            for header_hash
-            in old_canonical_hashes
+        # Most callers only look at the imported block, so only read the others if needed
+        new_canonical_blocks = LazyBlockSequence(
+            new_canonical_hashes,
+            self.get_block_by_hash,
+            (imported_block,),
         )
+        old_canonical_blocks = LazyBlockSequence(old_canonical_hashes, self.get_block_by_hash)
 
         return BlockImportResult(
             imported_block=imported_block,
@@ -512,6 +683,98 @@ class Chain(BaseChain):
             meta_witness=block_result.meta_witness,
         )
 
+    def import_blocks(self,
+                      blocks: Iterable[BlockAPI],
+                      perform_validation: bool=True,
+                      persist_every: int=64,
+                      ) -> Tuple[BlockImportResult, ...]:
+        if persist_every < 1:
+            raise ValidationError(f"persist_every must be at least 1, got {persist_every}")
+
+        import_results: List[BlockImportResult] = []
+        remaining_blocks = self._prefetch_blocks(blocks)
+        while True:
+            try:
+                _, remaining_blocks = peek(remaining_blocks)
+            except StopIteration:
+                break
+
+            batch_results = self._import_blocks_in_batch(
+                take(persist_every, remaining_blocks),
+                perform_validation,
+            )
+            import_results.extend(batch_results)
+
+        return tuple(import_results)
+
+    def _prefetch_blocks(self, blocks: Iterable[BlockAPI]) -> Iterable[BlockAPI]:
+        """
+        Yield the blocks in order, while the transaction senders of the next
+        :attr:`import_prefetch_depth` blocks are recovered in the worker pool of the
+        consensus context. Only that many blocks are read ahead, so a slow import holds
+        back the reading of new blocks.
+
+        Sender recovery is CPU-bound, so it only runs alongside the import in separate
+        processes. Without a worker pool, the senders are recovered during the import.
+        """
+        executor = self.consensus_context.worker_pool
+        if executor is None or self.import_prefetch_depth < 1:
+            yield from blocks
+            return
+
+        pending: Deque[Tuple[BlockAPI, 'Optional[Future[Tuple[Address, ...]]]']] = deque()
+        for block in blocks:
+            if block.transactions:
+                pending.append((block, executor.submit(_recover_senders, block.transactions)))
+            else:
+                pending.append((block, None))
+
+            if len(pending) > self.import_prefetch_depth:
+                yield _wait_for_prefetch(*pending.popleft())
+
+        while pending:
+            yield _wait_for_prefetch(*pending.popleft())
+
+    def _import_blocks_in_batch(self,
+                                blocks: Iterable[BlockAPI],
+                                perform_validation: bool) -> Tuple[BlockImportResult, ...]:
+        """
+        Import the blocks one after the other, through a chain database that keeps all
+        the writes in memory, and commit them to the underlying database at the end.
+
+        If a block fails to import, the blocks before it are still committed, as if they
+        had been imported one at a time, and then the error is raised.
+        """
+        import_results = []
+        import_error: Exception = None
+
+        batch_chain: Chain = None
+        try:
+            with self.chaindb.db.atomic_batch() as batch:
+                # The blocks are imported by a new chain that reads and writes the batch, so
+                # that this chain keeps using the database while the batch is open
+                batch_chain = type(self)(AtomicDB(batch))
+                batch_chain._ancestor_hashes = self._ancestor_hashes.copy()
+
+                try:
+                    for block in blocks:
+                        import_results.append(batch_chain.import_block(block, perform_validation))
+                except Exception as exc:
+                    import_error = exc
+        finally:
+            if batch_chain is not None:
+                batch_chain.close()
+                # The blocks in the import results are read lazily, after the batch is closed
+                batch_chain.chaindb = self.chaindb
+            # The canonical chain was changed through another database instance
+            if isinstance(self.chaindb, HeaderDB):
+                self.chaindb.clear_canonical_hash_cache()
+
+        if import_error is not None:
+            raise import_error
+        else:
+            return tuple(import_results)
+
     #
     # Validation API
     #
@@ -667,6 +930,17 @@ class MiningChain(Chain, MiningChainAPI):
         self.header = self.ensure_header()
         return result
 
+    def import_blocks(self,
+                      blocks: Iterable[BlockAPI],
+                      perform_validation: bool=True,
+                      persist_every: int=64,
+                      ) -> Tuple[BlockImportResult, ...]:
+        try:
+            return super().import_blocks(blocks, perform_validation, persist_every)
+        finally:
+            # The blocks were imported by other chain instances, on the same database
+            self.header = self.ensure_header()
+
     def mine_block(self, *args: Any, **kwargs: Any) -> BlockAPI:
         return self.mine_block_extended(*args, **kwargs).block
 
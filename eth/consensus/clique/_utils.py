@@ -1,6 +1,13 @@
+from concurrent.futures import Executor
+import itertools
+import math
+import os
 import time
 from typing import (
     Iterable,
+    Optional,
+    Sequence,
+    Tuple,
 )
 
 from eth_keys import keys
@@ -14,6 +21,9 @@ from eth_utils import (
     to_tuple,
     ValidationError,
 )
+from eth_utils.toolz import (
+    partition_all,
+)
 
 from eth.abc import (
     BlockHeaderAPI,
@@ -88,6 +98,40 @@ def get_block_signer(header: BlockHeaderAPI) -> Address:
     return signature.recover_public_key_from_msg_hash(signature_hash).to_canonical_address()
 
 
+# Recovering fewer signers than this in worker processes costs more than it saves
+MIN_PARALLEL_SIGNER_RECOVERIES = 8
+# The headers are split in this many chunks
+SIGNER_RECOVERY_WORKERS = os.cpu_count() or 1
+
+
+@to_tuple
+def _try_get_block_signers(headers: Sequence[BlockHeaderAPI]) -> Iterable[Optional[Address]]:
+    for header in headers:
+        try:
+            yield get_block_signer(header)
+        except Exception:
+            # Leave it to get_block_signer() to raise the error when the signer is needed
+            yield None
+
+
+def recover_block_signers(headers: Sequence[BlockHeaderAPI],
+                          executor: Executor = None) -> Tuple[Optional[Address], ...]:
+    """
+    Return the signers of the ``headers``, in order, or ``None`` for a header whose
+    signer can't be recovered. If there are many headers, they are recovered in the
+    worker processes of the ``executor``.
+    """
+    if executor is None or len(headers) < MIN_PARALLEL_SIGNER_RECOVERIES:
+        return _try_get_block_signers(headers)
+
+    chunk_size = math.ceil(len(headers) / SIGNER_RECOVERY_WORKERS)
+    futures = tuple(
+        executor.submit(_try_get_block_signers, chunk)
+        for chunk in partition_all(chunk_size, headers)
+    )
+    return tuple(itertools.chain.from_iterable(future.result() for future in futures))
+
+
 def is_in_turn(signer: Address, snapshot: Snapshot, header: BlockHeaderAPI) -> bool:
     """
     Return ``True`` if the block was produced *in turn*, otherwise return ``False``.
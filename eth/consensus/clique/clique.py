@@ -11,6 +11,7 @@ from eth.abc import (
     VirtualMachineModifierAPI,
 )
 from eth.db.chain import ChainDB
+from eth._utils.workers import WorkerPool
 
 from eth_typing import (
     Address,
@@ -33,6 +34,8 @@ from eth.typing import (
 
 from .constants import (
     EPOCH_LENGTH,
+    IN_MEMORY_SNAPSHOTS,
+    SIGNER_CACHE_SIZE,
 )
 from .datatypes import (
     Snapshot,
@@ -70,10 +73,19 @@ def _construct_turn_error_message(expected_difficulty: int,
 class CliqueConsensusContext(ConsensusContextAPI):
 
     epoch_length = EPOCH_LENGTH
+    snapshot_cache_size = IN_MEMORY_SNAPSHOTS
+    signer_cache_size = SIGNER_CACHE_SIZE
 
     def __init__(self, db: AtomicDatabaseAPI):
         self.db = db
-        self.snapshot_manager = SnapshotManager(ChainDB(db), self.epoch_length)
+        self.worker_pool = WorkerPool()
+        self.snapshot_manager = SnapshotManager(
+            ChainDB(db),
+            self.epoch_length,
+            self.snapshot_cache_size,
+            self.signer_cache_size,
+            self.worker_pool,
+        )
 
 
 class CliqueConsensus(ConsensusAPI):
@@ -126,7 +138,7 @@ class CliqueConsensus(ConsensusAPI):
 
         validate_header_integrity(header, self._epoch_length)
 
-        signer = get_block_signer(header)
+        signer = self._snapshot_manager.get_block_signer(header)
         snapshot = self._snapshot_manager.get_or_create_snapshot(
             header.block_number - 1, header.parent_hash, parents)
         in_turn = is_in_turn(signer, snapshot, header)
@@ -8,6 +8,8 @@ EPOCH_LENGTH = 30000
 
 IN_MEMORY_SNAPSHOTS = 128
 
+SIGNER_CACHE_SIZE = 4096
+
 NONCE_AUTH = decode_hex('0xffffffffffffffff')
 NONCE_DROP = decode_hex('0x0000000000000000')
 
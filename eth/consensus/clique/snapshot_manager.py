@@ -1,5 +1,9 @@
+from concurrent.futures import Executor
 import lru
-from typing import Iterable
+from typing import (
+    Iterable,
+    Sequence,
+)
 
 from eth.abc import (
     BlockHeaderAPI,
@@ -30,6 +34,7 @@ from .constants import (
     IN_MEMORY_SNAPSHOTS,
     NONCE_AUTH,
     NONCE_DROP,
+    SIGNER_CACHE_SIZE,
 )
 from .datatypes import (
     MutableSnapshot,
@@ -43,6 +48,7 @@ from ._utils import (
     get_signers_at_checkpoint,
     get_block_signer,
     is_checkpoint,
+    recover_block_signers,
 )
 
 
@@ -61,10 +67,50 @@ class SnapshotManager:
 
     def __init__(self,
                  chain_db: ChainDatabaseAPI,
-                 epoch_length: int) -> None:
+                 epoch_length: int,
+                 snapshot_cache_size: int = IN_MEMORY_SNAPSHOTS,
+                 signer_cache_size: int = SIGNER_CACHE_SIZE,
+                 worker_pool: Executor = None) -> None:
+        """
+        :param snapshot_cache_size: how many of the most recently used snapshots to keep
+            in memory
+        :param signer_cache_size: how many of the most recently recovered signers to keep
+            in memory
+        :param worker_pool: worker processes to recover many signers at once in
+        """
         self._chain_db = chain_db
         self._epoch_length = epoch_length
-        self._snapshots = lru.LRU(IN_MEMORY_SNAPSHOTS)
+        self._snapshots = lru.LRU(snapshot_cache_size)
+        # Recovering a signer takes an ECDSA public key recovery, so remember the recent
+        # ones. The header hash covers the signature, so a signer can never be stale.
+        self._signers_by_header_hash: 'lru.LRU[Hash32, Address]' = lru.LRU(signer_cache_size)
+        self._worker_pool = worker_pool
+
+    def get_block_signer(self, header: BlockHeaderAPI) -> Address:
+        """
+        Return the address of the signer of the ``header``, like
+        :func:`~eth.consensus.clique._utils.get_block_signer`, remembering it.
+        """
+        try:
+            return self._signers_by_header_hash[header.hash]
+        except KeyError:
+            signer = get_block_signer(header)
+            self._signers_by_header_hash[header.hash] = signer
+            return signer
+
+    def recover_block_signers(self, headers: Sequence[BlockHeaderAPI]) -> None:
+        """
+        Recover the signers of the headers that are not remembered yet, so that
+        :meth:`get_block_signer` finds them. If there are many, they are recovered in the
+        worker processes.
+        """
+        missing = tuple(
+            header for header in headers if header.hash not in self._signers_by_header_hash
+        )
+        signers = recover_block_signers(missing, self._worker_pool)
+        for header, signer in zip(missing, signers):
+            if signer is not None:
+                self._signers_by_header_hash[header.hash] = signer
 
     def _lookup_header(self,
                        block_hash: Hash32,
@@ -101,7 +147,7 @@ class SnapshotManager:
         snapshot = current_snapshot.get_mutable_clone(header.hash)
 
         if header.nonce in {NONCE_AUTH, NONCE_DROP}:
-            signer = get_block_signer(header)
+            signer = self.get_block_signer(header)
             # Clear any votes from the signer regarding the subject that is voted on
             for vote in snapshot.votes:
                 if vote.signer == signer and vote.subject == header.coinbase:
@@ -193,6 +239,9 @@ class SnapshotManager:
             else:
                 break
 
+        # Applying a header needs its signer, so recover them all at once up front
+        self.recover_block_signers(tuple(reversed(parents)) + (header,))
+
         for parent in reversed(parents):
             new_snapshot = self.apply(new_snapshot, parent)
 
@@ -2,9 +2,11 @@ from eth.abc import (
     AtomicDatabaseAPI,
     ConsensusContextAPI,
 )
+from eth._utils.workers import WorkerPool
 
 
 class ConsensusContext(ConsensusContextAPI):
 
     def __init__(self, db: AtomicDatabaseAPI):
         self.db = db
+        self.worker_pool = WorkerPool()
@@ -1,7 +1,29 @@
-from collections import OrderedDict
+from collections import (
+    OrderedDict,
+    deque,
+)
+from concurrent.futures import (
+    Executor,
+    Future,
+)
+import itertools
+import logging
+import math
+import mmap
+import os
+from pathlib import Path
+import threading
+import time
 from typing import (
+    Deque,
+    Dict,
     Iterable,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
     Tuple,
+    Union,
 )
 
 from eth_typing import (
@@ -14,6 +36,9 @@ from eth_utils import (
     ValidationError,
     encode_hex,
 )
+from eth_utils.toolz import (
+    partition_all,
+)
 
 from eth_hash.auto import keccak
 
@@ -25,23 +50,167 @@ from pyethash import (
 
 
 from eth.abc import (
-    AtomicDatabaseAPI,
     BlockHeaderAPI,
     ConsensusAPI,
+    ConsensusContextAPI,
 )
+from eth._utils.workers import WorkerPool
 from eth.validation import (
     validate_length,
     validate_lte,
 )
 
 
+logger = logging.getLogger('eth.consensus.pow')
+
+EthashCache = Union[bytes, mmap.mmap]
+
 # Type annotation here is to ensure we don't accidentally use strings instead of bytes.
-cache_by_epoch: 'OrderedDict[int, bytearray]' = OrderedDict()
+cache_by_epoch: 'OrderedDict[int, EthashCache]' = OrderedDict()
 CACHE_MAX_ITEMS = 10
 
+# Start generating the cache of the next epoch in the background this many blocks before
+# the epoch begins, if there is a cache store
+CACHE_PREGENERATION_DISTANCE = 1000
+
+
+class EthashCacheStore:
+    """
+    Ethash caches saved as files in a directory, one per epoch. Saved caches are
+    memory-mapped when they are loaded.
+    """
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _get_path(self, epoch_index: int) -> Path:
+        return self.directory / f'cache-{epoch_index}'
+
+    def exists(self, epoch_index: int) -> bool:
+        return self._get_path(epoch_index).exists()
+
+    def load(self, epoch_index: int) -> Optional[mmap.mmap]:
+        try:
+            with open(self._get_path(epoch_index), 'rb') as cache_file:
+                return mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+    def save(self, epoch_index: int, cache: bytes) -> None:
+        # Write to a temporary file first, so that a partial cache is never loaded
+        path = self._get_path(epoch_index)
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}-{threading.get_ident()}.tmp')
+        temp_path.write_bytes(cache)
+        os.replace(temp_path, path)
+
+
+class EthashCacheInfo(NamedTuple):
+    memory_hits: int
+    disk_hits: int
+    generated: int
+    generation_seconds: float
+
+
+class _EthashCacheCounters:
+    def __init__(self) -> None:
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.generated = 0
+        self.generation_seconds = 0.0
+
+
+_cache_store: EthashCacheStore = None
+_cache_counters = _EthashCacheCounters()
+_pregeneration_lock = threading.Lock()
+_pregenerating_epochs: Set[int] = set()
+
+
+def set_cache_store(store: Optional[EthashCacheStore]) -> None:
+    """
+    Save the Ethash caches that are generated to the given store, and load them from it
+    instead of generating them again. With ``None``, caches are only kept in memory.
+    """
+    global _cache_store
+    _cache_store = store
+
+
+def get_cache_info() -> EthashCacheInfo:
+    """
+    Return how often caches were found in memory or in the cache store, and how many
+    were generated, in how much time, in this process.
+    """
+    return EthashCacheInfo(
+        _cache_counters.memory_hits,
+        _cache_counters.disk_hits,
+        _cache_counters.generated,
+        _cache_counters.generation_seconds,
+    )
+
+
+def _make_cache(epoch_index: int) -> bytes:
+    start = time.perf_counter()
+    # Simulate requesting mkcache by block number: multiply index by epoch length
+    cache = mkcache_bytes(epoch_index * EPOCH_LENGTH)
+    duration = time.perf_counter() - start
+
+    _cache_counters.generated += 1
+    _cache_counters.generation_seconds += duration
+    logger.debug("Generated Ethash cache of epoch %d in %.2fs", epoch_index, duration)
+    return cache
+
+
+def _load_or_make_cache(epoch_index: int) -> EthashCache:
+    store = _cache_store
+    if store is None:
+        return _make_cache(epoch_index)
+
+    saved_cache = store.load(epoch_index)
+    if saved_cache is not None:
+        _cache_counters.disk_hits += 1
+        return saved_cache
+
+    cache = _make_cache(epoch_index)
+    store.save(epoch_index, cache)
+    return cache
+
+
+def _pregenerate_cache(store: EthashCacheStore, epoch_index: int) -> None:
+    try:
+        if not store.exists(epoch_index):
+            store.save(epoch_index, _make_cache(epoch_index))
+    except Exception:
+        logger.exception("Failed to pregenerate the Ethash cache of epoch %d", epoch_index)
+    finally:
+        with _pregeneration_lock:
+            _pregenerating_epochs.discard(epoch_index)
+
+
+def _pregenerate_next_cache(block_number: int) -> None:
+    """
+    Start generating the cache of the next epoch in a background thread, if the block
+    is close to the end of its epoch and that cache is not saved yet.
+    """
+    store = _cache_store
+    if store is None or EPOCH_LENGTH - block_number % EPOCH_LENGTH > CACHE_PREGENERATION_DISTANCE:
+        return
+
+    next_epoch_index = block_number // EPOCH_LENGTH + 1
+    with _pregeneration_lock:
+        if next_epoch_index in _pregenerating_epochs or store.exists(next_epoch_index):
+            return
+        _pregenerating_epochs.add(next_epoch_index)
+
+    threading.Thread(
+        target=_pregenerate_cache,
+        args=(store, next_epoch_index),
+        name=f"ethash-cache-{next_epoch_index}",
+        daemon=True,
+    ).start()
+
 
-def get_cache(block_number: int) -> bytes:
+def get_cache(block_number: int) -> EthashCache:
     epoch_index = block_number // EPOCH_LENGTH
+    _pregenerate_next_cache(block_number)
 
     # doing explicit caching, because functools.lru_cache is 70% slower in the tests
 
@@ -49,11 +218,11 @@ def get_cache(block_number: int) -> bytes:
     if epoch_index in cache_by_epoch:
         c = cache_by_epoch.pop(epoch_index)  # pop and append at end
         cache_by_epoch[epoch_index] = c
+        _cache_counters.memory_hits += 1
         return c
 
-    # Generate the cache if it was not already in memory
-    # Simulate requesting mkcache by block number: multiply index by epoch length
-    c = mkcache_bytes(epoch_index * EPOCH_LENGTH)
+    # Load or generate the cache if it was not already in memory
+    c = _load_or_make_cache(epoch_index)
     cache_by_epoch[epoch_index] = c
 
     # Limit memory usage for cache
@@ -63,6 +232,27 @@ def get_cache(block_number: int) -> bytes:
     return c
 
 
+def _hashimoto(block_number: int, mining_hash: Hash32, nonce: int) -> Dict[bytes, bytes]:
+    return hashimoto_light(block_number, get_cache(block_number), mining_hash, nonce)
+
+
+class _PowSettings(NamedTuple):
+    """
+    The configuration of this module, sent along with the work given to worker processes,
+    which may not have inherited it.
+    """
+    cache_store: Optional[EthashCacheStore]
+
+
+def _get_settings() -> _PowSettings:
+    return _PowSettings(_cache_store)
+
+
+def _apply_settings(settings: _PowSettings) -> None:
+    if settings.cache_store is not _cache_store:
+        set_cache_store(settings.cache_store)
+
+
 def check_pow(block_number: int,
               mining_hash: Hash32,
               mix_hash: Hash32,
@@ -71,34 +261,170 @@ def check_pow(block_number: int,
     validate_length(mix_hash, 32, title="Mix Hash")
     validate_length(mining_hash, 32, title="Mining Hash")
     validate_length(nonce, 8, title="POW Nonce")
-    cache = get_cache(block_number)
-    mining_output = hashimoto_light(
-        block_number, cache, mining_hash, big_endian_to_int(nonce))
+    mining_output = _hashimoto(block_number, mining_hash, big_endian_to_int(nonce))
     if mining_output[b'mix digest'] != mix_hash:
+        cache = get_cache(block_number)
         raise ValidationError(
             f"mix hash mismatch; expected: {encode_hex(mining_output[b'mix digest'])} "
             f"!= actual: {encode_hex(mix_hash)}. "
             f"Mix hash calculated from block #{block_number}, "
             f"mine hash {encode_hex(mining_hash)}, nonce {encode_hex(nonce)}"
-            f", difficulty {difficulty}, cache hash {encode_hex(keccak(cache))}"
+            f", difficulty {difficulty}, cache hash {encode_hex(keccak(cache[:]))}"
         )
     result = big_endian_to_int(mining_output[b'result'])
     validate_lte(result, 2**256 // difficulty, title="POW Difficulty")
 
 
+class PowSeal(NamedTuple):
+    """
+    The fields of a header that :func:`check_pow` needs to check its proof of work.
+    """
+    block_number: int
+    mining_hash: Hash32
+    mix_hash: Hash32
+    nonce: bytes
+    difficulty: int
+
+
+# Checking fewer seals than this in worker processes costs more than it saves
+MIN_PARALLEL_SEAL_CHECKS = 8
+# The seals of each epoch are split in this many chunks
+POW_WORKERS = os.cpu_count() or 1
+
+
+def _check_pow_seals(settings: _PowSettings, seals: Sequence[PowSeal]) -> None:
+    _apply_settings(settings)
+    for seal in seals:
+        check_pow(*seal)
+
+
+def check_pow_seals(seals: Sequence[PowSeal], executor: Executor = None) -> None:
+    """
+    Check the proof of work of many seals, like :func:`check_pow`, using the worker
+    processes of the ``executor``. Without one, the seals are checked in this process.
+
+    The seals are grouped by epoch, and the seals of each epoch are split evenly between the
+    workers. If several seals are invalid, the error of the first one is raised.
+    """
+    settings = _get_settings()
+    if executor is None or len(seals) < MIN_PARALLEL_SEAL_CHECKS:
+        _check_pow_seals(settings, seals)
+        return
+
+    seals_by_epoch = itertools.groupby(seals, lambda seal: seal.block_number // EPOCH_LENGTH)
+
+    futures = []
+    for _, epoch_seals in seals_by_epoch:
+        epoch_seals_tuple = tuple(epoch_seals)
+        chunk_size = math.ceil(len(epoch_seals_tuple) / POW_WORKERS)
+        for chunk in partition_all(chunk_size, epoch_seals_tuple):
+            futures.append(executor.submit(_check_pow_seals, settings, chunk))
+
+    # Each chunk stops at its first invalid seal, and the chunks are in order
+    for future in futures:
+        future.result()
+
+
 MAX_TEST_MINE_ATTEMPTS = 1000
 
+# Number of nonces that a worker process tries at a time
+NONCE_SEARCH_CHUNK_SIZE = 256
+
 
-def mine_pow_nonce(block_number: int, mining_hash: Hash32, difficulty: int) -> Tuple[bytes, bytes]:
-    cache = get_cache(block_number)
-    for nonce in range(MAX_TEST_MINE_ATTEMPTS):
-        mining_output = hashimoto_light(block_number, cache, mining_hash, nonce)
-        result = big_endian_to_int(mining_output[b'result'])
-        result_cap = 2**256 // difficulty
-        if result <= result_cap:
+def _search_nonce(settings: _PowSettings,
+                  block_number: int,
+                  mining_hash: Hash32,
+                  difficulty: int,
+                  nonces: range) -> Optional[Tuple[bytes, bytes]]:
+    _apply_settings(settings)
+    result_cap = 2**256 // difficulty
+    for nonce in nonces:
+        mining_output = _hashimoto(block_number, mining_hash, nonce)
+        if big_endian_to_int(mining_output[b'result']) <= result_cap:
             return nonce.to_bytes(8, 'big'), mining_output[b'mix digest']
+    return None
 
-    raise Exception("Too many attempts at POW mining, giving up")
+
+def mine_pow_nonce(block_number: int,
+                   mining_hash: Hash32,
+                   difficulty: int,
+                   max_attempts: int = MAX_TEST_MINE_ATTEMPTS,
+                   num_workers: int = 1,
+                   executor: Executor = None) -> Tuple[bytes, bytes]:
+    """
+    Return the lowest nonce below ``max_attempts`` that satisfies the difficulty, with
+    its mix hash.
+
+    :param num_workers: with more than one, search ranges of nonces in that many worker
+        processes at a time
+    :param executor: the worker processes to search in. Without one, a pool of
+        ``num_workers`` processes is started for this search, and stopped at the end.
+    """
+    settings = _get_settings()
+    if num_workers <= 1:
+        found = _search_nonce(settings, block_number, mining_hash, difficulty, range(max_attempts))
+    elif executor is None:
+        with WorkerPool(num_workers) as worker_pool:
+            found = _search_nonce_in_workers(
+                worker_pool,
+                settings,
+                block_number,
+                mining_hash,
+                difficulty,
+                max_attempts,
+                num_workers,
+            )
+    else:
+        found = _search_nonce_in_workers(
+            executor,
+            settings,
+            block_number,
+            mining_hash,
+            difficulty,
+            max_attempts,
+            num_workers,
+        )
+
+    if found is None:
+        raise Exception("Too many attempts at POW mining, giving up")
+    else:
+        return found
+
+
+def _search_nonce_in_workers(executor: Executor,
+                             settings: _PowSettings,
+                             block_number: int,
+                             mining_hash: Hash32,
+                             difficulty: int,
+                             max_attempts: int,
+                             num_workers: int) -> Optional[Tuple[bytes, bytes]]:
+    chunks = (
+        range(start, min(start + NONCE_SEARCH_CHUNK_SIZE, max_attempts))
+        for start in range(0, max_attempts, NONCE_SEARCH_CHUNK_SIZE)
+    )
+
+    # Keep every worker busy, and wait for the chunks in order, so that the lowest
+    # nonce is found no matter which worker finishes first
+    pending: Deque['Future[Optional[Tuple[bytes, bytes]]]'] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(
+                _search_nonce, settings, block_number, mining_hash, difficulty, chunk,
+            ))
+            if len(pending) >= num_workers:
+                found = pending.popleft().result()
+                if found is not None:
+                    return found
+
+        while pending:
+            found = pending.popleft().result()
+            if found is not None:
+                return found
+
+        return None
+    finally:
+        for future in pending:
+            future.cancel()
 
 
 class PowConsensus(ConsensusAPI):
@@ -106,8 +432,8 @@ class PowConsensus(ConsensusAPI):
     Modify a set of VMs to validate blocks via Proof of Work (POW)
     """
 
-    def __init__(self, base_db: AtomicDatabaseAPI) -> None:
-        pass
+    def __init__(self, context: ConsensusContextAPI) -> None:
+        self._worker_pool = None if context is None else context.worker_pool
 
     def validate_seal(self, header: BlockHeaderAPI) -> None:
         """
@@ -122,6 +448,22 @@ class PowConsensus(ConsensusAPI):
                                 parents: Iterable[BlockHeaderAPI]) -> None:
         pass
 
+    def validate_seals(self, headers: Sequence[BlockHeaderAPI]) -> None:
+        """
+        Validate the seals on the given headers by checking their proofs of work in
+        the worker processes of the consensus context.
+        """
+        check_pow_seals(tuple(
+            PowSeal(
+                header.block_number,
+                header.mining_hash,
+                header.mix_hash,
+                header.nonce,
+                header.difficulty,
+            )
+            for header in headers
+        ), self._worker_pool)
+
     @classmethod
     def get_fee_recipient(cls, header: BlockHeaderAPI) -> Address:
         """
@@ -3,6 +3,8 @@ from typing import (
     cast,
     Dict,
     Iterable,
+    List,
+    Optional,
     Set,
     Tuple,
 )
@@ -14,8 +16,10 @@ from eth_typing import (
 )
 
 from eth_utils import (
+    big_endian_to_int,
     encode_hex,
     get_extended_debug_logger,
+    int_to_big_endian,
     to_checksum_address,
     to_dict,
     to_tuple,
@@ -42,17 +46,29 @@ from eth.db.accesslog import (
     KeyAccessLoggerAtomicDB,
     KeyAccessLoggerDB,
 )
+from eth.db.account_cache import (
+    AccountCacheDB,
+    account_caches,
+)
 from eth.db.batch import (
     BatchDB,
 )
 from eth.db.cache import (
     CacheDB,
 )
+from eth.db.code_cache import (
+    CodeCache,
+    code_caches,
+)
 from eth.db.diff import (
     DBDiff,
 )
 from eth.db.journal import (
     JournalDB,
+    get_next_checkpoint,
+)
+from eth.db.schema import (
+    SchemaV1,
 )
 from eth.db.storage import (
     AccountStorageDB,
@@ -83,7 +99,11 @@ from .hash_trie import HashTrie
 class AccountDB(AccountDatabaseAPI):
     logger = get_extended_debug_logger('eth.db.account.AccountDB')
 
-    def __init__(self, db: AtomicDatabaseAPI, state_root: Hash32=BLANK_ROOT_HASH) -> None:
+    def __init__(
+            self,
+            db: AtomicDatabaseAPI,
+            state_root: Hash32=BLANK_ROOT_HASH,
+            track_witness: bool=True) -> None:
         r"""
         Internal implementation details (subject to rapid change):
         Database entries go through several pipes, like so...
@@ -120,21 +140,51 @@ class AccountDB(AccountDatabaseAPI):
 
         AccountDB synchronizes the snapshot/revert/persist of both of the
         journals.
+
+        If track_witness is False, the keys and accounts that are read are not
+        logged, and :meth:`persist` returns an empty witness. This skips the
+        bookkeeping when the witness is not needed, like during a full sync.
+        Accounts are then also looked up in the
+        :class:`~eth.db.account_cache.AccountCache` of ``db``, below _trie_cache,
+        and code in the :class:`~eth.db.code_cache.CodeCache` of ``db``. A witness
+        needs the trie nodes of every account and the code read in the block, so
+        the shared accounts are only used to skip decoding when the witness is
+        tracked. Chains import blocks this way when they are built with
+        :func:`~eth.tools.builder.chain.disable_witness_tracking`.
         """
-        self._raw_store_db = KeyAccessLoggerAtomicDB(db, log_missing_keys=False)
+        self._db = db
+        self._track_witness = track_witness
+        self._raw_store_db: AtomicDatabaseAPI
+        if track_witness:
+            self._raw_store_db = KeyAccessLoggerAtomicDB(db, log_missing_keys=False)
+        else:
+            self._raw_store_db = db
         self._batchdb = BatchDB(self._raw_store_db)
         self._batchtrie = BatchDB(self._raw_store_db, read_through_deletes=True)
         self._journaldb = JournalDB(self._batchdb)
         self._trie = HashTrie(HexaryTrie(self._batchtrie, state_root, prune=True))
-        self._trie_logger = KeyAccessLoggerDB(self._trie, log_missing_keys=False)
-        self._trie_cache = CacheDB(self._trie_logger)
+        self._shared_accounts = account_caches[db]
+        # The witness needs the code to be read from the database
+        self._code_cache: Optional[CodeCache]
+        if track_witness:
+            self._trie_cache = CacheDB(KeyAccessLoggerDB(self._trie, log_missing_keys=False))
+            self._code_cache = None
+        else:
+            self._trie_cache = CacheDB(AccountCacheDB(self._trie, self._shared_accounts))
+            self._code_cache = code_caches[db]
         self._journaltrie = JournalDB(self._trie_cache)
         self._account_cache = LRU(2048)
         self._account_stores: Dict[Address, AccountStorageDatabaseAPI] = {}
         self._dirty_accounts: Set[Address] = set()
         self._root_hash_at_last_persist = state_root
+        # The encoded accounts changed since the last persist, or None if unknown
+        self._changed_accounts: Optional[Dict[Address, bytes]] = {}
         self._accessed_accounts: Set[Address] = set()
         self._accessed_bytecodes: Set[Address] = set()
+        self._sized_code_hashes: Set[Hash32] = set()
+        self._written_code_hashes: Set[Hash32] = set()
+        # Checkpoints that are recorded in the journals once something is written
+        self._pending_checkpoints: List[JournalDBCheckpoint] = []
 
     @property
     def state_root(self) -> Hash32:
@@ -145,6 +195,7 @@ class AccountDB(AccountDatabaseAPI):
         if self._trie.root_hash != value:
             self._trie_cache.reset_cache()
             self._trie.root_hash = value
+            self._changed_accounts = None
 
     def has_root(self, state_root: bytes) -> bool:
         return state_root in self._batchtrie
@@ -165,6 +216,7 @@ class AccountDB(AccountDatabaseAPI):
         validate_canonical_address(address, title="Storage Address")
 
         account_store = self._get_address_store(address)
+        self._record_pending_checkpoints()
         self._dirty_accounts.add(address)
         account_store.set(slot, value)
 
@@ -179,6 +231,7 @@ class AccountDB(AccountDatabaseAPI):
         Wipe out the storage, without explicitly handling the storage root update
         """
         account_store = self._get_address_store(address)
+        self._record_pending_checkpoints()
         self._dirty_accounts.add(address)
         account_store.delete()
 
@@ -267,14 +320,26 @@ class AccountDB(AccountDatabaseAPI):
         code_hash = self.get_code_hash(address)
         if code_hash == EMPTY_SHA3:
             return b''
-        else:
-            try:
-                return self._journaldb[code_hash]
-            except KeyError:
-                raise MissingBytecode(code_hash) from KeyError
-            finally:
-                if code_hash in self._get_accessed_node_hashes():
-                    self._accessed_bytecodes.add(address)
+
+        # Code written since the last persist may not be in the database yet, so it is read
+        # from the pending changes, which don't count as read for the witness
+        is_pending = code_hash in self._written_code_hashes
+        if self._code_cache is not None and not is_pending:
+            cached_code = self._code_cache.get(code_hash)
+            if cached_code is not None:
+                return cached_code
+
+        try:
+            code = self._journaldb[code_hash]
+        except KeyError:
+            raise MissingBytecode(code_hash) from KeyError
+        finally:
+            if self._track_witness and code_hash in self._get_accessed_node_hashes():
+                self._accessed_bytecodes.add(address)
+
+        if self._code_cache is not None and not is_pending:
+            self._code_cache.set(code_hash, code)
+        return code
 
     def set_code(self, address: Address, code: bytes) -> None:
         validate_canonical_address(address, title="Storage Address")
@@ -282,10 +347,53 @@ class AccountDB(AccountDatabaseAPI):
 
         account = self._get_account(address)
 
-        code_hash = keccak(code)
+        code_hash = Hash32(keccak(code))
+        self._record_pending_checkpoints()
         self._journaldb[code_hash] = code
+        self._written_code_hashes.add(code_hash)
+        self._set_code_size(code_hash, len(code))
         self._set_account(address, account.copy(code_hash=code_hash))
 
+    def get_code_size(self, address: Address) -> int:
+        validate_canonical_address(address, title="Storage Address")
+
+        code_hash = self.get_code_hash(address)
+        if code_hash == EMPTY_SHA3:
+            return 0
+        elif code_hash in self._written_code_hashes:
+            # Code written since the last persist is read from the pending changes
+            return len(self.get_code(address))
+        elif self._code_cache is not None:
+            cached_size = self._code_cache.get_size(code_hash)
+            if cached_size is not None:
+                return cached_size
+
+        # set_code() writes the size along with the code, so a size in this database shows
+        # that the code is in it too
+        size_key = SchemaV1.make_code_hash_to_size_lookup_key(code_hash)
+        try:
+            code_size = big_endian_to_int(self._db[size_key])
+        except KeyError:
+            # The code was not written by set_code(), e.g. it was synced from a peer. The
+            # size of a code hash never changes, so it is indexed right away, rather than
+            # as a pending change.
+            code_size = len(self.get_code(address))
+            self._db[size_key] = int_to_big_endian(code_size)
+        else:
+            if self._track_witness:
+                # The witness needs the code, which is what proves its size
+                self._sized_code_hashes.add(code_hash)
+                self._accessed_bytecodes.add(address)
+
+        if self._code_cache is not None:
+            self._code_cache.set_size(code_hash, code_size)
+        return code_size
+
+    def _set_code_size(self, code_hash: Hash32, code_size: int) -> None:
+        size_key = SchemaV1.make_code_hash_to_size_lookup_key(code_hash)
+        self._record_pending_checkpoints()
+        self._journaldb[size_key] = int_to_big_endian(code_size)
+
     def get_code_hash(self, address: Address) -> Hash32:
         validate_canonical_address(address, title="Storage Address")
 
@@ -314,6 +422,7 @@ class AccountDB(AccountDatabaseAPI):
 
         if address in self._account_cache:
             del self._account_cache[address]
+        self._record_pending_checkpoints()
         del self._journaltrie[address]
 
     def account_exists(self, address: Address) -> bool:
@@ -334,7 +443,8 @@ class AccountDB(AccountDatabaseAPI):
     # Internal
     #
     def _get_encoded_account(self, address: Address, from_journal: bool=True) -> bytes:
-        self._accessed_accounts.add(address)
+        if self._track_witness:
+            self._accessed_accounts.add(address)
         lookup_trie = self._journaltrie if from_journal else self._trie_cache
 
         try:
@@ -352,7 +462,7 @@ class AccountDB(AccountDatabaseAPI):
         rlp_account = self._get_encoded_account(address, from_journal)
 
         if rlp_account:
-            account = rlp.decode(rlp_account, sedes=Account)
+            account = self._shared_accounts.decode(address, rlp_account)
         else:
             account = Account()
         if from_journal:
@@ -360,6 +470,7 @@ class AccountDB(AccountDatabaseAPI):
         return account
 
     def _set_account(self, address: Address, account: Account) -> None:
+        self._record_pending_checkpoints()
         self._account_cache[address] = account
         rlp_account = rlp.encode(account, sedes=Account)
         self._journaltrie[address] = rlp_account
@@ -368,23 +479,68 @@ class AccountDB(AccountDatabaseAPI):
     # Record and discard API
     #
     def record(self) -> JournalDBCheckpoint:
-        checkpoint = self._journaldb.record()
-        self._journaltrie.record(checkpoint)
+        """
+        Return a checkpoint to discard or commit the changes made from now on.
 
-        for _, store in self._dirty_account_stores():
-            store.record(checkpoint)
+        The journals only record the checkpoint once something is written, so that
+        recording and dropping a checkpoint is nearly free when nothing is, like in
+        static calls.
+        """
+        checkpoint = get_next_checkpoint()
+        self._pending_checkpoints.append(checkpoint)
         return checkpoint
 
+    def _record_pending_checkpoints(self) -> None:
+        if not self._pending_checkpoints:
+            return
+
+        for checkpoint in self._pending_checkpoints:
+            self._journaldb.record(checkpoint)
+            self._journaltrie.record(checkpoint)
+            for _, store in self._dirty_account_stores():
+                store.record(checkpoint)
+        self._pending_checkpoints.clear()
+
+    def _drop_pending_checkpoint(self, checkpoint: JournalDBCheckpoint) -> bool:
+        """
+        Drop the checkpoint and the ones after it, if it is not recorded in the journals
+        yet: nothing was written since. Return whether it was dropped.
+        """
+        pending_checkpoints = self._pending_checkpoints
+        if not pending_checkpoints:
+            return False
+        elif pending_checkpoints[-1] == checkpoint:
+            # Checkpoints are usually dropped in the reverse order they were made
+            pending_checkpoints.pop()
+            return True
+
+        try:
+            index = pending_checkpoints.index(checkpoint)
+        except ValueError:
+            return False
+        else:
+            del pending_checkpoints[index:]
+            return True
+
     def discard(self, checkpoint: JournalDBCheckpoint) -> None:
+        if self._drop_pending_checkpoint(checkpoint):
+            return
+
         self._journaldb.discard(checkpoint)
         self._journaltrie.discard(checkpoint)
+        # The pending checkpoints were all made after the recorded one
+        self._pending_checkpoints.clear()
         self._account_cache.clear()
         for _, store in self._dirty_account_stores():
             store.discard(checkpoint)
 
     def commit(self, checkpoint: JournalDBCheckpoint) -> None:
+        if self._drop_pending_checkpoint(checkpoint):
+            return
+
         self._journaldb.commit(checkpoint)
         self._journaltrie.commit(checkpoint)
+        self._pending_checkpoints.clear()
         for _, store in self._dirty_account_stores():
             store.commit(checkpoint)
 
@@ -414,6 +570,12 @@ class AccountDB(AccountDatabaseAPI):
             with self._trie.squash_changes() as memory_trie:
                 self._apply_account_diff_without_proof(diff, memory_trie)
 
+            if self._changed_accounts is not None:
+                for deleted_key in diff.deleted_keys():
+                    self._changed_accounts[Address(deleted_key)] = b''
+                for key, encoded_account in diff.pending_items():
+                    self._changed_accounts[Address(key)] = encoded_account
+
         self._journaltrie.reset()
         self._trie_cache.reset_cache()
 
@@ -449,6 +611,8 @@ class AccountDB(AccountDatabaseAPI):
         self._dirty_accounts = set()
         self._accessed_accounts = set()
         self._accessed_bytecodes = set()
+        # The written code is in the database from now on
+        self._written_code_hashes = set()
         # We have to clear the account cache here so that future account accesses
         #   will get added to _accessed_accounts correctly. Account accesses that
         #   are cached do not add the address to the list of accessed accounts.
@@ -461,12 +625,47 @@ class AccountDB(AccountDatabaseAPI):
         with self._raw_store_db.atomic_batch() as write_batch:
             self._batchtrie.commit_to(write_batch, apply_deletes=False)
             self._batchdb.commit_to(write_batch, apply_deletes=False)
+
+        self._shared_accounts.advance(
+            self._root_hash_at_last_persist,
+            new_root_hash,
+            self._changed_accounts,
+        )
+        self._changed_accounts = {}
         self._root_hash_at_last_persist = new_root_hash
 
         return meta_witness
 
+    def fork(self) -> 'AccountDB':
+        if self.state_root != self._root_hash_at_last_persist or self._has_pending_changes():
+            raise ValidationError(
+                "Cannot fork an AccountDB with changes that were not persisted, "
+                f"at state root {encode_hex(self.state_root)}"
+            )
+        return self.create_fork(self._db, self.state_root)
+
+    @classmethod
+    def create_fork(cls, db: AtomicDatabaseAPI, state_root: Hash32) -> 'AccountDB':
+        """
+        Build the account database returned by :meth:`fork`. Subclasses whose
+        ``__init__`` takes other arguments should override this.
+        """
+        return cls(db, state_root, track_witness=False)
+
+    def _has_pending_changes(self) -> bool:
+        return bool(
+            self._dirty_accounts
+            or len(self._journaldb.diff())
+            or len(self._journaltrie.diff())
+        )
+
     def _get_accessed_node_hashes(self) -> Set[Hash32]:
-        return cast(Set[Hash32], self._raw_store_db.keys_read)
+        if self._track_witness:
+            logged_db = cast(KeyAccessLoggerAtomicDB, self._raw_store_db)
+            # Code sized from the index is needed by the witness without having been read
+            return cast(Set[Hash32], logged_db.keys_read | self._sized_code_hashes)
+        else:
+            return set()
 
     @to_dict
     def _get_access_list(self) -> Iterable[Tuple[Address, AccountQueryTracker]]:
@@ -529,7 +728,7 @@ class AccountDB(AccountDatabaseAPI):
                 self.account_exists(cast_deleted_address),
             )
             # If the account was not accessed previous to the log, (re)mark it as not accessed
-            if not was_account_accessed:
+            if self._track_witness and not was_account_accessed:
                 self._accessed_accounts.remove(cast_deleted_address)
 
     def _apply_account_diff_without_proof(self, diff: DBDiff, trie: DatabaseAPI) -> None:
@@ -585,3 +784,16 @@ class AccountDB(AccountDatabaseAPI):
                     self._root_hash_at_last_persist,
                     exc.requested_key,
                 ) from exc
+
+
+class UntrackedAccountDB(AccountDB):
+    """
+    An :class:`AccountDB` that never tracks the witness. Use it as the
+    ``account_db_class`` of a state to import blocks without the witness bookkeeping.
+    """
+    def __init__(self, db: AtomicDatabaseAPI, state_root: Hash32=BLANK_ROOT_HASH) -> None:
+        super().__init__(db, state_root, track_witness=False)
+
+    @classmethod
+    def create_fork(cls, db: AtomicDatabaseAPI, state_root: Hash32) -> 'AccountDB':
+        return cls(db, state_root)
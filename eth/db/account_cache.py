@@ -0,0 +1,187 @@
+from collections import OrderedDict
+import threading
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+)
+
+from eth_typing import (
+    Address,
+    Hash32,
+)
+import rlp
+
+from eth._utils.db import CachesByDatabase
+from eth.db.backends.base import BaseDB
+from eth.db.hash_trie import HashTrie
+from eth.rlp.accounts import Account
+
+
+ACCOUNT_CACHE_SIZE = 32 * 1024 * 1024
+
+# A rough count of the bytes taken by a cached account, besides its RLP encoding
+ACCOUNT_ENTRY_OVERHEAD = 256
+
+
+class AccountCache:
+    """
+    The encoded and decoded accounts of a single state root, shared by all the
+    :class:`~eth.db.account.AccountDB` that read the same database, so that hot accounts
+    are not looked up in the trie and decoded again in every block. Another database may
+    lack the trie nodes of the cached accounts, so it gets its own cache.
+
+    When a block that builds on :attr:`state_root` is persisted, the cache moves to the
+    block's state root, updating only the accounts that the block changed. The least
+    recently used accounts are evicted once the entries take more than ``max_size`` bytes.
+
+    The cache is safe to use from multiple threads.
+    """
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.state_root: Optional[Hash32] = None
+        self._entries: 'OrderedDict[Address, Tuple[bytes, Optional[Account]]]' = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Return the fraction of the lookups that found the account, or 0 before any lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_encoded(self, state_root: Hash32, address: Address) -> bytes:
+        """
+        Return the RLP-encoded account at ``state_root``, or ``b''`` if the account is
+        known not to exist. Raise a ``KeyError`` if the account is not cached, or if the
+        cache is not at ``state_root``.
+        """
+        with self._lock:
+            if state_root != self.state_root:
+                raise KeyError(address)
+
+            try:
+                encoded_account, _ = self._entries[address]
+            except KeyError:
+                self.misses += 1
+                raise
+            else:
+                self._entries.move_to_end(address)
+                self.hits += 1
+                return encoded_account
+
+    def set_encoded(self, state_root: Hash32, address: Address, encoded_account: bytes) -> None:
+        """
+        Cache the RLP-encoded account at ``state_root``, unless the cache moved to another
+        state root.
+        """
+        with self._lock:
+            if state_root == self.state_root:
+                self._set(address, encoded_account)
+
+    def decode(self, address: Address, encoded_account: bytes) -> Account:
+        """
+        Decode the ``encoded_account`` at ``address``, reusing the decoded account if the
+        cached one has the same encoding.
+        """
+        cached_encoding, cached_account = self._entries.get(address, (None, None))
+        if cached_encoding != encoded_account:
+            return rlp.decode(encoded_account, sedes=Account)
+        elif cached_account is None:
+            cached_account = rlp.decode(encoded_account, sedes=Account)
+            with self._lock:
+                # Only keep it if the entry didn't change while decoding
+                if self._entries.get(address, (None,))[0] == encoded_account:
+                    self._entries[address] = (encoded_account, cached_account)
+
+        return cached_account
+
+    def advance(self,
+                parent_state_root: Hash32,
+                state_root: Hash32,
+                changed_accounts: Optional[Dict[Address, bytes]]) -> None:
+        """
+        Move the cache to ``state_root``, after it was persisted on top of
+        ``parent_state_root``.
+
+        :param changed_accounts: the RLP-encoded accounts that changed between the two state
+            roots (``b''`` for deleted accounts), or ``None`` if they are unknown
+        """
+        if parent_state_root == state_root:
+            return
+
+        with self._lock:
+            if self.state_root != parent_state_root or changed_accounts is None:
+                # Not a descendant of the cached state, start over from the new state
+                self.clear()
+
+            # Readers at the old state root stop using the cache as soon as it moves
+            self.state_root = state_root
+            if changed_accounts is not None:
+                for address, encoded_account in changed_accounts.items():
+                    self._set(address, encoded_account)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.state_root = None
+
+    def _set(self, address: Address, encoded_account: bytes) -> None:
+        self._discard(address)
+        self._entries[address] = (encoded_account, None)
+        self.size += len(encoded_account) + ACCOUNT_ENTRY_OVERHEAD
+        while self.size > self.max_size:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, address: Address) -> None:
+        try:
+            encoded_account, _ = self._entries.pop(address)
+        except KeyError:
+            pass
+        else:
+            self.size -= len(encoded_account) + ACCOUNT_ENTRY_OVERHEAD
+
+
+account_caches: CachesByDatabase[AccountCache] = CachesByDatabase(
+    lambda: AccountCache(ACCOUNT_CACHE_SIZE)
+)
+
+
+class AccountCacheDB(BaseDB):
+    """
+    Look up accounts in an :class:`AccountCache` before the state trie, when the trie is at
+    the cached state root.
+    """
+    def __init__(self, trie: HashTrie, account_cache: AccountCache) -> None:
+        self._trie = trie
+        self._account_cache = account_cache
+
+    def __getitem__(self, key: bytes) -> bytes:
+        state_root = self._trie.root_hash
+        if self._account_cache.state_root != state_root:
+            return self._trie[key]
+
+        address = Address(key)
+        try:
+            return self._account_cache.get_encoded(state_root, address)
+        except KeyError:
+            encoded_account = self._trie[key]
+            self._account_cache.set_encoded(state_root, address, encoded_account)
+            return encoded_account
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self._trie[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        del self._trie[key]
+
+    def _exists(self, key: bytes) -> bool:
+        return self[key] != b''
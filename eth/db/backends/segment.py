@@ -0,0 +1,543 @@
+from contextlib import contextmanager
+import logging
+import mmap
+import os
+from pathlib import Path
+import struct
+import threading
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    Tuple,
+)
+import zlib
+
+from eth_utils import ValidationError
+
+from eth.abc import (
+    AtomicWriteBatchAPI,
+)
+from eth.db.diff import (
+    DBDiff,
+    DBDiffTracker,
+    DiffMissingError,
+)
+from .base import (
+    BaseAtomicDB,
+    BaseDB,
+)
+
+
+# Every write is framed as: payload length, crc32 of payload, then the payload.
+# A frame that is truncated or fails its checksum marks the end of the valid log.
+FRAME_HEADER = struct.Struct('>II')
+
+# Each payload is a sequence of records: kind, key length, value length, key, value
+RECORD_HEADER = struct.Struct('>BII')
+
+RECORD_PUT = 1
+RECORD_DELETE = 2
+
+SEGMENT_SUFFIX = '.seg'
+
+# Reads beyond the memory-mapped region of the active segment fall back to pread(),
+# until the unmapped tail grows past this size and the segment gets re-mapped.
+REMAP_THRESHOLD = 4 * 1024 * 1024
+
+# Compaction rewrites the live values in frames of at most this many values, holding the
+# lock only while each frame is read and written
+COMPACTION_CHUNK_SIZE = 1024
+
+
+class _Segment:
+    """
+    A single append-only file of the log, along with a read-only memory map of it.
+    """
+    def __init__(self, segment_id: int, path: Path) -> None:
+        self.segment_id = segment_id
+        self.path = path
+        self._fd = os.open(str(path), os.O_RDWR | os.O_CREAT | os.O_APPEND)
+        self.size = os.fstat(self._fd).st_size
+
+        # Bytes of records that have been overwritten or deleted since being written
+        self.dead_bytes = 0
+
+        self._map: mmap.mmap = None
+        self._map_size = 0
+
+    def append(self, data: bytes) -> int:
+        """
+        Append ``data`` to the segment, returning the offset it was written at.
+        """
+        offset = self.size
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        self.size += len(data)
+        return offset
+
+    def read(self, offset: int, length: int) -> bytes:
+        """
+        Read ``length`` bytes at ``offset``. The bytes are copied out of the memory map,
+        because the map is replaced when the segment is re-mapped, and closed when the
+        segment is compacted, which a view into it would prevent.
+        """
+        end = offset + length
+        if end > self._map_size:
+            if self.size - self._map_size < REMAP_THRESHOLD:
+                return os.pread(self._fd, length, offset)
+            else:
+                self._remap()
+        return self._map[offset:end]
+
+    def _remap(self) -> None:
+        self._close_map()
+        if self.size:
+            self._map = mmap.mmap(self._fd, self.size, access=mmap.ACCESS_READ)
+            self._map_size = self.size
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._map_size = 0
+
+    def iter_frames(self) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield each valid frame in the segment, as the offset of its payload and the payload.
+        Iteration stops at the first truncated or corrupt frame.
+        """
+        self._remap()
+        offset = 0
+        while offset + FRAME_HEADER.size <= self.size:
+            payload_length, checksum = FRAME_HEADER.unpack_from(self._map, offset)
+            payload_start = offset + FRAME_HEADER.size
+            payload_end = payload_start + payload_length
+            if payload_end > self.size:
+                return
+            payload = self._map[payload_start:payload_end]
+            if zlib.crc32(payload) != checksum:
+                return
+            yield payload_start, payload
+            offset = payload_end
+
+    def truncate(self, size: int) -> None:
+        self._close_map()
+        os.ftruncate(self._fd, size)
+        self.size = size
+
+    def sync(self) -> None:
+        os.fsync(self._fd)
+
+    def close(self) -> None:
+        self._close_map()
+        os.close(self._fd)
+
+    def unlink(self) -> None:
+        self.close()
+        self.path.unlink()
+
+
+# The location of a live value: segment, offset of the value, length of the value
+IndexEntry = Tuple[_Segment, int, int]
+
+
+def _iter_records(payload: bytes) -> Iterator[Tuple[int, int, bytes, int, int]]:
+    """
+    Yield the records in a frame payload, as (kind, record offset, key, value offset, value length)
+    where the offsets are relative to the start of the payload.
+    """
+    offset = 0
+    while offset < len(payload):
+        kind, key_length, value_length = RECORD_HEADER.unpack_from(payload, offset)
+        key_start = offset + RECORD_HEADER.size
+        value_start = key_start + key_length
+        yield kind, offset, payload[key_start:value_start], value_start, value_length
+        offset = value_start + value_length
+
+
+def _record_size(key: bytes, value_length: int) -> int:
+    return RECORD_HEADER.size + len(key) + value_length
+
+
+class SegmentLogDB(BaseAtomicDB):
+    """
+    A pure-python, append-only, log-structured database.
+
+    Values are appended to segment files, which are memory-mapped for reads.
+    An in-memory index maps each key to the location of its latest value, and is
+    rebuilt by scanning the segments when the database is opened.
+
+    Overwritten and deleted values stay on disk until :meth:`compact` rewrites the live
+    values out of the old segments. Compaction can run periodically in a background
+    thread, by passing ``compaction_interval``.
+
+    This layout is best suited to read-heavy workloads of immutable, content-addressed
+    values, like trie nodes, where overwrites and deletes are rare.
+    """
+    logger = logging.getLogger("eth.db.backends.SegmentLogDB")
+
+    def __init__(self,
+                 db_path: Path=None,
+                 max_segment_size: int=256 * 1024 * 1024,
+                 compaction_ratio: float=0.5,
+                 compaction_interval: float=None) -> None:
+        """
+        :param max_segment_size: start a new segment once the active one reaches this size
+        :param compaction_ratio: :meth:`compact_if_needed` only compacts when at least this
+            fraction of the bytes in sealed segments belong to overwritten or deleted values
+        :param compaction_interval: if set, the number of seconds between calls to
+            :meth:`compact_if_needed` in a background thread
+        """
+        if not db_path:
+            raise TypeError("Please specifiy a valid path for your database.")
+
+        self.db_path = Path(db_path)
+        self.db_path.mkdir(parents=True, exist_ok=True)
+        self._max_segment_size = max_segment_size
+        self._compaction_ratio = compaction_ratio
+
+        # Guards the index and the segments, shared with the compaction thread
+        self._lock = threading.RLock()
+        # Only one compaction may run at a time, without holding the lock throughout
+        self._compaction_lock = threading.Lock()
+
+        self._index: Dict[bytes, IndexEntry] = {}
+        self._segments: List[_Segment] = []
+        self._load_segments()
+
+        self._stop_compaction = threading.Event()
+        if compaction_interval is None:
+            self._compaction_thread = None
+        else:
+            self._compaction_thread = threading.Thread(
+                target=self._run_compaction,
+                args=(compaction_interval, ),
+                name="SegmentLogDB-compaction",
+                daemon=True,
+            )
+            self._compaction_thread.start()
+
+    #
+    # Database API
+    #
+    def __getitem__(self, key: bytes) -> bytes:
+        with self._lock:
+            segment, offset, length = self._index[key]
+            return segment.read(offset, length)
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self._write(((key, value), ), ())
+
+    def _exists(self, key: bytes) -> bool:
+        return key in self._index
+
+    def __delitem__(self, key: bytes) -> None:
+        with self._lock:
+            if key not in self._index:
+                raise KeyError(key)
+            self._write((), (key, ))
+
+    def __iter__(self) -> Iterator[bytes]:
+        with self._lock:
+            return iter(tuple(self._index))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @contextmanager
+    def atomic_batch(self) -> Iterator[AtomicWriteBatchAPI]:
+        with SegmentLogDBWriteBatch._commit_unless_raises(self) as readable_batch:
+            yield readable_batch
+
+    def close(self) -> None:
+        """
+        Stop background compaction and release all open files.
+        """
+        if self._compaction_thread is not None:
+            self._stop_compaction.set()
+            self._compaction_thread.join()
+            self._compaction_thread = None
+
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+            self._segments = []
+            self._index = {}
+
+    #
+    # Compaction
+    #
+    @property
+    def garbage_ratio(self) -> float:
+        """
+        The fraction of bytes in sealed segments that belong to overwritten or deleted values.
+        """
+        with self._lock:
+            sealed = self._segments[:-1]
+            total_bytes = sum(segment.size for segment in sealed)
+            if total_bytes == 0:
+                return 0.0
+            else:
+                return sum(segment.dead_bytes for segment in sealed) / total_bytes
+
+    def compact_if_needed(self) -> bool:
+        """
+        Compact the database if the garbage ratio exceeds the configured compaction ratio.
+
+        :return: whether a compaction ran
+        """
+        with self._compaction_lock:
+            if self.garbage_ratio >= self._compaction_ratio:
+                self._compact()
+                return True
+            else:
+                return False
+
+    def compact(self) -> None:
+        """
+        Reclaim the space used by overwritten and deleted values.
+
+        All the live values in sealed segments are appended to the end of the log, after
+        which those segments are removed. Because every sealed segment is compacted together,
+        any delete marker in them can only refer to a value in an older sealed segment, so
+        the markers can be safely dropped.
+
+        Reads and writes can continue while compacting: the lock is only held to seal the
+        active segment, to rewrite each chunk of :data:`COMPACTION_CHUNK_SIZE` values, and
+        to remove the sealed segments.
+        """
+        with self._compaction_lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        with self._lock:
+            # Seal the active segment, so that the compacted values are appended after it
+            self._start_segment()
+            sealed = self._segments[:-1]
+            if not sealed:
+                return
+            sealed_ids = {segment.segment_id for segment in sealed}
+
+            # Only the keys are collected, in the order of their values in the log, so
+            # that each segment is read sequentially
+            live_entries = sorted(
+                (segment.segment_id, offset, key)
+                for key, (segment, offset, _) in self._index.items()
+                if segment.segment_id in sealed_ids
+            )
+
+        num_rewritten = 0
+        for chunk_start in range(0, len(live_entries), COMPACTION_CHUNK_SIZE):
+            chunk_keys = tuple(
+                key for _, _, key in live_entries[chunk_start:chunk_start + COMPACTION_CHUNK_SIZE]
+            )
+            num_rewritten += self._rewrite_live_values(chunk_keys, sealed_ids)
+
+        with self._lock:
+            # The compacted values must be durable before the originals are removed
+            for segment in self._segments[len(sealed):]:
+                segment.sync()
+
+            for segment in sealed:
+                segment.unlink()
+            self._segments = self._segments[len(sealed):]
+
+        self.logger.debug(
+            "Compacted %d segments, rewriting %d live values",
+            len(sealed),
+            num_rewritten,
+        )
+
+    def _rewrite_live_values(self, keys: Iterable[bytes], sealed_ids: Set[int]) -> int:
+        """
+        Append the values of ``keys`` that are still stored in a sealed segment. Keys that
+        were overwritten or deleted since the compaction started are skipped.
+        """
+        with self._lock:
+            live_items = []
+            for key in keys:
+                try:
+                    segment, offset, length = self._index[key]
+                except KeyError:
+                    continue
+                if segment.segment_id in sealed_ids:
+                    live_items.append((key, segment.read(offset, length)))
+
+            self._write(live_items, ())
+            return len(live_items)
+
+    def _run_compaction(self, interval: float) -> None:
+        while not self._stop_compaction.wait(interval):
+            try:
+                self.compact_if_needed()
+            except Exception:
+                self.logger.exception("Background compaction of %s failed", self.db_path)
+
+    #
+    # Internal
+    #
+    def _load_segments(self) -> None:
+        segment_paths = sorted(self.db_path.glob('*' + SEGMENT_SUFFIX))
+        for position, path in enumerate(segment_paths):
+            segment = _Segment(int(path.stem), path)
+            self._segments.append(segment)
+
+            valid_size = 0
+            for payload_offset, payload in segment.iter_frames():
+                self._index_frame(segment, payload_offset, payload)
+                valid_size = payload_offset + len(payload)
+
+            if valid_size != segment.size:
+                if position == len(segment_paths) - 1:
+                    # Only the last segment is written to, so a crash can leave a partial
+                    # frame at its end. That frame was never acknowledged, so drop it.
+                    self.logger.warning(
+                        "Truncating %d bytes of incomplete writes at the end of %s",
+                        segment.size - valid_size,
+                        path,
+                    )
+                    segment.truncate(valid_size)
+                else:
+                    raise ValidationError(
+                        f"Segment {path} is corrupt after byte {valid_size}, "
+                        f"but is followed by newer segments"
+                    )
+
+        if not self._segments:
+            self._start_segment()
+
+    def _start_segment(self) -> None:
+        if self._segments:
+            if self._segments[-1].size == 0:
+                # The active segment is already empty
+                return
+            next_id = self._segments[-1].segment_id + 1
+        else:
+            next_id = 0
+
+        path = self.db_path / f"{next_id:08d}{SEGMENT_SUFFIX}"
+        self._segments.append(_Segment(next_id, path))
+
+    def _write(self,
+               puts: Iterable[Tuple[bytes, bytes]],
+               deletes: Iterable[bytes]) -> None:
+        records = []
+        for key, value in puts:
+            records.append(RECORD_HEADER.pack(RECORD_PUT, len(key), len(value)))
+            records.append(key)
+            records.append(value)
+        for key in deletes:
+            records.append(RECORD_HEADER.pack(RECORD_DELETE, len(key), 0))
+            records.append(key)
+
+        payload = b''.join(records)
+        if not payload:
+            return
+
+        frame = FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        with self._lock:
+            active = self._segments[-1]
+            if active.size and active.size + len(frame) > self._max_segment_size:
+                self._start_segment()
+                active = self._segments[-1]
+
+            frame_offset = active.append(frame)
+            self._index_frame(active, frame_offset + FRAME_HEADER.size, payload)
+
+    def _index_frame(self, segment: _Segment, payload_offset: int, payload: bytes) -> None:
+        index = self._index
+        for kind, _, key, value_offset, value_length in _iter_records(payload):
+            if key in index:
+                old_segment, _, old_length = index[key]
+                old_segment.dead_bytes += _record_size(key, old_length)
+
+            if kind == RECORD_PUT:
+                index[key] = (segment, payload_offset + value_offset, value_length)
+            elif kind == RECORD_DELETE:
+                index.pop(key, None)
+                # A delete marker is never needed after its segment is compacted
+                segment.dead_bytes += _record_size(key, 0)
+            else:
+                raise ValidationError(f"Unknown record kind {kind} in {segment.path}")
+
+    def _write_diff(self, diff: DBDiff) -> None:
+        self._write(diff.pending_items(), diff.deleted_keys())
+
+
+class SegmentLogDBWriteBatch(BaseDB, AtomicWriteBatchAPI):
+    """
+    Collects the writes of an atomic batch, which are appended to the log
+    as a single checksummed frame on commit.
+    """
+    logger = logging.getLogger("eth.db.backends.SegmentLogDBWriteBatch")
+
+    _write_target_db: SegmentLogDB = None
+    _track_diff: DBDiffTracker = None
+
+    def __init__(self, write_target_db: SegmentLogDB) -> None:
+        self._write_target_db = write_target_db
+        self._track_diff = DBDiffTracker()
+
+    def __getitem__(self, key: bytes) -> bytes:
+        if self._track_diff is None:
+            raise ValidationError("Cannot get data from a write batch, out of context")
+
+        try:
+            value = self._track_diff[key]
+        except DiffMissingError as missing:
+            if missing.is_deleted:
+                raise KeyError(key)
+            else:
+                return self._write_target_db[key]
+        else:
+            return value
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        if self._track_diff is None:
+            raise ValidationError("Cannot set data from a write batch, out of context")
+
+        self._track_diff[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        if self._track_diff is None:
+            raise ValidationError("Cannot delete data from a write batch, out of context")
+
+        if key not in self:
+            raise KeyError(key)
+        del self._track_diff[key]
+
+    def _exists(self, key: bytes) -> bool:
+        if self._track_diff is None:
+            raise ValidationError("Cannot test data existance from a write batch, out of context")
+
+        try:
+            self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    @classmethod
+    @contextmanager
+    def _commit_unless_raises(cls, write_target_db: SegmentLogDB) -> Iterator[AtomicWriteBatchAPI]:
+        readable_write_batch = cls(write_target_db)
+        try:
+            yield readable_write_batch
+        except Exception:
+            cls.logger.exception(
+                "Unexpected error in atomic db write, dropped partial writes: %r",
+                readable_write_batch._track_diff.diff(),
+            )
+            raise
+        else:
+            write_target_db._write_diff(readable_write_batch._track_diff.diff())
+        finally:
+            # force a shutdown of this batch, to prevent out-of-context usage
+            readable_write_batch._track_diff = None
+            readable_write_batch._write_target_db = None
@@ -0,0 +1,145 @@
+"""
+Helpers for the log index of :class:`~eth.db.chain.ChainDB`.
+
+The header blooms of the canonical chain are grouped into sections of consecutive
+blocks. Each section is stored rotated: one bit vector per bloom bit, where bit ``j``
+of the vector for bloom bit ``i`` is set if bloom bit ``i`` is set in the header of the
+``j``-th block of the section. Checking a value against a whole section then only
+takes the three vectors of the bloom bits of that value.
+"""
+from typing import (
+    Callable,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from eth_bloom import BloomFilter
+from eth_bloom.bloom import get_bloom_bits
+from eth_typing import (
+    Address,
+    BlockNumber,
+)
+
+from eth.abc import LogAPI
+from eth.rlp.sedes import uint32
+
+
+BLOOM_BITS_SECTION_SIZE = 4096
+BLOOM_BIT_LENGTH = 2048
+
+# Each group must match at least one of its values
+BloomCriteria = Tuple[Tuple[bytes, ...], ...]
+TopicsFilter = Sequence[Optional[Sequence[int]]]
+
+
+def get_section_bounds(section: int, section_size: int) -> Tuple[BlockNumber, BlockNumber]:
+    """
+    Return the first and last block numbers of a section.
+    """
+    first_block = section * section_size
+    return BlockNumber(first_block), BlockNumber(first_block + section_size - 1)
+
+
+def get_bloom_bit_indices(value: bytes) -> Tuple[int, ...]:
+    """
+    Return the positions of the bloom bits that are set by adding ``value`` to a bloom.
+    """
+    return tuple(bloom_bits.bit_length() - 1 for bloom_bits in get_bloom_bits(value))
+
+
+def rotate_blooms(blooms: Sequence[int]) -> Tuple[int, ...]:
+    """
+    Return one vector for every bloom bit, with bit ``j`` set if the bloom bit is
+    set in ``blooms[j]``.
+    """
+    vectors = [0] * BLOOM_BIT_LENGTH
+    for offset, bloom in enumerate(blooms):
+        block_bit = 1 << offset
+        while bloom:
+            lowest_bit = bloom & -bloom
+            vectors[lowest_bit.bit_length() - 1] |= block_bit
+            bloom ^= lowest_bit
+    return tuple(vectors)
+
+
+def encode_bloom_bits(vector: int) -> bytes:
+    return vector.to_bytes((vector.bit_length() + 7) // 8, 'big')
+
+
+def decode_bloom_bits(encoded: bytes) -> int:
+    return int.from_bytes(encoded, 'big')
+
+
+def make_bloom_criteria(addresses: Sequence[Address], topics: TopicsFilter) -> BloomCriteria:
+    """
+    Convert a log filter into the groups of values that must be in a bloom to match it.
+
+    :param addresses: the log must come from one of these addresses, or any address if empty
+    :param topics: for each position, the topic must be one of the given topics, or any topic
+        if ``None`` or empty
+    """
+    criteria = []
+    if addresses:
+        criteria.append(tuple(addresses))
+    for alternatives in topics:
+        if alternatives:
+            criteria.append(tuple(uint32.serialize(topic) for topic in alternatives))
+    return tuple(criteria)
+
+
+def bloom_matches(bloom: int, criteria: BloomCriteria) -> bool:
+    bloom_filter = BloomFilter(bloom)
+    return all(
+        any(value in bloom_filter for value in alternatives)
+        for alternatives in criteria
+    )
+
+
+def match_section(
+        criteria: BloomCriteria,
+        get_vector: Callable[[int], int],
+        section_size: int) -> int:
+    """
+    Return a vector with bit ``j`` set if the bloom of the ``j``-th block of a section
+    matches the criteria.
+
+    :param get_vector: look up the vector of a bloom bit in the section
+    """
+    candidates = (1 << section_size) - 1
+    for alternatives in criteria:
+        group_candidates = 0
+        for value in alternatives:
+            value_candidates = candidates
+            for bit in get_bloom_bit_indices(value):
+                value_candidates &= get_vector(bit)
+            group_candidates |= value_candidates
+
+        candidates &= group_candidates
+        if not candidates:
+            break
+    return candidates
+
+
+def iter_vector_offsets(vector: int) -> Iterable[int]:
+    """
+    Yield the positions of the bits set in the vector, in ascending order.
+    """
+    while vector:
+        lowest_bit = vector & -vector
+        yield lowest_bit.bit_length() - 1
+        vector ^= lowest_bit
+
+
+def log_matches(log: LogAPI, addresses: Sequence[Address], topics: TopicsFilter) -> bool:
+    if addresses and log.address not in addresses:
+        return False
+
+    for position, alternatives in enumerate(topics):
+        if not alternatives:
+            continue
+        elif position >= len(log.topics) or log.topics[position] not in alternatives:
+            return False
+
+    return True
@@ -2,14 +2,17 @@ import functools
 import itertools
 
 from typing import (
+    Callable,
     Dict,
     Iterable,
+    Optional,
     Sequence,
     Tuple,
     Type,
 )
 
 from eth_typing import (
+    Address,
     BlockNumber,
     Hash32
 )
@@ -28,13 +31,28 @@ from eth.abc import (
     ChainDatabaseAPI,
     DatabaseAPI,
     AtomicDatabaseAPI,
+    LogMatch,
     ReceiptAPI,
     SignedTransactionAPI,
 )
 from eth.constants import (
+    BLANK_ROOT_HASH,
     EMPTY_UNCLE_HASH,
     GENESIS_PARENT_HASH,
 )
+from eth.db.bloombits import (
+    BLOOM_BITS_SECTION_SIZE,
+    bloom_matches,
+    decode_bloom_bits,
+    encode_bloom_bits,
+    get_section_bounds,
+    iter_vector_offsets,
+    log_matches,
+    make_bloom_criteria,
+    match_section,
+    rotate_blooms,
+    BloomCriteria,
+)
 from eth.db.chain_gaps import (
     fill_gap,
     GapChange,
@@ -43,8 +61,12 @@ from eth.db.chain_gaps import (
     is_block_number_in_gap,
     reopen_gap,
 )
-from eth.db.trie import make_trie_root_and_nodes
+from eth.db.trie import (
+    make_trie_root_and_nodes,
+    TransactionsOrReceipts,
+)
 from eth.exceptions import (
+    CanonicalHeadNotFound,
     HeaderNotFound,
     ReceiptNotFound,
     TransactionNotFound,
@@ -81,9 +103,16 @@ class TransactionKey(rlp.Serializable):
     ]
 
 
+# The flat copy of a transaction or receipt trie: the list of the encoded values, by index
+ENCODED_TRIE_ITEMS = rlp.sedes.CountableList(rlp.sedes.binary)
+
+
 class ChainDB(HeaderDB, ChainDatabaseAPI):
+    # Number of blocks in each section of the log index
+    bloom_bits_section_size = BLOOM_BITS_SECTION_SIZE
+
     def __init__(self, db: AtomicDatabaseAPI) -> None:
-        self.db = db
+        super().__init__(db)
 
     def get_chain_gaps(self) -> ChainGaps:
         return self._get_chain_gaps(self.db)
@@ -205,7 +234,7 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
                       block: BlockAPI,
                       genesis_parent_hash: Hash32 = GENESIS_PARENT_HASH
                       ) -> Tuple[Tuple[Hash32, ...], Tuple[Hash32, ...]]:
-        with self.db.atomic_batch() as db:
+        with self._canonical_write_batch() as db:
             return self._persist_block(db, block, genesis_parent_hash)
 
     def persist_unexecuted_block(self,
@@ -230,9 +259,19 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
                 f"does not match expected value: {receipt_root_hash!r}"
             )
 
-        with self.db.atomic_batch() as db:
+        with self._canonical_write_batch() as db:
             self._persist_trie_data_dict(db, receipt_kv_nodes)
             self._persist_trie_data_dict(db, tx_kv_nodes)
+            self._persist_flat_trie_items(
+                db,
+                SchemaV1.make_receipt_root_to_receipts_lookup_key(receipt_root_hash),
+                receipts,
+            )
+            self._persist_flat_trie_items(
+                db,
+                SchemaV1.make_transaction_root_to_transactions_lookup_key(tx_root_hash),
+                block.transactions,
+            )
 
             return self._persist_block(db, block, genesis_parent_hash)
 
@@ -261,6 +300,12 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
             for index, transaction_hash in enumerate(tx_hashes):
                 cls._add_transaction_to_canonical_chain(db, transaction_hash, header, index)
 
+            if (header.block_number + 1) % cls.bloom_bits_section_size == 0:
+                cls._index_bloom_bits_section(
+                    db,
+                    header.block_number // cls.bloom_bits_section_size,
+                )
+
         if block.uncles:
             uncles_hash = cls._persist_uncles(db, block.uncles)
         else:
@@ -305,6 +350,96 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
         transaction_db[index_key] = rlp.encode(transaction)
         return transaction_db.root_hash
 
+    def persist_transactions(self, transactions: Sequence[SignedTransactionAPI]) -> Hash32:
+        with self.db.atomic_batch() as db:
+            return self._persist_trie_items(
+                db,
+                transactions,
+                SchemaV1.make_transaction_root_to_transactions_lookup_key,
+            )
+
+    def persist_receipts(self, receipts: Sequence[ReceiptAPI]) -> Hash32:
+        with self.db.atomic_batch() as db:
+            return self._persist_trie_items(
+                db,
+                receipts,
+                SchemaV1.make_receipt_root_to_receipts_lookup_key,
+            )
+
+    @classmethod
+    def _persist_trie_items(
+            cls,
+            db: DatabaseAPI,
+            items: TransactionsOrReceipts,
+            make_lookup_key: Callable[[Hash32], bytes]) -> Hash32:
+        root_hash, kv_nodes = make_trie_root_and_nodes(items)
+        cls._persist_trie_data_dict(db, kv_nodes)
+        cls._persist_flat_trie_items(db, make_lookup_key(root_hash), items)
+        return root_hash
+
+    @staticmethod
+    def _persist_flat_trie_items(
+            db: DatabaseAPI,
+            lookup_key: bytes,
+            items: TransactionsOrReceipts) -> None:
+        """
+        Store all the encoded items of a trie in a single value, so they can be read
+        back without walking the trie.
+        """
+        encoded_items = tuple(rlp.encode(item) for item in items)
+        db.set(lookup_key, rlp.encode(encoded_items, sedes=ENCODED_TRIE_ITEMS))
+
+    @classmethod
+    def _get_encoded_trie_items(
+            cls,
+            db: DatabaseAPI,
+            root_hash: Hash32,
+            make_lookup_key: Callable[[Hash32], bytes]) -> Tuple[bytes, ...]:
+        """
+        Returns all the encoded items of a transaction or receipt trie, by index. They are read
+        from the flat copy of the trie if there is one, or else by walking the trie.
+        """
+        if root_hash == BLANK_ROOT_HASH:
+            return ()
+
+        try:
+            encoded_items = db[make_lookup_key(root_hash)]
+        except KeyError:
+            return tuple(cls._walk_trie_items(db, root_hash))
+        else:
+            return tuple(rlp.decode(encoded_items, sedes=ENCODED_TRIE_ITEMS))
+
+    @staticmethod
+    def _walk_trie_items(db: DatabaseAPI, root_hash: Hash32) -> Iterable[bytes]:
+        trie = HexaryTrie(db, root_hash=root_hash)
+        for index in itertools.count():
+            encoded = trie[rlp.encode(index)]
+            if encoded != b'':
+                yield encoded
+            else:
+                break
+
+    @staticmethod
+    def _get_encoded_trie_item(
+            db: DatabaseAPI,
+            root_hash: Hash32,
+            make_lookup_key: Callable[[Hash32], bytes],
+            index: int) -> bytes:
+        """
+        Returns the encoded item at the given index of a transaction or receipt trie, or
+        an empty bytestring if there is none.
+        """
+        try:
+            encoded_items = db[make_lookup_key(root_hash)]
+        except KeyError:
+            return HexaryTrie(db, root_hash=root_hash)[rlp.encode(index)]
+
+        items = rlp.decode(encoded_items, sedes=ENCODED_TRIE_ITEMS)
+        if 0 <= index < len(items):
+            return items[index]
+        else:
+            return b''
+
     def get_block_transactions(
             self,
             header: BlockHeaderAPI,
@@ -335,14 +470,13 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
     def get_receipts(self,
                      header: BlockHeaderAPI,
                      receipt_class: Type[ReceiptAPI]) -> Iterable[ReceiptAPI]:
-        receipt_db = HexaryTrie(db=self.db, root_hash=header.receipt_root)
-        for receipt_idx in itertools.count():
-            receipt_key = rlp.encode(receipt_idx)
-            receipt_data = receipt_db[receipt_key]
-            if receipt_data != b'':
-                yield rlp.decode(receipt_data, sedes=receipt_class)
-            else:
-                break
+        all_encoded_receipts = self._get_encoded_trie_items(
+            self.db,
+            header.receipt_root,
+            SchemaV1.make_receipt_root_to_receipts_lookup_key,
+        )
+        for encoded_receipt in all_encoded_receipts:
+            yield rlp.decode(encoded_receipt, sedes=receipt_class)
 
     def get_transaction_by_index(
             self,
@@ -353,9 +487,12 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
             block_header = self.get_canonical_block_header_by_number(block_number)
         except HeaderNotFound:
             raise TransactionNotFound(f"Block {block_number} is not in the canonical chain")
-        transaction_db = HexaryTrie(self.db, root_hash=block_header.transaction_root)
-        encoded_index = rlp.encode(transaction_index)
-        encoded_transaction = transaction_db[encoded_index]
+        encoded_transaction = self._get_encoded_trie_item(
+            self.db,
+            block_header.transaction_root,
+            SchemaV1.make_transaction_root_to_transactions_lookup_key,
+            transaction_index,
+        )
         if encoded_transaction != b'':
             return rlp.decode(encoded_transaction, sedes=transaction_class)
         else:
@@ -383,9 +520,12 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
         except HeaderNotFound:
             raise ReceiptNotFound(f"Block {block_number} is not in the canonical chain")
 
-        receipt_db = HexaryTrie(db=self.db, root_hash=block_header.receipt_root)
-        receipt_key = rlp.encode(receipt_index)
-        receipt_data = receipt_db[receipt_key]
+        receipt_data = self._get_encoded_trie_item(
+            self.db,
+            block_header.receipt_root,
+            SchemaV1.make_receipt_root_to_receipts_lookup_key,
+            receipt_index,
+        )
         if receipt_data != b'':
             return rlp.decode(receipt_data, sedes=Receipt)
         else:
@@ -393,19 +533,19 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
                 f"Receipt with index {receipt_index} not found in block"
             )
 
-    @staticmethod
-    def _get_block_transaction_data(db: DatabaseAPI, transaction_root: Hash32) -> Iterable[Hash32]:
+    @classmethod
+    def _get_block_transaction_data(
+            cls,
+            db: DatabaseAPI,
+            transaction_root: Hash32) -> Iterable[bytes]:
         """
         Returns iterable of the encoded transactions for the given block header
         """
-        transaction_db = HexaryTrie(db, root_hash=transaction_root)
-        for transaction_idx in itertools.count():
-            transaction_key = rlp.encode(transaction_idx)
-            encoded = transaction_db[transaction_key]
-            if encoded != b'':
-                yield encoded
-            else:
-                break
+        return cls._get_encoded_trie_items(
+            db,
+            transaction_root,
+            SchemaV1.make_transaction_root_to_transactions_lookup_key,
+        )
 
     @functools.lru_cache(maxsize=32)
     @to_tuple
@@ -445,6 +585,106 @@ class ChainDB(HeaderDB, ChainDatabaseAPI):
             rlp.encode(transaction_key),
         )
 
+    #
+    # Log API
+    #
+    def get_logs(
+            self,
+            from_block: BlockNumber,
+            to_block: BlockNumber,
+            addresses: Sequence[Address] = (),
+            topics: Sequence[Optional[Sequence[int]]] = ()) -> Iterable[LogMatch]:
+        try:
+            head_number = self.get_canonical_head().block_number
+        except CanonicalHeadNotFound:
+            return
+        to_block = min(to_block, head_number)
+        if from_block > to_block:
+            return
+
+        criteria = make_bloom_criteria(addresses, topics)
+        section_size = self.bloom_bits_section_size
+        for section in range(from_block // section_size, to_block // section_size + 1):
+            for block_number in self._get_bloom_candidates(section, criteria):
+                if from_block <= block_number <= to_block:
+                    yield from self._get_matching_logs(block_number, addresses, topics)
+
+    def _get_bloom_candidates(self, section: int, criteria: BloomCriteria) -> Iterable[BlockNumber]:
+        """
+        Yield the numbers of the canonical blocks in a section whose blooms match the criteria.
+        The rotated bloom bits are used if the section was indexed, and the blooms in the
+        headers otherwise.
+        """
+        first_block, last_block = get_section_bounds(section, self.bloom_bits_section_size)
+        if self._is_bloom_bits_section_indexed(section):
+            def get_vector(bit: int) -> int:
+                key = SchemaV1.make_bloom_bits_lookup_key(bit, section)
+                return decode_bloom_bits(self.db[key])
+
+            candidates = match_section(criteria, get_vector, self.bloom_bits_section_size)
+            for offset in iter_vector_offsets(candidates):
+                yield BlockNumber(first_block + offset)
+        else:
+            for block_number in range(first_block, last_block + 1):
+                try:
+                    header = self.get_canonical_block_header_by_number(BlockNumber(block_number))
+                except HeaderNotFound:
+                    # Either a gap in the chain, or past the tip
+                    continue
+                if bloom_matches(header.bloom, criteria):
+                    yield BlockNumber(block_number)
+
+    def _is_bloom_bits_section_indexed(self, section: int) -> bool:
+        """
+        A section is only indexed if it was indexed for the blocks that are canonical now.
+        Checking the last block is enough, because its hash commits to all its ancestors.
+        """
+        section_head_key = SchemaV1.make_bloom_bits_section_head_lookup_key(section)
+        indexed_head_hash = self.db.get(section_head_key)
+        if indexed_head_hash is None:
+            return False
+
+        _, last_block = get_section_bounds(section, self.bloom_bits_section_size)
+        try:
+            return self.get_canonical_block_hash(last_block) == indexed_head_hash
+        except HeaderNotFound:
+            return False
+
+    def _get_matching_logs(
+            self,
+            block_number: BlockNumber,
+            addresses: Sequence[Address],
+            topics: Sequence[Optional[Sequence[int]]]) -> Iterable[LogMatch]:
+        header = self.get_canonical_block_header_by_number(block_number)
+        log_index = 0
+        for transaction_index, receipt in enumerate(self.get_receipts(header, Receipt)):
+            for log in receipt.logs:
+                # The bloom may have had a false positive
+                if log_matches(log, addresses, topics):
+                    yield LogMatch(block_number, header.hash, transaction_index, log_index, log)
+                log_index += 1
+
+    @classmethod
+    def _index_bloom_bits_section(cls, db: DatabaseAPI, section: int) -> None:
+        """
+        Store the rotated blooms of a full section of the canonical chain. Any previous
+        index of the section, from before a reorg, is overwritten.
+        """
+        first_block, last_block = get_section_bounds(section, cls.bloom_bits_section_size)
+        try:
+            headers = tuple(
+                cls._get_canonical_block_header_by_number(db, BlockNumber(block_number))
+                for block_number in range(first_block, last_block + 1)
+            )
+        except HeaderNotFound:
+            # There is a gap in the section, so leave it unindexed
+            return
+
+        vectors = rotate_blooms(tuple(header.bloom for header in headers))
+        for bit, vector in enumerate(vectors):
+            db.set(SchemaV1.make_bloom_bits_lookup_key(bit, section), encode_bloom_bits(vector))
+        db.set(SchemaV1.make_bloom_bits_section_head_lookup_key(section), headers[-1].hash)
+
     #
     # Raw Database API
     #
@@ -0,0 +1,169 @@
+from collections import OrderedDict
+import threading
+from typing import (
+    Optional,
+    Set,
+    Tuple,
+)
+
+from eth_typing import Hash32
+from lru import LRU
+
+from eth._utils.db import CachesByDatabase
+
+
+# The positions in a code that were found to be valid and invalid opcodes
+JumpdestAnalysis = Tuple[Set[int], Set[int]]
+
+CODE_CACHE_SIZE = 64 * 1024 * 1024
+
+CODE_SIZE_CACHE_SIZE = 16384
+
+JUMPDEST_ANALYSIS_CACHE_SIZE = 16 * 1024 * 1024
+
+# A rough count of the bytes taken by a position in a jumpdest analysis
+ANALYSIS_POSITION_SIZE = 64
+
+
+class CodeCache:
+    """
+    Contract code and code sizes keyed by code hash, shared by all the
+    :class:`~eth.db.account.AccountDB` that read the same database, so that hot contracts
+    are not read from the database in every block. The least recently used code is evicted
+    when the code held exceeds ``max_size`` bytes.
+
+    The code behind a hash never changes, so the cache never needs to be invalidated. It is
+    only filled with code that was read from its database, so that another database, or
+    code that was written and then reverted, is never served from it.
+
+    The cache is safe to use from multiple threads.
+    """
+    def __init__(self, max_size: int, max_sizes: int = CODE_SIZE_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._code_by_hash: 'OrderedDict[Hash32, bytes]' = OrderedDict()
+        self._sizes_by_hash: 'LRU[Hash32, int]' = LRU(max_sizes)
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Return the fraction of the lookups that found the code, or 0 before any lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._code_by_hash)
+
+    def __contains__(self, code_hash: Hash32) -> bool:
+        return code_hash in self._code_by_hash
+
+    def get(self, code_hash: Hash32) -> Optional[bytes]:
+        with self._lock:
+            try:
+                code = self._code_by_hash[code_hash]
+            except KeyError:
+                self.misses += 1
+                return None
+            else:
+                self._code_by_hash.move_to_end(code_hash)
+                self.hits += 1
+                return code
+
+    def set(self, code_hash: Hash32, code: bytes) -> None:
+        with self._lock:
+            if code_hash in self._code_by_hash or len(code) > self.max_size:
+                return
+
+            self._code_by_hash[code_hash] = code
+            self.size += len(code)
+            while self.size > self.max_size:
+                _, evicted_code = self._code_by_hash.popitem(last=False)
+                self.size -= len(evicted_code)
+
+    def get_size(self, code_hash: Hash32) -> Optional[int]:
+        """
+        Return the size of the code behind ``code_hash``, or ``None`` if it is not known.
+        """
+        with self._lock:
+            if code_hash in self._sizes_by_hash:
+                return self._sizes_by_hash[code_hash]
+            elif code_hash in self._code_by_hash:
+                return len(self._code_by_hash[code_hash])
+            else:
+                return None
+
+    def set_size(self, code_hash: Hash32, code_size: int) -> None:
+        with self._lock:
+            self._sizes_by_hash[code_hash] = code_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._code_by_hash.clear()
+            self._sizes_by_hash.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+code_caches: CachesByDatabase[CodeCache] = CachesByDatabase(lambda: CodeCache(CODE_CACHE_SIZE))
+
+
+def _get_analysis_size(code: bytes, analysis: JumpdestAnalysis) -> int:
+    valid_positions, invalid_positions = analysis
+    return len(code) + (len(valid_positions) + len(invalid_positions)) * ANALYSIS_POSITION_SIZE
+
+
+class JumpdestAnalysisCache:
+    """
+    The jumpdest analysis of recently run code, keyed by the code, and shared by all the
+    :class:`~eth.vm.code_stream.CodeStream` of the process that run the same code. The
+    analysis only depends on the code, so it can be shared by all databases.
+
+    The positions are added to the analysis while the code runs, so the size of an entry is
+    measured again each time it is looked up. The least recently used entries are evicted
+    when the code and the positions take more than ``max_size`` bytes.
+
+    The cache is safe to use from multiple threads.
+    """
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._entries: 'OrderedDict[bytes, Tuple[JumpdestAnalysis, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, code: bytes) -> JumpdestAnalysis:
+        """
+        Return the sets of valid and invalid opcode positions of ``code``, which are shared
+        with other runs of the same code while it is cached.
+        """
+        with self._lock:
+            try:
+                analysis, entry_size = self._entries.pop(code)
+            except KeyError:
+                analysis, entry_size = (set(), set()), 0
+
+            self.size -= entry_size
+            new_entry_size = _get_analysis_size(code, analysis)
+            if new_entry_size <= self.max_size:
+                self._entries[code] = (analysis, new_entry_size)
+                self.size += new_entry_size
+                while self.size > self.max_size:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self.size -= evicted_size
+
+            return analysis
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+jumpdest_analysis_cache = JumpdestAnalysisCache(JUMPDEST_ANALYSIS_CACHE_SIZE)
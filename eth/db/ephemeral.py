@@ -0,0 +1,411 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from eth_hash.auto import keccak
+from eth_typing import (
+    Address,
+    Hash32,
+)
+from eth_utils import (
+    ValidationError,
+)
+
+from eth.abc import (
+    AccountDatabaseAPI,
+    MetaWitnessAPI,
+)
+from eth.constants import (
+    BLANK_ROOT_HASH,
+    EMPTY_SHA3,
+)
+from eth.db.journal import (
+    get_next_checkpoint,
+)
+from eth.rlp.accounts import (
+    Account,
+)
+from eth.typing import (
+    JournalDBCheckpoint,
+)
+from eth.validation import (
+    validate_canonical_address,
+    validate_is_bytes,
+    validate_uint256,
+)
+
+
+# Marks a value that was not in the overlay, in the undo log
+_MISSING = object()
+
+
+class EphemeralAccountDB(AccountDatabaseAPI):
+    """
+    An account database for execution whose changes are thrown away, like ``eth_call``.
+
+    Changes are kept in flat dicts on top of a base account database, which is only read.
+    Checkpoints are positions in a log of the writes to undo, so recording and committing
+    them is cheap, and writes made while no checkpoint is open are not logged at all.
+    The storage tries of the base are never written to, unless :meth:`make_state_root`
+    is called.
+
+    Forks share the base, along with the accounts and storage it has cached, so running
+    many calls at the same state only reads each account from the database once.
+    """
+    def __init__(self, base_db: AccountDatabaseAPI) -> None:
+        self._base_db = base_db
+
+        # None is a deleted account
+        self._accounts: Dict[Address, Optional[Account]] = {}
+        self._storage: Dict[Address, Dict[int, int]] = {}
+        self._wiped_storage: Set[Address] = set()
+        self._code_by_hash: Dict[Hash32, bytes] = {}
+
+        # The storage at the beginning of the transaction, of the slots that changed since
+        self._original_storage: Dict[Tuple[Address, int], int] = {}
+        # Like with AccountDB, the original storage reads empty once it is deleted
+        self._wiped_original_storage: Set[Address] = set()
+
+        self._undo_log: List[Callable[[], None]] = []
+        self._checkpoints: List[Tuple[JournalDBCheckpoint, int]] = []
+
+        # Whether the changes were applied to the base, by make_state_root()
+        self._changed_base = False
+        # Whether forks read from the same base
+        self._shares_base = False
+
+    @property
+    def state_root(self) -> Hash32:
+        return self._base_db.state_root
+
+    @state_root.setter
+    def state_root(self, value: Hash32) -> None:
+        self._base_db.state_root = value
+
+    def has_root(self, state_root: bytes) -> bool:
+        return self._base_db.has_root(state_root)
+
+    #
+    # Storage
+    #
+    def get_storage(self, address: Address, slot: int, from_journal: bool=True) -> int:
+        validate_canonical_address(address, title="Storage Address")
+        validate_uint256(slot, title="Storage Slot")
+
+        if not from_journal:
+            return self._get_original_storage(address, slot)
+        else:
+            return self._get_storage(address, slot)
+
+    def _get_storage(self, address: Address, slot: int) -> int:
+        slots = self._storage.get(address)
+        if slots is not None and slot in slots:
+            return slots[slot]
+        elif address in self._wiped_storage:
+            return 0
+        else:
+            return self._base_db.get_storage(address, slot)
+
+    def _get_original_storage(self, address: Address, slot: int) -> int:
+        if address in self._wiped_original_storage:
+            return 0
+        elif (address, slot) in self._original_storage:
+            return self._original_storage[address, slot]
+        else:
+            # The slot did not change since the beginning of the transaction
+            return self._get_storage(address, slot)
+
+    def set_storage(self, address: Address, slot: int, value: int) -> None:
+        validate_uint256(value, title="Storage Value")
+        validate_uint256(slot, title="Storage Slot")
+        validate_canonical_address(address, title="Storage Address")
+
+        key = (address, slot)
+        if key not in self._original_storage and address not in self._wiped_original_storage:
+            self._original_storage[key] = self._get_storage(address, slot)
+
+        slots = self._storage.setdefault(address, {})
+        if self._checkpoints:
+            self._undo_log.append(_make_restore(slots, slot, slots.get(slot, _MISSING)))
+        slots[slot] = value
+
+    def delete_storage(self, address: Address) -> None:
+        validate_canonical_address(address, title="Storage Address")
+
+        account = self._get_account(address)
+        self._set_account(address, account.copy(storage_root=BLANK_ROOT_HASH))
+        self._wipe_storage(address)
+
+    def _wipe_storage(self, address: Address) -> None:
+        previous_slots = self._storage.pop(address, None)
+        was_wiped = address in self._wiped_storage
+
+        was_original_wiped = address in self._wiped_original_storage
+        if self._checkpoints:
+            self._undo_log.append(lambda: self._restore_storage(
+                address,
+                previous_slots,
+                was_wiped,
+                was_original_wiped,
+            ))
+
+        self._wiped_storage.add(address)
+        self._wiped_original_storage.add(address)
+
+    def _restore_storage(self,
+                         address: Address,
+                         slots: Optional[Dict[int, int]],
+                         was_wiped: bool,
+                         was_original_wiped: bool) -> None:
+        if slots is None:
+            self._storage.pop(address, None)
+        else:
+            self._storage[address] = slots
+
+        if not was_wiped:
+            self._wiped_storage.discard(address)
+        if not was_original_wiped:
+            self._wiped_original_storage.discard(address)
+
+    #
+    # Balance
+    #
+    def get_balance(self, address: Address) -> int:
+        validate_canonical_address(address, title="Storage Address")
+
+        if address in self._accounts:
+            return self._get_account(address).balance
+        else:
+            return self._base_db.get_balance(address)
+
+    def set_balance(self, address: Address, balance: int) -> None:
+        validate_canonical_address(address, title="Storage Address")
+        validate_uint256(balance, title="Account Balance")
+
+        account = self._get_account(address)
+        self._set_account(address, account.copy(balance=balance))
+
+    #
+    # Nonce
+    #
+    def get_nonce(self, address: Address) -> int:
+        validate_canonical_address(address, title="Storage Address")
+
+        if address in self._accounts:
+            return self._get_account(address).nonce
+        else:
+            return self._base_db.get_nonce(address)
+
+    def set_nonce(self, address: Address, nonce: int) -> None:
+        validate_canonical_address(address, title="Storage Address")
+        validate_uint256(nonce, title="Nonce")
+
+        account = self._get_account(address)
+        self._set_account(address, account.copy(nonce=nonce))
+
+    def increment_nonce(self, address: Address) -> None:
+        current_nonce = self.get_nonce(address)
+        self.set_nonce(address, current_nonce + 1)
+
+    #
+    # Code
+    #
+    def get_code(self, address: Address) -> bytes:
+        code_hash = self.get_code_hash(address)
+        if code_hash == EMPTY_SHA3:
+            return b''
+        elif code_hash in self._code_by_hash:
+            return self._code_by_hash[code_hash]
+        else:
+            # Code that was not set in the overlay is the code of the account in the base
+            return self._base_db.get_code(address)
+
+    def set_code(self, address: Address, code: bytes) -> None:
+        validate_canonical_address(address, title="Storage Address")
+        validate_is_bytes(code, title="Code")
+
+        account = self._get_account(address)
+
+        code_hash = Hash32(keccak(code))
+        self._code_by_hash[code_hash] = code
+        self._set_account(address, account.copy(code_hash=code_hash))
+
+    def get_code_size(self, address: Address) -> int:
+        code_hash = self.get_code_hash(address)
+        if code_hash == EMPTY_SHA3:
+            return 0
+        elif code_hash in self._code_by_hash:
+            return len(self._code_by_hash[code_hash])
+        else:
+            return self._base_db.get_code_size(address)
+
+    def get_code_hash(self, address: Address) -> Hash32:
+        validate_canonical_address(address, title="Storage Address")
+
+        if address in self._accounts:
+            return self._get_account(address).code_hash
+        else:
+            return self._base_db.get_code_hash(address)
+
+    def delete_code(self, address: Address) -> None:
+        validate_canonical_address(address, title="Storage Address")
+
+        account = self._get_account(address)
+        self._set_account(address, account.copy(code_hash=EMPTY_SHA3))
+
+    #
+    # Account Methods
+    #
+    def account_has_code_or_nonce(self, address: Address) -> bool:
+        return self.get_nonce(address) != 0 or self.get_code_hash(address) != EMPTY_SHA3
+
+    def delete_account(self, address: Address) -> None:
+        validate_canonical_address(address, title="Storage Address")
+
+        self._wipe_storage(address)
+        self._set_account(address, None)
+
+    def account_exists(self, address: Address) -> bool:
+        validate_canonical_address(address, title="Storage Address")
+
+        if address in self._accounts:
+            return self._accounts[address] is not None
+        else:
+            return self._base_db.account_exists(address)
+
+    def touch_account(self, address: Address) -> None:
+        validate_canonical_address(address, title="Storage Address")
+
+        account = self._get_account(address)
+        self._set_account(address, account)
+
+    def account_is_empty(self, address: Address) -> bool:
+        return not self.account_has_code_or_nonce(address) and self.get_balance(address) == 0
+
+    #
+    # Internal
+    #
+    def _get_account(self, address: Address) -> Account:
+        if address in self._accounts:
+            account = self._accounts[address]
+            return Account() if account is None else account
+        elif not self._base_db.account_exists(address):
+            return Account()
+        else:
+            # The storage root is left blank: the overlay does not track it, see
+            # make_state_root()
+            return Account(
+                nonce=self._base_db.get_nonce(address),
+                balance=self._base_db.get_balance(address),
+                code_hash=self._base_db.get_code_hash(address),
+            )
+
+    def _set_account(self, address: Address, account: Optional[Account]) -> None:
+        if self._checkpoints:
+            self._undo_log.append(
+                _make_restore(self._accounts, address, self._accounts.get(address, _MISSING))
+            )
+        self._accounts[address] = account
+
+    #
+    # Record and discard API
+    #
+    def record(self) -> JournalDBCheckpoint:
+        checkpoint = get_next_checkpoint()
+        self._checkpoints.append((checkpoint, len(self._undo_log)))
+        return checkpoint
+
+    def discard(self, checkpoint: JournalDBCheckpoint) -> None:
+        undo_position = self._pop_checkpoint(checkpoint)
+        while len(self._undo_log) > undo_position:
+            undo = self._undo_log.pop()
+            undo()
+
+    def commit(self, checkpoint: JournalDBCheckpoint) -> None:
+        self._pop_checkpoint(checkpoint)
+        if not self._checkpoints:
+            # Nothing can be undone anymore
+            self._undo_log.clear()
+
+    def _pop_checkpoint(self, checkpoint: JournalDBCheckpoint) -> int:
+        for index, (recorded_checkpoint, undo_position) in enumerate(self._checkpoints):
+            if recorded_checkpoint == checkpoint:
+                del self._checkpoints[index:]
+                return undo_position
+        else:
+            raise ValidationError(f"No checkpoint {checkpoint} was found")
+
+    def lock_changes(self) -> None:
+        self._original_storage.clear()
+        self._wiped_original_storage.clear()
+
+    def make_state_root(self) -> Hash32:
+        """
+        Apply the changes to the base account database to generate the state root.
+
+        The changes can't be reverted afterwards, like with
+        :meth:`eth.db.account.AccountDB.make_state_root`.
+        """
+        if self._shares_base:
+            # Leave the base of the other forks as it was
+            self._base_db = self._base_db.fork()
+            self._shares_base = False
+
+        base_db = self._base_db
+        self._changed_base = True
+        for address in self._wiped_storage:
+            base_db.delete_storage(address)
+
+        for address, account in self._accounts.items():
+            if account is None:
+                base_db.delete_account(address)
+                continue
+
+            base_db.touch_account(address)
+            base_db.set_balance(address, account.balance)
+            base_db.set_nonce(address, account.nonce)
+            if account.code_hash != base_db.get_code_hash(address):
+                if account.code_hash == EMPTY_SHA3:
+                    base_db.delete_code(address)
+                else:
+                    base_db.set_code(address, self._code_by_hash[account.code_hash])
+
+        # After the accounts, so that deleting an account doesn't wipe the storage set after
+        for address, slots in self._storage.items():
+            for slot, value in slots.items():
+                base_db.set_storage(address, slot, value)
+
+        self._accounts.clear()
+        self._storage.clear()
+        self._wiped_storage.clear()
+        self._undo_log.clear()
+        self._checkpoints.clear()
+        self.lock_changes()
+        return base_db.make_state_root()
+
+    def persist(self) -> MetaWitnessAPI:
+        raise ValidationError("The changes of an EphemeralAccountDB can't be persisted")
+
+    def fork(self) -> 'EphemeralAccountDB':
+        if self._accounts or self._storage or self._wiped_storage or self._changed_base:
+            raise ValidationError("Cannot fork an EphemeralAccountDB with pending changes")
+        # The base is only read, so it can be shared
+        forked_db = type(self)(self._base_db)
+        forked_db._shares_base = self._shares_base = True
+        return forked_db
+
+
+def _make_restore(values: Dict[Any, Any], key: Any, previous_value: Any) -> Callable[[], None]:
+    def restore() -> None:
+        if previous_value is _MISSING:
+            values.pop(key, None)
+        else:
+            values[key] = previous_value
+
+    return restore
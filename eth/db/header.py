@@ -1,16 +1,22 @@
+from contextlib import contextmanager
 import functools
 from typing import (
     cast,
     Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
     Sequence,
+    Set,
     Tuple,
 )
 
+from lru import LRU
+
 import rlp
 
 from eth_utils.toolz import (
-    concat,
-    first,
+    partition_all,
     sliding_window,
 )
 
@@ -34,6 +40,7 @@ from eth.abc import (
 from eth.constants import (
     GENESIS_PARENT_HASH,
 )
+from eth.db.backends.base import BaseDB
 from eth.db.chain_gaps import (
     GapChange,
     GapInfo,
@@ -48,7 +55,10 @@ from eth.exceptions import (
     HeaderNotFound,
     ParentNotFound,
 )
-from eth.db.schema import SchemaV1
+from eth.db.schema import (
+    BLOCK_NUMBER_TO_HASH_PREFIX,
+    SchemaV1,
+)
 from eth.rlp.headers import BlockHeader
 from eth.rlp.sedes import chain_gaps
 from eth.typing import ChainGaps
@@ -58,9 +68,119 @@ from eth.validation import (
 )
 
 
+# Decoded headers, by hash
+HEADER_CACHE_SIZE = 2048
+# Canonical block hashes, by block number
+CANONICAL_HASH_CACHE_SIZE = 4096
+# Headers committed together by HeaderDB.persist_header_chain_in_batches
+HEADER_BATCH_SIZE = 10000
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        else:
+            return self.hits / lookups
+
+
+class HeaderCacheInfo(NamedTuple):
+    headers: CacheStats
+    canonical_hashes: CacheStats
+
+
+class _KeyWriteLoggerDB(BaseDB):
+    """
+    Wraps around a database, and records every key that is written or deleted.
+    """
+    def __init__(self, wrapped_db: DatabaseAPI) -> None:
+        self.wrapped_db = wrapped_db
+        self.keys_written: Set[bytes] = set()
+
+    def __getitem__(self, key: bytes) -> bytes:
+        return self.wrapped_db[key]
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self.keys_written.add(key)
+        self.wrapped_db[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        self.keys_written.add(key)
+        del self.wrapped_db[key]
+
+    def _exists(self, key: bytes) -> bool:
+        return key in self.wrapped_db
+
+
 class HeaderDB(HeaderDatabaseAPI):
     def __init__(self, db: AtomicDatabaseAPI) -> None:
+        """
+        Headers and canonical block hashes that are looked up through the public
+        methods are kept in bounded caches. Decoded headers are keyed by their hash, so
+        they never go stale. Canonical block hashes are dropped from the cache whenever
+        this instance rewrites the canonical chain. Writes made to the canonical chain
+        by any other means, including through another HeaderDB on the same database,
+        are not seen by the cache.
+        """
         self.db = db
+        self._header_cache: 'LRU[Hash32, BlockHeaderAPI]' = LRU(HEADER_CACHE_SIZE)
+        self._header_cache_hits = 0
+        self._header_cache_misses = 0
+        self._canonical_hash_cache: 'LRU[BlockNumber, Hash32]' = LRU(
+            CANONICAL_HASH_CACHE_SIZE
+        )
+        self._canonical_hash_cache_hits = 0
+        self._canonical_hash_cache_misses = 0
+
+    def cache_info(self) -> HeaderCacheInfo:
+        """
+        Return the hit and miss counts of the header and canonical hash caches.
+        """
+        return HeaderCacheInfo(
+            CacheStats(
+                self._header_cache_hits,
+                self._header_cache_misses,
+                len(self._header_cache),
+                HEADER_CACHE_SIZE,
+            ),
+            CacheStats(
+                self._canonical_hash_cache_hits,
+                self._canonical_hash_cache_misses,
+                len(self._canonical_hash_cache),
+                CANONICAL_HASH_CACHE_SIZE,
+            ),
+        )
+
+    def clear_canonical_hash_cache(self) -> None:
+        """
+        Drop all cached canonical block hashes. Use this after changing the canonical
+        chain without going through this instance.
+        """
+        self._canonical_hash_cache.clear()
+
+    @contextmanager
+    def _canonical_write_batch(self) -> Iterator[DatabaseAPI]:
+        """
+        Open an atomic batch on the database. After the batch is committed, drop the
+        cached canonical hash of every block number that was written or deleted in it.
+        """
+        with self.db.atomic_batch() as batch:
+            logged_batch = _KeyWriteLoggerDB(batch)
+            yield logged_batch
+
+        prefix_length = len(BLOCK_NUMBER_TO_HASH_PREFIX)
+        for key in logged_batch.keys_written:
+            if key.startswith(BLOCK_NUMBER_TO_HASH_PREFIX):
+                block_number = BlockNumber(int(key[prefix_length:]))
+                if block_number in self._canonical_hash_cache:
+                    del self._canonical_hash_cache[block_number]
 
     def get_header_chain_gaps(self) -> ChainGaps:
         return self._get_header_chain_gaps(self.db)
@@ -101,7 +221,18 @@ class HeaderDB(HeaderDatabaseAPI):
     # Canonical Chain API
     #
     def get_canonical_block_hash(self, block_number: BlockNumber) -> Hash32:
-        return self._get_canonical_block_hash(self.db, block_number)
+        validate_block_number(block_number)
+        try:
+            block_hash = self._canonical_hash_cache[block_number]
+        except KeyError:
+            self._canonical_hash_cache_misses += 1
+            # Missing block numbers raise HeaderNotFound, and are never cached
+            block_hash = self._get_canonical_block_hash(self.db, block_number)
+            self._canonical_hash_cache[block_number] = block_hash
+            return block_hash
+        else:
+            self._canonical_hash_cache_hits += 1
+            return block_hash
 
     @staticmethod
     def _get_canonical_block_hash(db: DatabaseAPI, block_number: BlockNumber) -> Hash32:
@@ -118,7 +249,8 @@ class HeaderDB(HeaderDatabaseAPI):
             return rlp.decode(encoded_key, sedes=rlp.sedes.binary)
 
     def get_canonical_block_header_by_number(self, block_number: BlockNumber) -> BlockHeaderAPI:
-        return self._get_canonical_block_header_by_number(self.db, block_number)
+        canonical_block_hash = self.get_canonical_block_hash(block_number)
+        return self.get_block_header_by_hash(canonical_block_hash)
 
     @classmethod
     def _get_canonical_block_header_by_number(
@@ -130,7 +262,8 @@ class HeaderDB(HeaderDatabaseAPI):
         return cls._get_block_header_by_hash(db, canonical_block_hash)
 
     def get_canonical_head(self) -> BlockHeaderAPI:
-        return self._get_canonical_head(self.db)
+        canonical_head_hash = self._get_canonical_head_hash(self.db)
+        return self.get_block_header_by_hash(canonical_head_hash)
 
     @classmethod
     def _get_canonical_head(cls, db: DatabaseAPI) -> BlockHeaderAPI:
@@ -148,7 +281,17 @@ class HeaderDB(HeaderDatabaseAPI):
     # Header API
     #
     def get_block_header_by_hash(self, block_hash: Hash32) -> BlockHeaderAPI:
-        return self._get_block_header_by_hash(self.db, block_hash)
+        validate_word(block_hash, title="Block Hash")
+        try:
+            header = self._header_cache[block_hash]
+        except KeyError:
+            self._header_cache_misses += 1
+            header = self._get_block_header_by_hash(self.db, block_hash)
+            self._header_cache[block_hash] = header
+            return header
+        else:
+            self._header_cache_hits += 1
+            return header
 
     @staticmethod
     def _get_block_header_by_hash(db: DatabaseAPI, block_hash: Hash32) -> BlockHeaderAPI:
@@ -192,11 +335,32 @@ class HeaderDB(HeaderDatabaseAPI):
                              headers: Iterable[BlockHeaderAPI],
                              genesis_parent_hash: Hash32 = GENESIS_PARENT_HASH
                              ) -> Tuple[Tuple[BlockHeaderAPI, ...], Tuple[BlockHeaderAPI, ...]]:
-        with self.db.atomic_batch() as db:
+        with self._canonical_write_batch() as db:
             return self._persist_header_chain(db, headers, genesis_parent_hash)
 
+    def persist_header_chain_in_batches(self,
+                                        headers: Iterable[BlockHeaderAPI],
+                                        genesis_parent_hash: Hash32 = GENESIS_PARENT_HASH,
+                                        batch_size: int = HEADER_BATCH_SIZE) -> None:
+        """
+        Persist a long chain of headers, like :meth:`persist_header_chain`, but commit every
+        ``batch_size`` headers in their own atomic batch. The headers are only read from
+        ``headers`` as they are needed, so they do not have to be in memory all at once.
+
+        If persisting a batch fails, the batches before it stay committed.
+        """
+        if batch_size < 1:
+            raise ValidationError(f"Cannot persist headers in batches of {batch_size}")
+
+        previous_header = None
+        for batch in partition_all(batch_size, headers):
+            if previous_header is not None:
+                self._validate_header_link(previous_header, batch[0])
+            self.persist_header_chain(batch, genesis_parent_hash)
+            previous_header = batch[-1]
+
     def persist_checkpoint_header(self, header: BlockHeaderAPI, score: int) -> None:
-        with self.db.atomic_batch() as db:
+        with self._canonical_write_batch() as db:
             return self._persist_checkpoint_header(db, header, score)
 
     @classmethod
@@ -353,12 +517,10 @@ class HeaderDB(HeaderDatabaseAPI):
             headers: Iterable[BlockHeaderAPI],
             genesis_parent_hash: Hash32,
     ) -> Tuple[Tuple[BlockHeaderAPI, ...], Tuple[BlockHeaderAPI, ...]]:
-        headers_iterator = iter(headers)
-
-        try:
-            first_header = first(headers_iterator)
-        except StopIteration:
+        headers = tuple(headers)
+        if not headers:
             return tuple(), tuple()
+        first_header = headers[0]
 
         is_genesis = first_header.parent_hash == genesis_parent_hash
         if not is_genesis and not cls._header_exists(db, first_header.parent_hash):
@@ -372,6 +534,12 @@ class HeaderDB(HeaderDatabaseAPI):
         else:
             score = cls._get_score(db, first_header.parent_hash)
 
+        # A single header on top of the head is already cheap, see _set_as_canonical_chain_head
+        if len(headers) > 1:
+            extension = cls._persist_canonical_head_extension(db, headers, score)
+            if extension is not None:
+                return extension
+
         curr_chain_head = first_header
         db.set(
             curr_chain_head.hash,
@@ -383,14 +551,8 @@ class HeaderDB(HeaderDatabaseAPI):
         gap_info = cls._update_header_chain_gaps(db, curr_chain_head, base_gaps)
         gaps = cls._handle_gap_change(db, gap_info, curr_chain_head, genesis_parent_hash)
 
-        orig_headers_seq = concat([(first_header,), headers_iterator])
-        for parent, child in sliding_window(2, orig_headers_seq):
-            if parent.hash != child.parent_hash:
-                raise ValidationError(
-                    f"Non-contiguous chain. Expected {encode_hex(child.hash)} "
-                    f"to have {encode_hex(parent.hash)} as parent "
-                    f"but was {encode_hex(child.parent_hash)}"
-                )
+        for parent, child in sliding_window(2, headers):
+            cls._validate_header_link(parent, child)
 
             curr_chain_head = child
             db.set(
@@ -412,6 +574,85 @@ class HeaderDB(HeaderDatabaseAPI):
 
         return tuple(), tuple()
 
+    @staticmethod
+    def _validate_header_link(parent: BlockHeaderAPI, child: BlockHeaderAPI) -> None:
+        if parent.hash != child.parent_hash:
+            raise ValidationError(
+                f"Non-contiguous chain. Expected {encode_hex(child.hash)} "
+                f"to have {encode_hex(parent.hash)} as parent "
+                f"but was {encode_hex(child.parent_hash)}"
+            )
+
+    @classmethod
+    def _persist_canonical_head_extension(
+            cls,
+            db: DatabaseAPI,
+            headers: Sequence[BlockHeaderAPI],
+            parent_score: int,
+    ) -> Optional[Tuple[Tuple[BlockHeaderAPI, ...], Tuple[BlockHeaderAPI, ...]]]:
+        """
+        Persist headers that extend the canonical head at the tip of the chain gaps, and
+        make them canonical. This has the same outcome as going through the headers one at
+        a time, but the chain gaps and the canonical head are only written once, and the new
+        canonical headers are not read back from the database.
+
+        Return ``None``, without writing anything, if the headers do not extend the canonical
+        head that way, or do not add to its score.
+        """
+        first_header = headers[0]
+        try:
+            canonical_head_hash = cls._get_canonical_head_hash(db)
+        except CanonicalHeadNotFound:
+            return None
+
+        if first_header.parent_hash != canonical_head_hash:
+            return None
+
+        gap_ranges, tip_child = cls._get_header_chain_gaps(db)
+        if first_header.block_number != tip_child:
+            return None
+
+        for parent, child in sliding_window(2, headers):
+            cls._validate_header_link(parent, child)
+            if child.block_number != parent.block_number + 1:
+                return None
+
+        if sum(header.difficulty for header in headers) == 0:
+            return None
+
+        score = parent_score
+        for header in headers:
+            db.set(header.hash, rlp.encode(header))
+            score = cls._set_hash_scores_to_db(db, header, score)
+
+        old_canonical_headers = cls._find_headers_to_decanonicalize(
+            db,
+            [header.block_number for header in headers],
+        )
+        checkpoints = cls._get_checkpoints(db)
+        attempted_checkpoint_overrides = set(
+            old for old in old_canonical_headers
+            if old.hash in checkpoints
+        )
+        if len(attempted_checkpoint_overrides):
+            raise CheckpointsMustBeCanonical(
+                f"Tried to switch chain away from checkpoint(s) {attempted_checkpoint_overrides!r}"
+                f" by inserting new canonical headers {headers}"
+            )
+
+        for header in headers:
+            cls._add_block_number_to_hash_lookup(db, header)
+
+        last_header = headers[-1]
+        db.set(
+            SchemaV1.make_header_chain_gaps_lookup_key(),
+            rlp.encode((gap_ranges, last_header.block_number + 1), sedes=chain_gaps),
+        )
+        cls._decanonicalize_descendant_orphans(db, last_header, checkpoints)
+        db.set(SchemaV1.make_canonical_head_hash_lookup_key(), last_header.hash)
+
+        return tuple(headers), old_canonical_headers
+
     @classmethod
     def _handle_gap_change(cls,
                            db: DatabaseAPI,
@@ -0,0 +1,326 @@
+import bisect
+from contextlib import contextmanager
+import logging
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+)
+
+from eth.abc import (
+    AtomicWriteBatchAPI,
+    AtomicDatabaseAPI,
+    DatabaseAPI,
+)
+from eth.db.backends.base import (
+    BaseAtomicDB,
+    BaseDB,
+)
+from eth.db.schema import (
+    BLOCK_HASH_TO_SCORE_PREFIX,
+    BLOCK_NUMBER_TO_HASH_PREFIX,
+    BLOOM_BITS_PREFIX,
+    BLOOM_BITS_SECTION_HEAD_PREFIX,
+    CHAIN_METADATA_PREFIX,
+    CODE_HASH_TO_SIZE_PREFIX,
+    RECEIPT_ROOT_TO_RECEIPTS_PREFIX,
+    TRANSACTION_HASH_TO_BLOCK_PREFIX,
+    TRANSACTION_ROOT_TO_TRANSACTIONS_PREFIX,
+)
+
+
+CANONICAL_NUMBER_CATEGORY = 'canonical-number'
+SCORE_CATEGORY = 'score'
+TRANSACTION_LOOKUP_CATEGORY = 'transaction-lookup'
+BLOCK_TRANSACTIONS_CATEGORY = 'block-transactions'
+BLOCK_RECEIPTS_CATEGORY = 'block-receipts'
+BLOOM_BITS_CATEGORY = 'bloom-bits'
+CODE_SIZE_CATEGORY = 'code-size'
+CHAIN_METADATA_CATEGORY = 'chain-metadata'
+# Trie nodes, bytecode, headers and uncle lists are all stored under their 32-byte hash
+HASH_KEYED_CATEGORY = 'hash-keyed'
+OTHER_CATEGORY = 'other'
+
+# Prefixes of the keys in :class:`~eth.db.schema.SchemaV1`
+SCHEMA_KEY_PREFIXES = (
+    (BLOCK_NUMBER_TO_HASH_PREFIX, CANONICAL_NUMBER_CATEGORY),
+    (BLOCK_HASH_TO_SCORE_PREFIX, SCORE_CATEGORY),
+    (TRANSACTION_HASH_TO_BLOCK_PREFIX, TRANSACTION_LOOKUP_CATEGORY),
+    (TRANSACTION_ROOT_TO_TRANSACTIONS_PREFIX, BLOCK_TRANSACTIONS_CATEGORY),
+    (RECEIPT_ROOT_TO_RECEIPTS_PREFIX, BLOCK_RECEIPTS_CATEGORY),
+    (BLOOM_BITS_PREFIX, BLOOM_BITS_CATEGORY),
+    (BLOOM_BITS_SECTION_HEAD_PREFIX, BLOOM_BITS_CATEGORY),
+    (CODE_HASH_TO_SIZE_PREFIX, CODE_SIZE_CATEGORY),
+    (CHAIN_METADATA_PREFIX, CHAIN_METADATA_CATEGORY),
+)
+
+# Upper bounds of the latency histogram buckets, in microseconds. The last bucket
+# collects everything slower than the last bound.
+LATENCY_BUCKETS_MICROS = tuple(2 ** exponent for exponent in range(21))
+
+
+def classify_key(key: bytes) -> str:
+    """
+    Classify a database key by the :class:`~eth.db.schema.SchemaV1` lookup it belongs to.
+    """
+    for prefix, category in SCHEMA_KEY_PREFIXES:
+        if key.startswith(prefix):
+            return category
+
+    if len(key) == 32:
+        return HASH_KEYED_CATEGORY
+    else:
+        return OTHER_CATEGORY
+
+
+class LatencyHistogram:
+    """
+    Count durations in buckets that double in width, starting at 1 microsecond.
+    """
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MICROS) + 1)
+
+    def record(self, seconds: float) -> None:
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MICROS, seconds * 1e6)
+        self.counts[bucket] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Return the upper bound in microseconds of the bucket containing the given percentile,
+        or infinity if it lies in the last, unbounded, bucket.
+        """
+        total = sum(self.counts)
+        if total == 0:
+            return 0.0
+
+        threshold = total * fraction
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                break
+
+        if bucket < len(LATENCY_BUCKETS_MICROS):
+            return float(LATENCY_BUCKETS_MICROS[bucket])
+        else:
+            return float('inf')
+
+
+class CategoryMetrics:
+    """
+    I/O counters of all the keys in a single category.
+    """
+    def __init__(self) -> None:
+        self.reads = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.deletes = 0
+        # Checks that a key exists read no value, so they are not counted as reads
+        self.existence_checks = 0
+        self.existence_hits = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.read_latency = LatencyHistogram()
+        self.write_latency = LatencyHistogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'reads': self.reads,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'deletes': self.deletes,
+            'existence_checks': self.existence_checks,
+            'existence_hits': self.existence_hits,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'read_latency_histogram': list(self.read_latency.counts),
+            'write_latency_histogram': list(self.write_latency.counts),
+        }
+
+
+class DBMetrics:
+    """
+    Collects the database I/O recorded by :class:`MetricsDB` wrappers, grouped by key category.
+
+    A single instance may be shared by several wrappers, for example at different layers
+    of the database stack, to get a combined report. Call :meth:`reset` between blocks to
+    get per-block numbers.
+    """
+    def __init__(self, classify: Callable[[bytes], str] = classify_key) -> None:
+        self._classify = classify
+        self.reset()
+
+    def reset(self) -> None:
+        self.categories: Dict[str, CategoryMetrics] = {}
+
+    def _get_category(self, key: bytes) -> CategoryMetrics:
+        category = self._classify(key)
+        try:
+            return self.categories[category]
+        except KeyError:
+            metrics = CategoryMetrics()
+            self.categories[category] = metrics
+            return metrics
+
+    def record_hit(self, key: bytes, num_bytes: int, seconds: float) -> None:
+        metrics = self._get_category(key)
+        metrics.reads += 1
+        metrics.hits += 1
+        metrics.bytes_read += num_bytes
+        metrics.read_latency.record(seconds)
+
+    def record_miss(self, key: bytes, seconds: float) -> None:
+        metrics = self._get_category(key)
+        metrics.reads += 1
+        metrics.misses += 1
+        metrics.read_latency.record(seconds)
+
+    def record_existence_check(self, key: bytes, does_exist: bool) -> None:
+        metrics = self._get_category(key)
+        metrics.existence_checks += 1
+        if does_exist:
+            metrics.existence_hits += 1
+
+    def record_write(self, key: bytes, num_bytes: int, seconds: float) -> None:
+        metrics = self._get_category(key)
+        metrics.writes += 1
+        metrics.bytes_written += num_bytes
+        metrics.write_latency.record(seconds)
+
+    def record_delete(self, key: bytes, seconds: float) -> None:
+        metrics = self._get_category(key)
+        metrics.deletes += 1
+        metrics.write_latency.record(seconds)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return a machine-readable report of the counters in each category.
+        """
+        return {
+            category: metrics.as_dict()
+            for category, metrics in sorted(self.categories.items())
+        }
+
+    def format_report(self) -> str:
+        """
+        Return a human-readable table of the counters in each category.
+        """
+        columns = (
+            'category', 'reads', 'hits', 'misses', 'writes', 'deletes',
+            'bytes read', 'bytes written', 'exists', 'read p50/p99 (us)',
+        )
+        rows: List[List[str]] = [list(columns)]
+        for category, metrics in sorted(self.categories.items()):
+            rows.append([
+                category,
+                str(metrics.reads),
+                str(metrics.hits),
+                str(metrics.misses),
+                str(metrics.writes),
+                str(metrics.deletes),
+                str(metrics.bytes_read),
+                str(metrics.bytes_written),
+                f"{metrics.existence_hits}/{metrics.existence_checks}",
+                f"{metrics.read_latency.percentile(0.5):g}/"
+                f"{metrics.read_latency.percentile(0.99):g}",
+            ])
+
+        widths = [max(len(row[column]) for row in rows) for column in range(len(columns))]
+        return '\n'.join(
+            '  '.join(
+                cell.ljust(width) if column == 0 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        )
+
+
+class MetricsDB(BaseDB):
+    """
+    Wraps around a database, and counts the reads, writes, deletes and bytes of every
+    access, along with their latency, grouped by the type of key.
+    """
+
+    logger = logging.getLogger("eth.db.MetricsDB")
+
+    def __init__(self, wrapped_db: DatabaseAPI, metrics: DBMetrics = None) -> None:
+        """
+        :param metrics: where to record the accesses, a new :class:`DBMetrics` by default
+        """
+        self.wrapped_db = wrapped_db
+        if metrics is None:
+            self.metrics = DBMetrics()
+        else:
+            self.metrics = metrics
+
+    def __getitem__(self, key: bytes) -> bytes:
+        start = time.perf_counter()
+        try:
+            result = self.wrapped_db.__getitem__(key)
+        except KeyError:
+            self.metrics.record_miss(key, time.perf_counter() - start)
+            raise
+        else:
+            self.metrics.record_hit(key, len(result), time.perf_counter() - start)
+            return result
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        start = time.perf_counter()
+        self.wrapped_db[key] = value
+        self.metrics.record_write(key, len(value), time.perf_counter() - start)
+
+    def __delitem__(self, key: bytes) -> None:
+        start = time.perf_counter()
+        del self.wrapped_db[key]
+        self.metrics.record_delete(key, time.perf_counter() - start)
+
+    def _exists(self, key: bytes) -> bool:
+        does_exist = key in self.wrapped_db
+        self.metrics.record_existence_check(key, does_exist)
+        return does_exist
+
+
+class MetricsWriteBatch(MetricsDB, AtomicWriteBatchAPI):
+    """
+    Records the accesses to an atomic write batch. Writes are counted when they are
+    made to the batch, whether or not the batch is eventually committed.
+    """
+    pass
+
+
+class MetricsAtomicDB(BaseAtomicDB):
+    """
+    Wraps around an atomic database, and counts the reads, writes, deletes and bytes of
+    every access, along with their latency, grouped by the type of key.
+    """
+    logger = logging.getLogger("eth.db.MetricsAtomicDB")
+
+    def __init__(self, wrapped_db: AtomicDatabaseAPI, metrics: DBMetrics = None) -> None:
+        """
+        :param metrics: where to record the accesses, a new :class:`DBMetrics` by default
+        """
+        self.wrapped_db = wrapped_db
+        self._metrics_db = MetricsDB(wrapped_db, metrics)
+        self.metrics = self._metrics_db.metrics
+
+    def __getitem__(self, key: bytes) -> bytes:
+        return self._metrics_db[key]
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self._metrics_db[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        del self._metrics_db[key]
+
+    def _exists(self, key: bytes) -> bool:
+        return key in self._metrics_db
+
+    @contextmanager
+    def atomic_batch(self) -> Iterator[AtomicWriteBatchAPI]:
+        with self.wrapped_db.atomic_batch() as readable_batch:
+            yield MetricsWriteBatch(readable_batch, self.metrics)
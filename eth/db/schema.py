@@ -6,35 +6,66 @@ from eth_typing import (
 from eth.abc import SchemaAPI
 
 
+# The prefixes of the keys of each kind of lookup, other than the hash-keyed ones
+CHAIN_METADATA_PREFIX = b'v1:'
+BLOCK_NUMBER_TO_HASH_PREFIX = b'block-number-to-hash:'
+BLOCK_HASH_TO_SCORE_PREFIX = b'block-hash-to-score:'
+TRANSACTION_HASH_TO_BLOCK_PREFIX = b'transaction-hash-to-block:'
+TRANSACTION_ROOT_TO_TRANSACTIONS_PREFIX = b'transaction-root-to-transactions:'
+RECEIPT_ROOT_TO_RECEIPTS_PREFIX = b'receipt-root-to-receipts:'
+BLOOM_BITS_PREFIX = b'bloom-bits:'
+BLOOM_BITS_SECTION_HEAD_PREFIX = b'bloom-bits-section-head:'
+CODE_HASH_TO_SIZE_PREFIX = b'code-hash-to-size:'
+
+
 class SchemaV1(SchemaAPI):
     @staticmethod
     def make_canonical_head_hash_lookup_key() -> bytes:
-        return b'v1:canonical_head_hash'
+        return CHAIN_METADATA_PREFIX + b'canonical_head_hash'
 
     @staticmethod
     def make_block_number_to_hash_lookup_key(block_number: BlockNumber) -> bytes:
-        number_to_hash_key = b'block-number-to-hash:%d' % block_number
-        return number_to_hash_key
+        return BLOCK_NUMBER_TO_HASH_PREFIX + b'%d' % block_number
 
     @staticmethod
     def make_block_hash_to_score_lookup_key(block_hash: Hash32) -> bytes:
-        return b'block-hash-to-score:%s' % block_hash
+        return BLOCK_HASH_TO_SCORE_PREFIX + block_hash
 
     @staticmethod
     def make_header_chain_gaps_lookup_key() -> bytes:
-        return b'v1:header_chain_gaps'
+        return CHAIN_METADATA_PREFIX + b'header_chain_gaps'
 
     @staticmethod
     def make_chain_gaps_lookup_key() -> bytes:
-        return b'v1:chain_gaps'
+        return CHAIN_METADATA_PREFIX + b'chain_gaps'
 
     @staticmethod
     def make_checkpoint_headers_key() -> bytes:
         """
         Checkpoint header hashes stored as concatenated 32 byte values
         """
-        return b'v1:checkpoint-header-hashes-list'
+        return CHAIN_METADATA_PREFIX + b'checkpoint-header-hashes-list'
 
     @staticmethod
     def make_transaction_hash_to_block_lookup_key(transaction_hash: Hash32) -> bytes:
-        return b'transaction-hash-to-block:%s' % transaction_hash
+        return TRANSACTION_HASH_TO_BLOCK_PREFIX + transaction_hash
+
+    @staticmethod
+    def make_transaction_root_to_transactions_lookup_key(transaction_root: Hash32) -> bytes:
+        return TRANSACTION_ROOT_TO_TRANSACTIONS_PREFIX + transaction_root
+
+    @staticmethod
+    def make_receipt_root_to_receipts_lookup_key(receipt_root: Hash32) -> bytes:
+        return RECEIPT_ROOT_TO_RECEIPTS_PREFIX + receipt_root
+
+    @staticmethod
+    def make_bloom_bits_lookup_key(bit: int, section: int) -> bytes:
+        return BLOOM_BITS_PREFIX + b'%d:%d' % (bit, section)
+
+    @staticmethod
+    def make_bloom_bits_section_head_lookup_key(section: int) -> bytes:
+        return BLOOM_BITS_SECTION_HEAD_PREFIX + b'%d' % section
+
+    @staticmethod
+    def make_code_hash_to_size_lookup_key(code_hash: Hash32) -> bytes:
+        return CODE_HASH_TO_SIZE_PREFIX + code_hash
@@ -1,4 +1,5 @@
 from typing import (
+    Dict,
     FrozenSet,
     List,
     NamedTuple,
@@ -283,6 +284,11 @@ class AccountStorageDB(AccountStorageDatabaseAPI):
 
         In both _storage_cache and _journal_storage, Keys are set/retrieved as the
         big_endian encoding of the slot integer, and the rlp-encoded value.
+
+        _original_values caches the decoded values read from _locked_changes, ie~ the
+        values at the start of the transaction, which net gas metering looks up on every
+        SSTORE. They can only change when changes are locked, or when the storage trie is
+        swapped out by a delete or a revert past one, so the cache is cleared then.
         """
         self._address = address
         self._storage_lookup = StorageLookup(db, storage_root, address)
@@ -290,6 +296,7 @@ class AccountStorageDB(AccountStorageDatabaseAPI):
         self._locked_changes = JournalDB(self._storage_cache)
         self._journal_storage = JournalDB(self._locked_changes)
         self._accessed_slots: Set[int] = set()
+        self._original_values: Dict[int, int] = {}
 
         # Track how many times we have cleared the storage. This is journaled
         # in lockstep with other storage changes. That way, we can detect if a revert
@@ -299,8 +306,17 @@ class AccountStorageDB(AccountStorageDatabaseAPI):
 
     def get(self, slot: int, from_journal: bool=True) -> int:
         self._accessed_slots.add(slot)
+        if from_journal:
+            return self._get_from(self._journal_storage, slot)
+        elif slot in self._original_values:
+            return self._original_values[slot]
+        else:
+            original_value = self._get_from(self._locked_changes, slot)
+            self._original_values[slot] = original_value
+            return original_value
+
+    def _get_from(self, lookup_db: DatabaseAPI, slot: int) -> int:
         key = int_to_big_endian(slot)
-        lookup_db = self._journal_storage if from_journal else self._locked_changes
         try:
             encoded_value = lookup_db[key]
         except MissingStorageTrieNode:
@@ -335,6 +351,7 @@ class AccountStorageDB(AccountStorageDatabaseAPI):
         )
         self._journal_storage.clear()
         self._storage_cache.reset_cache()
+        self._original_values.clear()
 
         # Empty out the storage lookup trie (keeping history, in case of a revert)
         new_clear_count = self._storage_lookup.new_trie()
@@ -378,6 +395,7 @@ class AccountStorageDB(AccountStorageDatabaseAPI):
             #   that point. We use the clear count as an index to get back to the
             #   old base trie.
             self._storage_lookup.rollback_trie(reverted_clear_count)
+            self._original_values.clear()
         elif reverted_clear_count == latest_clear_count:
             # No change in the base trie, take no action
             pass
@@ -404,6 +422,7 @@ class AccountStorageDB(AccountStorageDatabaseAPI):
         if self._journal_storage.has_clear():
             self._locked_changes.clear()
         self._journal_storage.persist()
+        self._original_values.clear()
 
     def make_storage_root(self) -> None:
         self.lock_changes()
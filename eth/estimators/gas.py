@@ -1,12 +1,32 @@
-from typing import cast, Optional
+import contextlib
+import functools
+from typing import (
+    cast,
+    Iterable,
+    Iterator,
+    Optional,
+    Type,
+)
 
 from eth_utils.toolz import curry
 
 from eth.exceptions import VMError
 
 from eth.abc import (
+    ComputationAPI,
+    MessageAPI,
     SignedTransactionAPI,
     StateAPI,
+    TransactionContextAPI,
+)
+from eth.constants import GAS_CALLSTIPEND
+from eth.vm import mnemonics
+from eth.vm import opcode_values
+from eth.vm.computation import BaseComputation
+from eth.vm.forks.istanbul.computation import IstanbulComputation
+from eth.vm.logic.call import (
+    CallEIP150,
+    max_child_gas_eip150,
 )
 from eth.vm.spoof import SpoofTransaction
 
@@ -43,11 +63,7 @@ def binary_gas_search(state: StateAPI, transaction: SignedTransactionAPI, tolera
         subject to tolerance. If OutOfGas is thrown at block limit, return block limit.
     :raises VMError: if the computation fails even when given the block gas_limit to complete
     """
-    if not hasattr(transaction, 'sender'):
-        raise TypeError(
-            "Transaction is missing attribute sender.",
-            "If sending an unsigned transaction, use SpoofTransaction and provide the",
-            "sender using the 'from' parameter")
+    _validate_has_sender(transaction)
 
     minimum_transaction = cast(SignedTransactionAPI, SpoofTransaction(
         transaction,
@@ -67,8 +83,28 @@ def binary_gas_search(state: StateAPI, transaction: SignedTransactionAPI, tolera
     if error is not None:
         raise error
 
-    minimum_viable = state.gas_limit
-    maximum_out_of_gas = transaction.intrinsic_gas
+    return _search_gas_between(
+        state,
+        transaction,
+        transaction.intrinsic_gas,
+        state.gas_limit,
+        tolerance,
+    )
+
+
+def _validate_has_sender(transaction: SignedTransactionAPI) -> None:
+    if not hasattr(transaction, 'sender'):
+        raise TypeError(
+            "Transaction is missing attribute sender.",
+            "If sending an unsigned transaction, use SpoofTransaction and provide the",
+            "sender using the 'from' parameter")
+
+
+def _search_gas_between(state: StateAPI,
+                        transaction: SignedTransactionAPI,
+                        maximum_out_of_gas: int,
+                        minimum_viable: int,
+                        tolerance: int) -> int:
     while minimum_viable - maximum_out_of_gas > tolerance:
         midpoint = (minimum_viable + maximum_out_of_gas) // 2
         test_transaction = cast(SignedTransactionAPI, SpoofTransaction(transaction, gas=midpoint))
@@ -80,6 +116,172 @@ def binary_gas_search(state: StateAPI, transaction: SignedTransactionAPI, tolera
     return minimum_viable
 
 
+def gas_needed_estimation(state: StateAPI, transaction: SignedTransactionAPI) -> int:
+    """
+    Run the transaction once with the block gas limit, tracking the least gas that each
+    call frame needs to run the same way, then confirm the estimate with a second run.
+
+    A frame needs the gas it used, and more wherever the EVM requires gas to be left:
+    after EIP-150, a call or create only forwards 63/64 of the gas left, minus the call
+    stipend that comes with a value transfer. After EIP-2200, an SSTORE fails unless more
+    than the stipend is left.
+
+    Unlike :func:`binary_gas_search`, the estimate also covers the calls that may fail
+    without failing the transaction: it is the least gas to run the transaction the same way
+    as with the block gas limit. The estimate is confirmed if it uses as much gas as the
+    first run. When a frame burnt its gas, or when the estimate fails to confirm, e.g.
+    because a contract reads the GAS opcode, fall back to a binary search.
+
+    :returns int: The smallest gas to not throw an OutOfGas exception. If OutOfGas is
+        thrown at block limit, return block limit.
+    :raises VMError: if the computation fails even when given the block gas_limit to complete
+    """
+    _validate_has_sender(transaction)
+
+    maximum_transaction = cast(SignedTransactionAPI, SpoofTransaction(
+        transaction,
+        gas=state.gas_limit,
+        gas_price=0,
+    ))
+    snapshot = state.snapshot()
+    try:
+        with _tracking_gas_needed(state):
+            computation = state.apply_transaction(maximum_transaction)
+    finally:
+        state.revert(snapshot)
+
+    if computation.is_error:
+        raise computation.error
+
+    if any(child.is_error and child.should_burn_gas for child in _iter_descendants(computation)):
+        # Burnt gas depends on the gas that was given, which is lower in the estimate
+        minimum_viable = state.gas_limit
+    else:
+        gas_needed = cast(_GasNeededComputation, computation).gas_needed
+        estimate = min(transaction.intrinsic_gas + gas_needed, state.gas_limit)
+        estimate_transaction = cast(SignedTransactionAPI, SpoofTransaction(
+            transaction,
+            gas=estimate,
+            gas_price=0,
+        ))
+        if _runs_with_gas_used(state, estimate_transaction, computation.get_gas_used()):
+            return estimate
+        else:
+            minimum_viable = state.gas_limit
+
+    return _search_gas_between(
+        state,
+        transaction,
+        transaction.intrinsic_gas,
+        minimum_viable,
+        tolerance=1,
+    )
+
+
+def _runs_with_gas_used(state: StateAPI,
+                        transaction: SignedTransactionAPI,
+                        gas_used: int) -> bool:
+    snapshot = state.snapshot()
+    try:
+        computation = state.apply_transaction(transaction)
+        return computation.is_success and computation.get_gas_used() == gas_used
+    finally:
+        state.revert(snapshot)
+
+
+def _iter_descendants(computation: ComputationAPI) -> Iterable[ComputationAPI]:
+    for child in cast(BaseComputation, computation).children:
+        yield child
+        yield from _iter_descendants(child)
+
+
+class _GasNeededComputation(BaseComputation):
+    """
+    A computation that tracks the least gas it could have been given to run the same way.
+    """
+    is_eip150: bool = False
+    has_sstore_sentry: bool = False
+
+    def __init__(self,
+                 state: StateAPI,
+                 message: MessageAPI,
+                 transaction_context: TransactionContextAPI) -> None:
+        super().__init__(state, message, transaction_context)
+        self._gas_needed = 0
+
+    @property
+    def gas_needed(self) -> int:
+        return max(self._gas_needed, self.get_gas_used())
+
+    def consume_gas(self, amount: int, reason: str) -> None:
+        if self.has_sstore_sentry and reason.startswith(mnemonics.SSTORE):
+            self._require_gas_left(GAS_CALLSTIPEND + 1)
+        super().consume_gas(amount, reason)
+
+    def add_child_computation(self, child_computation: ComputationAPI) -> None:
+        child_msg = child_computation.msg
+        child_gas_needed = cast(_GasNeededComputation, child_computation).gas_needed
+
+        if child_msg.is_create or not (child_msg.should_transfer_value and child_msg.value):
+            stipend = 0
+        else:
+            stipend = GAS_CALLSTIPEND
+
+        # The child gas is still withheld from this computation while the child is added
+        child_gas = child_msg.gas - stipend
+        gas_left_before_child = self._gas_meter.gas_remaining + child_gas
+
+        if self.is_eip150:
+            gas_left_needed = _min_gas_forwarding(max(0, child_gas_needed - stipend))
+        elif child_msg.is_create:
+            # All the gas left is forwarded
+            gas_left_needed = child_gas_needed
+        else:
+            # The requested gas is paid up front
+            gas_left_needed = child_gas
+
+        self._require_gas_left(gas_left_needed, gas_left=gas_left_before_child)
+        super().add_child_computation(child_computation)
+
+    def _require_gas_left(self, gas_needed: int, gas_left: int = None) -> None:
+        if gas_left is None:
+            gas_left = self._gas_meter.gas_remaining
+        self._gas_needed = max(self._gas_needed, self.msg.gas - gas_left + gas_needed)
+
+
+def _min_gas_forwarding(child_gas: int) -> int:
+    """
+    Return the least gas left that forwards ``child_gas`` to a child, per EIP-150.
+    """
+    gas_left = child_gas + max(0, child_gas - 1) // 63
+    while max_child_gas_eip150(gas_left) < child_gas:
+        gas_left += 1
+    return gas_left
+
+
+@functools.lru_cache(maxsize=None)
+def _get_gas_needed_computation_class(
+        computation_class: Type[ComputationAPI]) -> Type[_GasNeededComputation]:
+    return type(
+        f'GasNeeded{computation_class.__name__}',
+        (_GasNeededComputation, computation_class),
+        dict(
+            is_eip150=isinstance(computation_class.opcodes[opcode_values.CALL], CallEIP150),
+            has_sstore_sentry=issubclass(computation_class, IstanbulComputation),
+        ),
+    )
+
+
+@contextlib.contextmanager
+def _tracking_gas_needed(state: StateAPI) -> Iterator[None]:
+    computation_class = state.computation_class
+    state.computation_class = _get_gas_needed_computation_class(computation_class)
+    try:
+        yield
+    finally:
+        state.computation_class = computation_class
+
+
 # Estimate in increments of intrinsic gas usage
 binary_gas_search_intrinsic_tolerance = binary_gas_search(tolerance=21000)
 
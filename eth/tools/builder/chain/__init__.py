@@ -7,6 +7,7 @@ from .builders import (  # noqa: F401
     dao_fork_at,
     disable_dao_fork,
     disable_pow_check,
+    disable_witness_tracking,
     enable_pow_mining,
     fork_at,
     genesis,
@@ -78,6 +79,9 @@ class API:
     enable_pow_mining = staticmethod(enable_pow_mining)
     disable_pow_check = staticmethod(disable_pow_check)
 
+    # Chain import config
+    disable_witness_tracking = staticmethod(disable_witness_tracking)
+
     #
     # Chain Instance Initialization
     #
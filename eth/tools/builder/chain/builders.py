@@ -39,6 +39,7 @@ from eth.abc import (
 )
 from eth.consensus.applier import ConsensusApplier
 from eth.consensus.noproof import NoProofConsensus
+from eth.db.account import UntrackedAccountDB
 from eth.db.atomic import AtomicDB
 from eth.db.backends.memory import (
     MemoryDB,
@@ -271,22 +272,29 @@ def _get_default_genesis_params(genesis_state: AccountState,
 
 
 @to_tuple
-def _mix_in_pow_mining(vm_configuration: VMConfiguration) -> Iterable[VMFork]:
+def _mix_in_pow_mining(vm_configuration: VMConfiguration,
+                       mining_workers: int) -> Iterable[VMFork]:
     for fork_block, vm_class in vm_configuration:
-        vm_class_with_pow_mining = type(vm_class.__name__, (POWMiningMixin, vm_class), {})
+        vm_class_with_pow_mining = type(
+            vm_class.__name__,
+            (POWMiningMixin, vm_class),
+            {'mining_workers': mining_workers},
+        )
         yield fork_block, vm_class_with_pow_mining
 
 
 @curry
-def enable_pow_mining(chain_class: Type[ChainAPI]) -> Type[ChainAPI]:
+def enable_pow_mining(chain_class: Type[ChainAPI], mining_workers: int = 1) -> Type[ChainAPI]:
     """
     Inject on demand generation of the proof of work mining seal on newly
     mined blocks into each of the chain's vms.
+
+    :param mining_workers: search for the nonce in this many worker processes at a time
     """
     if not chain_class.vm_configuration:
         raise ValidationError("Chain class has no vm_configuration")
 
-    vm_configuration = _mix_in_pow_mining(chain_class.vm_configuration)
+    vm_configuration = _mix_in_pow_mining(chain_class.vm_configuration, mining_workers)
     return chain_class.configure(vm_configuration=vm_configuration)
 
 
@@ -307,6 +315,34 @@ def disable_pow_check(chain_class: Type[ChainAPI]) -> Type[ChainAPI]:
     return chain_class.configure(vm_configuration=no_pow_vms)
 
 
+@to_tuple
+def _disable_witness_tracking(vm_configuration: VMConfiguration) -> Iterable[VMFork]:
+    for fork_block, vm_class in vm_configuration:
+        state_class = vm_class.get_state_class().configure(
+            account_db_class=UntrackedAccountDB,
+        )
+        yield fork_block, vm_class.configure(_state_class=state_class)
+
+
+@curry
+def disable_witness_tracking(chain_class: Type[ChainAPI]) -> Type[ChainAPI]:
+    """
+    Stop recording the witness of each block for each of the chain's vms. This
+    skips the bookkeeping of which keys and accounts were read, when the witness
+    is not needed, like during a full sync. Blocks are then also imported with
+    the accounts and code cached by the previous blocks of the same database.
+
+    .. note::
+
+        the meta witness of blocks imported this way is empty.
+    """
+    if not chain_class.vm_configuration:
+        raise ValidationError("Chain class has no vm_configuration")
+
+    vm_configuration = _disable_witness_tracking(chain_class.vm_configuration)
+    return chain_class.configure(vm_configuration=vm_configuration)
+
+
 #
 # Initializers (initialization of chain state and chain class instantiation)
 #
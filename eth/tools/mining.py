@@ -13,12 +13,21 @@ class POWMiningMixin(VirtualMachineAPI):
     A VM that does POW mining as well. Should be used only in tests, when we
     need to programatically populate a ChainDB.
     """
+    # Search for the nonce in this many worker processes of the consensus context at a
+    # time, or in the current process with 1
+    mining_workers = 1
+
     def finalize_block(self, block: BlockAPI) -> BlockAndMetaWitness:
         block_result = super().finalize_block(block)
         block = block_result.block
 
         nonce, mix_hash = pow.mine_pow_nonce(
-            block.number, block.header.mining_hash, block.header.difficulty)
+            block.number,
+            block.header.mining_hash,
+            block.header.difficulty,
+            num_workers=self.mining_workers,
+            executor=self.consensus_context.worker_pool,
+        )
 
         mined_block = block.copy(header=block.header.copy(nonce=nonce, mix_hash=mix_hash))
 
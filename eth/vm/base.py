@@ -102,11 +102,13 @@ class VM(Configurable, VirtualMachineAPI):
                  header: BlockHeaderAPI,
                  chaindb: ChainDatabaseAPI,
                  chain_context: ChainContextAPI,
-                 consensus_context: ConsensusContextAPI) -> None:
+                 consensus_context: ConsensusContextAPI,
+                 previous_hashes: Iterable[Hash32] = None) -> None:
         self.chaindb = chaindb
         self.chain_context = chain_context
         self.consensus_context = consensus_context
         self._initial_header = header
+        self._previous_hashes = previous_hashes
 
     def get_header(self) -> BlockHeaderAPI:
         if self._block is None:
@@ -330,11 +332,8 @@ class VM(Configurable, VirtualMachineAPI):
                                transactions: Sequence[SignedTransactionAPI],
                                receipts: Sequence[ReceiptAPI]) -> BlockAPI:
 
-        tx_root_hash, tx_kv_nodes = make_trie_root_and_nodes(transactions)
-        self.chaindb.persist_trie_data_dict(tx_kv_nodes)
-
-        receipt_root_hash, receipt_kv_nodes = make_trie_root_and_nodes(receipts)
-        self.chaindb.persist_trie_data_dict(receipt_kv_nodes)
+        tx_root_hash = self.chaindb.persist_transactions(transactions)
+        receipt_root_hash = self.chaindb.persist_receipts(receipts)
 
         return base_block.copy(
             transactions=transactions,
@@ -471,7 +470,10 @@ class VM(Configurable, VirtualMachineAPI):
 
     @property
     def previous_hashes(self) -> Optional[Iterable[Hash32]]:
-        return self.get_prev_hashes(self.get_header().parent_hash, self.chaindb)
+        if self._previous_hashes is None:
+            return self.get_prev_hashes(self.get_header().parent_hash, self.chaindb)
+        else:
+            return self._previous_hashes
 
     #
     # Transactions
@@ -613,6 +615,13 @@ class VM(Configurable, VirtualMachineAPI):
             )
             raise
 
+    def validate_seals(self, headers: Sequence[BlockHeaderAPI]) -> None:
+        try:
+            self._consensus.validate_seals(headers)
+        except ValidationError as exc:
+            self.cls_logger.debug("Failed to validate seals on headers. Error: %s", exc)
+            raise
+
     def validate_seal_extension(self,
                                 header: BlockHeaderAPI,
                                 parents: Iterable[BlockHeaderAPI]) -> None:
@@ -656,7 +665,7 @@ class VM(Configurable, VirtualMachineAPI):
         return cls._state_class
 
     @contextlib.contextmanager
-    def state_in_temp_block(self) -> Iterator[StateAPI]:
+    def state_in_temp_block(self, ephemeral: bool = False) -> Iterator[StateAPI]:
         header = self.get_header()
         temp_block = self.generate_block_from_parent_header_and_coinbase(header, header.coinbase)
         prev_hashes = itertools.chain((header.hash,), self.previous_hashes)
@@ -666,6 +675,10 @@ class VM(Configurable, VirtualMachineAPI):
                                  self.chain_context,
                                  prev_hashes)
 
-        snapshot = state.snapshot()
-        yield state
-        state.revert(snapshot)
+        if ephemeral:
+            # The changes never leave the fork, so there is nothing to revert
+            yield state.fork(ephemeral=True)
+        else:
+            snapshot = state.snapshot()
+            yield state
+            state.revert(snapshot)
@@ -6,6 +6,7 @@ from typing import (
 )
 
 from eth.abc import CodeStreamAPI
+from eth.db.code_cache import jumpdest_analysis_cache
 from eth.validation import (
     validate_is_bytes,
 )
@@ -29,8 +30,10 @@ class CodeStream(CodeStreamAPI):
         self.program_counter = 0
         self._raw_code_bytes = code_bytes
         self._length_cache = len(code_bytes)
-        self.invalid_positions: Set[int] = set()
-        self.valid_positions: Set[int] = set()
+        # Runs of the same code share their analysis
+        self.valid_positions: Set[int]
+        self.invalid_positions: Set[int]
+        self.valid_positions, self.invalid_positions = jumpdest_analysis_cache.get(code_bytes)
 
     def read(self, size: int) -> bytes:
         old_program_counter = self.program_counter
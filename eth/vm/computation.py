@@ -2,6 +2,7 @@ import itertools
 from types import TracebackType
 from typing import (
     Any,
+    cast,
     Callable,
     Dict,
     List,
@@ -127,6 +128,11 @@ class BaseComputation(Configurable, ComputationAPI):
     opcodes: Dict[int, OpcodeAPI] = None
     _precompiles: Dict[Address, Callable[[ComputationAPI], ComputationAPI]] = None
 
+    # Whether the finished children keep their memory, stack and code, e.g. for tracing.
+    # Otherwise they only keep what is read once they are finished, so that a wide or deep
+    # call tree doesn't hold on to the memory of every frame until the transaction ends.
+    keep_child_frames = False
+
     logger = get_extended_debug_logger('eth.vm.computation.Computation')
 
     def __init__(self,
@@ -394,6 +400,23 @@ class BaseComputation(Configurable, ComputationAPI):
                 self.return_data = child_computation.output
         self.children.append(child_computation)
 
+        if not self.keep_child_frames:
+            cast(BaseComputation, child_computation)._release_frame()
+
+    def _release_frame(self) -> None:
+        """
+        Drop what only the execution of this finished computation needed. The message, gas,
+        error, output, logs and accounts to delete are kept.
+        """
+        self._memory = None
+        self._stack = None
+        self.code = None
+        # The output of the children, which was copied to memory if it was needed
+        self.return_data = b''
+        # A view of the memory of the parent, which would keep it alive
+        if isinstance(self.msg.data, memoryview):
+            self.msg.data = self.msg.data_as_bytes
+
     #
     # Account management
     #
@@ -78,7 +78,10 @@ class FrontierComputation(BaseComputation):
                 encode_hex(message.storage_address),
             )
 
-        state.touch_account(message.storage_address)
+        # Touching an account that exists doesn't change it, so frames that only read, like
+        # static calls and most precompile calls, leave the snapshot without any changes
+        if not state.account_exists(message.storage_address):
+            state.touch_account(message.storage_address)
 
         computation = cls.apply_computation(
             state,
@@ -128,7 +128,7 @@ def gasprice(computation: BaseComputation) -> None:
 
 def extcodesize(computation: BaseComputation) -> None:
     account = force_bytes_to_address(computation.stack_pop1_bytes())
-    code_size = len(computation.state.get_code(account))
+    code_size = computation.state.get_code_size(account)
 
     computation.stack_push_int(code_size)
 
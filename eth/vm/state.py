@@ -1,4 +1,5 @@
 import contextlib
+import copy
 from typing import (
     Iterator,
     Tuple,
@@ -31,6 +32,7 @@ from eth.abc import (
 from eth.constants import (
     MAX_PREV_HEADER_DEPTH,
 )
+from eth.db.ephemeral import EphemeralAccountDB
 from eth.typing import JournalDBCheckpoint
 from eth._utils.datatypes import (
     Configurable,
@@ -140,6 +142,9 @@ class BaseState(Configurable, StateAPI):
     def set_code(self, address: Address, code: bytes) -> None:
         self._account_db.set_code(address, code)
 
+    def get_code_size(self, address: Address) -> int:
+        return self._account_db.get_code_size(address)
+
     def get_code_hash(self, address: Address) -> Hash32:
         return self._account_db.get_code_hash(address)
 
@@ -182,6 +187,15 @@ class BaseState(Configurable, StateAPI):
     def persist(self) -> MetaWitnessAPI:
         return self._account_db.persist()
 
+    def fork(self, ephemeral: bool = False) -> 'BaseState':
+        forked_state = copy.copy(self)
+        account_db = self._account_db.fork()
+        if ephemeral:
+            forked_state._account_db = EphemeralAccountDB(account_db)
+        else:
+            forked_state._account_db = account_db
+        return forked_state
+
     #
     # Access self.prev_hashes (Read-only)
     #
@@ -86,7 +86,9 @@ DEFAULT_GENESIS_STATE = [
 GenesisState = Iterable[Tuple[Address, Dict[str, Any]]]
 
 
-def get_chain(vm: Type[VirtualMachineAPI], genesis_state: GenesisState) -> Iterable[MiningChain]:
+def get_chain(vm: Type[VirtualMachineAPI],
+              genesis_state: GenesisState,
+              genesis_params: Dict[str, Any]=GENESIS_PARAMS) -> Iterable[MiningChain]:
 
     with tempfile.TemporaryDirectory() as temp_dir:
         level_db_obj = LevelDB(Path(temp_dir))
@@ -94,7 +96,7 @@ def get_chain(vm: Type[VirtualMachineAPI], genesis_state: GenesisState) -> Itera
             MiningChain,
             fork_at(vm, constants.GENESIS_BLOCK_NUMBER),
             disable_pow_check(),
-            genesis(db=level_db_obj, params=GENESIS_PARAMS, state=genesis_state)
+            genesis(db=level_db_obj, params=genesis_params, state=genesis_state)
         )
         yield level_db_chain
 
@@ -6,6 +6,30 @@ from .import_empty_blocks import (  # noqa: F401
     ImportEmptyBlocksBenchmark
 )
 
+from .import_reorg_blocks import (  # noqa: F401
+    ImportReorgBlocksBenchmark
+)
+
+from .import_value_transfers import (  # noqa: F401
+    ImportValueTransfersBenchmark
+)
+
 from .simple_value_transfers import (  # noqa: F401
     SimpleValueTransferBenchmark,
 )
+
+from .persist_header_chain import (  # noqa: F401
+    PersistHeaderChainBenchmark,
+)
+
+from .gas_estimation import (  # noqa: F401
+    GasEstimationBenchmark,
+)
+
+from .static_calls import (  # noqa: F401
+    StaticCallBenchmark,
+)
+
+from .check_pow_seals import (  # noqa: F401
+    CheckPowSealsBenchmark,
+)
@@ -0,0 +1,87 @@
+from concurrent.futures import Executor
+from typing import (
+    Tuple,
+)
+
+from eth_utils import (
+    big_endian_to_int,
+)
+
+from eth._utils.workers import WorkerPool
+from eth.consensus.pow import (
+    PowSeal,
+    check_pow_seals,
+    get_cache,
+)
+
+from pyethash import (
+    EPOCH_LENGTH,
+    hashimoto_light,
+)
+
+from .base_benchmark import (
+    BaseBenchmark
+)
+from _utils.reporting import (
+    DefaultStat
+)
+
+
+def make_seals(num_seals: int, num_epochs: int) -> Tuple[PowSeal, ...]:
+    """
+    Make valid seals, spread evenly over the first epochs. With a difficulty of 1, every
+    nonce is valid, as long as its mix hash matches.
+    """
+    seals = []
+    for index in range(num_seals):
+        block_number = (index * num_epochs // num_seals) * EPOCH_LENGTH + index
+        mining_hash = index.to_bytes(32, 'big')
+        nonce = index.to_bytes(8, 'big')
+        mining_output = hashimoto_light(
+            block_number,
+            get_cache(block_number),
+            mining_hash,
+            big_endian_to_int(nonce),
+        )
+        seals.append(PowSeal(block_number, mining_hash, mining_output[b'mix digest'], nonce, 1))
+    return tuple(seals)
+
+
+class CheckPowSealsBenchmark(BaseBenchmark):
+    """
+    Check the proof of work seals of a header chain in this process, and in worker
+    processes. The workers are started, and build their Ethash caches, before the
+    measured run.
+    """
+
+    def __init__(self, num_seals: int = 2000, num_epochs: int = 2) -> None:
+        self.num_seals = num_seals
+        self.num_epochs = num_epochs
+
+    @property
+    def name(self) -> str:
+        return 'PoW seal checks'
+
+    def execute(self) -> DefaultStat:
+        seals = make_seals(self.num_seals, self.num_epochs)
+
+        total_stat = self.check_seals('in process', seals, None)
+        with WorkerPool() as worker_pool:
+            check_pow_seals(seals, worker_pool)
+            stat = self.check_seals(f'{worker_pool.max_workers} workers', seals, worker_pool)
+        total_stat = total_stat.cumulate(stat)
+
+        return total_stat
+
+    def check_seals(self,
+                    caption: str,
+                    seals: Tuple[PowSeal, ...],
+                    executor: Executor) -> DefaultStat:
+        value = self.as_timed_result(lambda: check_pow_seals(seals, executor))
+        stat = DefaultStat(
+            caption=caption,
+            total_blocks=len(seals),
+            total_seconds=value.duration,
+        )
+        self.print_stat_line(stat)
+        return stat
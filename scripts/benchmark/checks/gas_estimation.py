@@ -0,0 +1,115 @@
+import logging
+from typing import (
+    Callable,
+)
+
+from eth_utils import (
+    int_to_big_endian,
+)
+
+from eth.abc import (
+    SignedTransactionAPI,
+    StateAPI,
+)
+from eth.chains.base import (
+    MiningChain,
+)
+from eth.estimators.gas import (
+    binary_gas_search_exact,
+    binary_gas_search_intrinsic_tolerance,
+    gas_needed_estimation,
+)
+from eth.tools.factories.transaction import (
+    new_transaction
+)
+
+from .base_benchmark import (
+    BaseBenchmark,
+)
+from _utils.chain_plumbing import (
+    DEFAULT_GENESIS_STATE,
+    FUNDED_ADDRESS,
+    FUNDED_ADDRESS_PRIVATE_KEY,
+    get_all_chains,
+)
+from _utils.reporting import (
+    DefaultStat,
+)
+
+
+def push(value: int) -> bytes:
+    encoded_value = int_to_big_endian(value)
+    return bytes([0x5f + len(encoded_value)]) + encoded_value
+
+
+STORE_ADDRESS = b'\x10' * 20
+FORWARD_ADDRESS = b'\x11' * 20
+
+# Stores to ten slots
+STORE_CODE = b''.join(push(slot + 1) + push(slot) + b'\x55' for slot in range(10))
+
+# Calls the store contract with all the gas left, and fails if the call fails:
+# ... CALL ISZERO PUSH1 38 JUMPI STOP JUMPDEST(38) INVALID
+FORWARD_CODE = push(0) * 5 + b'\x73' + STORE_ADDRESS + b'\x5a\xf1\x15\x60\x26\x57\x00\x5b\xfe'
+
+GENESIS_STATE = DEFAULT_GENESIS_STATE + [
+    (STORE_ADDRESS, {"balance": 0, "code": STORE_CODE}),
+    (FORWARD_ADDRESS, {"balance": 0, "code": FORWARD_CODE}),
+]
+
+GasEstimator = Callable[[StateAPI, SignedTransactionAPI], int]
+
+
+class GasEstimationBenchmark(BaseBenchmark):
+    """
+    Estimate the gas of a transaction that forwards all its gas to a contract that stores
+    to ten slots, with the binary searches and with the single-pass estimation. The
+    estimates of each estimator are added up as the gas, to compare their accuracy.
+    """
+
+    def __init__(self, num_estimates: int = 100) -> None:
+        self.num_estimates = num_estimates
+
+    @property
+    def name(self) -> str:
+        return 'Gas estimation'
+
+    def execute(self) -> DefaultStat:
+        total_stat = DefaultStat()
+
+        estimators = (
+            ('binary', binary_gas_search_intrinsic_tolerance),
+            ('binary exact', binary_gas_search_exact),
+            ('gas needed', gas_needed_estimation),
+        )
+        for chain in get_all_chains(GENESIS_STATE):
+            for caption, estimator in estimators:
+                value = self.as_timed_result(lambda: self.estimate_gas(chain, estimator))
+
+                stat = DefaultStat(
+                    caption=f'{chain.get_vm().fork} {caption}',
+                    total_tx=self.num_estimates,
+                    total_seconds=value.duration,
+                    total_gas=value.wrapped_value,
+                )
+                total_stat = total_stat.cumulate(stat)
+                self.print_stat_line(stat)
+
+        return total_stat
+
+    def estimate_gas(self, chain: MiningChain, estimator: GasEstimator) -> int:
+        tx = new_transaction(
+            vm=chain.get_vm(),
+            private_key=FUNDED_ADDRESS_PRIVATE_KEY,
+            from_=FUNDED_ADDRESS,
+            to=FORWARD_ADDRESS,
+        )
+        chain.gas_estimator = estimator
+
+        total_gas = 0
+        for _ in range(self.num_estimates):
+            estimate = chain.estimate_gas(tx)
+            logging.debug(f'Estimated {estimate} gas')
+            total_gas += estimate
+
+        return total_gas
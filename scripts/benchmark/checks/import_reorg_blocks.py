@@ -0,0 +1,112 @@
+from typing import (
+    Iterable,
+    Tuple,
+    Type,
+)
+
+from eth_utils.toolz import (
+    assoc,
+)
+
+from eth.abc import (
+    BlockAPI,
+    VirtualMachineAPI,
+)
+from eth.chains.base import (
+    MiningChain,
+)
+from eth.tools.builder.chain import (
+    build,
+    copy,
+    disable_pow_check,
+    fork_at,
+    genesis,
+    mine_block,
+    mine_blocks,
+)
+
+from .base_benchmark import (
+    BaseBenchmark
+)
+from _utils.chain_plumbing import (
+    ALL_VM,
+    DEFAULT_GENESIS_STATE,
+    GENESIS_PARAMS,
+    get_chain,
+)
+from _utils.reporting import (
+    DefaultStat
+)
+
+
+class ImportReorgBlocksBenchmark(BaseBenchmark):
+    """
+    Import competing branches from genesis, each one block longer than the one before,
+    so that the last block of every branch reorganizes the whole previous branch.
+    """
+
+    def __init__(self, num_branches: int = 10, branch_length: int = 20) -> None:
+        self.num_branches = num_branches
+        self.branch_length = branch_length
+
+    @property
+    def name(self) -> str:
+        return 'Block import with reorgs'
+
+    def execute(self) -> DefaultStat:
+        total_stat = DefaultStat()
+
+        for vm in ALL_VM:
+            for chain in get_chain(vm, DEFAULT_GENESIS_STATE):
+                branches = self.mine_branches(vm, chain.get_canonical_head().timestamp)
+                num_blocks = sum(len(branch) for branch in branches)
+
+                value = self.as_timed_result(lambda: self.import_branches(chain, branches))
+
+                stat = DefaultStat(
+                    caption=chain.get_vm().fork,
+                    total_blocks=num_blocks,
+                    total_seconds=value.duration
+                )
+                total_stat = total_stat.cumulate(stat)
+                self.print_stat_line(stat)
+
+        return total_stat
+
+    def mine_branches(self,
+                      vm: Type[VirtualMachineAPI],
+                      genesis_timestamp: int) -> Tuple[Tuple[BlockAPI, ...], ...]:
+        # Mine in memory, on a chain with the same genesis as the benchmarked chain
+        source_chain = build(
+            MiningChain,
+            fork_at(vm, 0),
+            disable_pow_check(),
+            genesis(
+                params=assoc(GENESIS_PARAMS, 'timestamp', genesis_timestamp),
+                state=DEFAULT_GENESIS_STATE,
+            ),
+        )
+        return tuple(
+            self.mine_branch(source_chain, branch_index)
+            for branch_index in range(self.num_branches)
+        )
+
+    def mine_branch(self, source_chain: MiningChain, branch_index: int) -> Tuple[BlockAPI, ...]:
+        branch_chain = build(
+            source_chain,
+            copy(),
+            mine_block(extra_data=b'branch-%d' % branch_index),
+            mine_blocks(self.branch_length + branch_index - 1),
+        )
+        head_number = branch_chain.get_canonical_head().block_number
+        return tuple(
+            branch_chain.get_canonical_block_by_number(block_number)
+            for block_number in range(1, head_number + 1)
+        )
+
+    def import_branches(self,
+                        chain: MiningChain,
+                        branches: Iterable[Tuple[BlockAPI, ...]]) -> None:
+        for branch in branches:
+            for block in branch:
+                chain.import_block(block)
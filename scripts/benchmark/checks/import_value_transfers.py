@@ -0,0 +1,131 @@
+import os
+import time
+from typing import (
+    Any,
+    Dict,
+    Tuple,
+    Type,
+)
+
+from eth_utils.toolz import (
+    assoc,
+)
+import rlp
+
+from eth._utils.workers import WorkerPool
+from eth.abc import (
+    BlockAPI,
+    VirtualMachineAPI,
+)
+from eth.chains.base import (
+    MiningChain,
+)
+from eth.tools.builder.chain import (
+    build,
+    disable_pow_check,
+    fork_at,
+    genesis,
+)
+from eth.tools.factories.transaction import (
+    new_transaction
+)
+
+from .base_benchmark import (
+    BaseBenchmark
+)
+from _utils.chain_plumbing import (
+    ALL_VM,
+    DEFAULT_GENESIS_STATE,
+    FUNDED_ADDRESS,
+    FUNDED_ADDRESS_PRIVATE_KEY,
+    GENESIS_PARAMS,
+    SECOND_ADDRESS,
+    get_chain,
+)
+from _utils.reporting import (
+    DefaultStat
+)
+
+
+class ImportValueTransfersBenchmark(BaseBenchmark):
+    """
+    Import blocks full of value transfers with :meth:`~eth.chains.base.Chain.import_blocks`,
+    once with the transaction senders recovered during the import, and once with the
+    senders recovered ahead of the import in the worker processes of the chain.
+    """
+
+    def __init__(self, num_blocks: int = 20, transactions_per_block: int = 100) -> None:
+        self.num_blocks = num_blocks
+        self.transactions_per_block = transactions_per_block
+
+    @property
+    def name(self) -> str:
+        return 'Value transfer block import'
+
+    def execute(self) -> DefaultStat:
+        vm = ALL_VM[-1]
+        # Both chains need the same genesis to import the same blocks
+        genesis_params = assoc(GENESIS_PARAMS, 'timestamp', int(time.time()))
+        blocks = self.mine_blocks(vm, genesis_params)
+        total_stat = DefaultStat()
+
+        for chain in get_chain(vm, DEFAULT_GENESIS_STATE, genesis_params):
+            chain.import_prefetch_depth = 0
+            stat = self.import_blocks('in process', chain, blocks)
+            total_stat = total_stat.cumulate(stat)
+
+        for chain in get_chain(vm, DEFAULT_GENESIS_STATE, genesis_params):
+            with WorkerPool() as worker_pool:
+                # start the workers before the measured run
+                worker_pool.submit(os.getpid).result()
+                chain.consensus_context.worker_pool = worker_pool
+                stat = self.import_blocks(f'{worker_pool.max_workers} workers', chain, blocks)
+            total_stat = total_stat.cumulate(stat)
+
+        return total_stat
+
+    def mine_blocks(self,
+                    vm: Type[VirtualMachineAPI],
+                    genesis_params: Dict[str, Any]) -> Tuple[BlockAPI, ...]:
+        # Mine in memory, on a chain with the same genesis as the benchmarked chains
+        source_chain = build(
+            MiningChain,
+            fork_at(vm, 0),
+            disable_pow_check(),
+            genesis(params=genesis_params, state=DEFAULT_GENESIS_STATE),
+        )
+        for _ in range(self.num_blocks):
+            for _ in range(self.transactions_per_block):
+                transaction = new_transaction(
+                    vm=source_chain.get_vm(),
+                    private_key=FUNDED_ADDRESS_PRIVATE_KEY,
+                    from_=FUNDED_ADDRESS,
+                    to=SECOND_ADDRESS,
+                    amount=100,
+                    gas=21000,
+                )
+                source_chain.apply_transaction(transaction)
+            source_chain.mine_block()
+
+        return tuple(
+            source_chain.get_canonical_block_by_number(block_number)
+            for block_number in range(1, self.num_blocks + 1)
+        )
+
+    def import_blocks(self,
+                      caption: str,
+                      chain: MiningChain,
+                      blocks: Tuple[BlockAPI, ...]) -> DefaultStat:
+        # decode the blocks again, so that none of the senders are known yet
+        fresh_blocks = tuple(rlp.decode(rlp.encode(block), sedes=type(block)) for block in blocks)
+        value = self.as_timed_result(lambda: chain.import_blocks(fresh_blocks))
+
+        stat = DefaultStat(
+            caption=caption,
+            total_blocks=len(blocks),
+            total_tx=sum(len(block.transactions) for block in blocks),
+            total_seconds=value.duration,
+            total_gas=sum(block.header.gas_used for block in blocks),
+        )
+        self.print_stat_line(stat)
+        return stat
@@ -0,0 +1,105 @@
+import logging
+import tempfile
+from pathlib import Path
+from typing import (
+    Callable,
+    Iterable,
+    Tuple,
+)
+
+from eth_utils.toolz import (
+    partition_all,
+)
+
+from eth.abc import (
+    AtomicDatabaseAPI,
+    BlockHeaderAPI,
+)
+from eth.constants import (
+    GENESIS_BLOCK_NUMBER,
+    GENESIS_DIFFICULTY,
+    GENESIS_GAS_LIMIT,
+)
+from eth.db.atomic import AtomicDB
+from eth.db.backends.level import LevelDB
+from eth.db.header import HeaderDB
+from eth.rlp.headers import BlockHeader
+
+from .base_benchmark import (
+    BaseBenchmark
+)
+from _utils.reporting import (
+    DefaultStat
+)
+
+
+def make_header_chain(length: int) -> Iterable[BlockHeaderAPI]:
+    header = BlockHeader(
+        difficulty=GENESIS_DIFFICULTY,
+        block_number=GENESIS_BLOCK_NUMBER,
+        gas_limit=GENESIS_GAS_LIMIT,
+    )
+    yield header
+
+    for _ in range(length - 1):
+        header = BlockHeader(
+            difficulty=1,
+            block_number=header.block_number + 1,
+            gas_limit=GENESIS_GAS_LIMIT,
+            timestamp=header.timestamp + 1,
+            parent_hash=header.hash,
+        )
+        yield header
+
+
+class PersistHeaderChainBenchmark(BaseBenchmark):
+    """
+    Persist a long header chain in batches, like a checkpoint sync does, into memory and
+    into LevelDB. Only the time spent in the database is measured: the headers are built
+    in segments beforehand.
+    """
+
+    def __init__(self, num_headers: int = 1000000, segment_size: int = 100000) -> None:
+        self.num_headers = num_headers
+        self.segment_size = segment_size
+
+    @property
+    def name(self) -> str:
+        return 'Header chain persistence'
+
+    def execute(self) -> DefaultStat:
+        total_stat = DefaultStat()
+
+        databases: Tuple[Tuple[str, Callable[[Path], AtomicDatabaseAPI]], ...] = (
+            ('MemoryDB', lambda path: AtomicDB()),
+            ('LevelDB', LevelDB),
+        )
+        for caption, make_db in databases:
+            with tempfile.TemporaryDirectory() as db_dir:
+                try:
+                    db = make_db(Path(db_dir))
+                except ImportError as exc:
+                    logging.info(f"Skipping {caption}: {exc}")
+                    continue
+
+                stat = DefaultStat(
+                    caption=caption,
+                    total_blocks=self.num_headers,
+                    total_seconds=self.persist_headers(HeaderDB(db)),
+                )
+                total_stat = total_stat.cumulate(stat)
+                self.print_stat_line(stat)
+
+        return total_stat
+
+    def persist_headers(self, headerdb: HeaderDB) -> float:
+        duration = 0.0
+        for segment in partition_all(self.segment_size, make_header_chain(self.num_headers)):
+            value = self.as_timed_result(lambda: headerdb.persist_header_chain_in_batches(segment))
+            duration += value.duration
+
+        head = headerdb.get_canonical_head()
+        if head.block_number != self.num_headers - 1:
+            raise Exception(f"Expected the head at #{self.num_headers - 1}, but got {head}")
+
+        return duration
@@ -0,0 +1,101 @@
+import logging
+
+from eth.chains.base import (
+    MiningChain,
+)
+from eth.tools.factories.transaction import (
+    new_transaction
+)
+from eth.vm import opcode_values
+
+from .base_benchmark import (
+    BaseBenchmark,
+)
+from _utils.chain_plumbing import (
+    DEFAULT_GENESIS_STATE,
+    FUNDED_ADDRESS,
+    FUNDED_ADDRESS_PRIVATE_KEY,
+    get_all_chains,
+)
+from _utils.reporting import (
+    DefaultStat,
+)
+
+
+ORACLE_ADDRESS = b'\x10' * 20
+MULTICALL_ADDRESS = b'\x11' * 20
+
+# Returns the price in slot 0: PUSH1 0 SLOAD PUSH1 0 MSTORE PUSH1 32 PUSH1 0 RETURN
+ORACLE_CODE = bytes.fromhex('60005460005260206000f3')
+
+NUM_STATIC_CALLS = 500
+
+# Reads the oracle in a loop, like a multicall of views:
+# PUSH2 <n> JUMPDEST(3) <STATICCALL the oracle with all the gas> POP
+# PUSH1 1 SWAP1 SUB DUP1 PUSH1 3 JUMPI STOP
+MULTICALL_CODE = (
+    b'\x61' + NUM_STATIC_CALLS.to_bytes(2, 'big') + b'\x5b'
+    + bytes.fromhex('6020600060006000') + b'\x73' + ORACLE_ADDRESS + bytes.fromhex('5afa50')
+    + bytes.fromhex('6001900380600357') + b'\x00'
+)
+
+GENESIS_STATE = DEFAULT_GENESIS_STATE + [
+    (ORACLE_ADDRESS, {"balance": 0, "code": ORACLE_CODE, "storage": {0: 42}}),
+    (MULTICALL_ADDRESS, {"balance": 0, "code": MULTICALL_CODE}),
+]
+
+
+class StaticCallBenchmark(BaseBenchmark):
+    """
+    Apply transactions that make many static calls to a contract that only reads its
+    storage, like multicalls of oracle views, on the forks that have STATICCALL.
+    """
+
+    def __init__(self, num_tx: int = 20) -> None:
+        self.num_tx = num_tx
+
+    @property
+    def name(self) -> str:
+        return 'Static calls'
+
+    def execute(self) -> DefaultStat:
+        total_stat = DefaultStat()
+
+        for chain in get_all_chains(GENESIS_STATE):
+            opcodes = chain.get_vm().state.computation_class.opcodes
+            if opcode_values.STATICCALL not in opcodes:
+                continue
+
+            value = self.as_timed_result(lambda: self.apply_transactions(chain))
+
+            stat = DefaultStat(
+                caption=chain.get_vm().fork,
+                total_tx=self.num_tx,
+                total_seconds=value.duration,
+                total_gas=value.wrapped_value,
+            )
+            total_stat = total_stat.cumulate(stat)
+            self.print_stat_line(stat)
+
+        return total_stat
+
+    def apply_transactions(self, chain: MiningChain) -> int:
+        total_gas_used = 0
+        for _ in range(self.num_tx):
+            tx = new_transaction(
+                vm=chain.get_vm(),
+                private_key=FUNDED_ADDRESS_PRIVATE_KEY,
+                from_=FUNDED_ADDRESS,
+                to=MULTICALL_ADDRESS,
+                gas=1500000,
+            )
+            logging.debug(f'Applying Transaction {tx}')
+
+            _, _, computation = chain.apply_transaction(tx)
+            computation.raise_if_error()
+            total_gas_used += computation.get_gas_used()
+
+            # Keep the block from filling up
+            chain.mine_block()
+
+        return total_gas_used
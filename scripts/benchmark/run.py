@@ -8,9 +8,15 @@ from eth._utils.version import (
 )
 
 from checks import (
+    CheckPowSealsBenchmark,
+    GasEstimationBenchmark,
     ImportEmptyBlocksBenchmark,
+    ImportReorgBlocksBenchmark,
+    ImportValueTransfersBenchmark,
     MineEmptyBlocksBenchmark,
+    PersistHeaderChainBenchmark,
     SimpleValueTransferBenchmark,
+    StaticCallBenchmark,
 )
 
 from checks.erc20_interact import (
@@ -77,6 +83,8 @@ def run() -> None:
     benchmarks = [
         MineEmptyBlocksBenchmark(),
         ImportEmptyBlocksBenchmark(),
+        ImportReorgBlocksBenchmark(),
+        ImportValueTransfersBenchmark(),
         SimpleValueTransferBenchmark(TO_EXISTING_ADDRESS_CONFIG),
         SimpleValueTransferBenchmark(TO_NON_EXISTING_ADDRESS_CONFIG),
         ERC20DeployBenchmark(),
@@ -88,6 +96,10 @@ def run() -> None:
         DOSContractCreateEmptyContractBenchmark(),
         DOSContractRevertSstoreUint64Benchmark(),
         DOSContractRevertCreateEmptyContractBenchmark(),
+        PersistHeaderChainBenchmark(),
+        GasEstimationBenchmark(),
+        StaticCallBenchmark(),
+        CheckPowSealsBenchmark(),
     ]
 
     for benchmark in benchmarks:
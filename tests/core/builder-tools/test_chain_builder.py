@@ -7,12 +7,15 @@ from eth.chains.base import (
     MiningChain,
 )
 from eth.constants import ZERO_ADDRESS
+from eth.db.account import UntrackedAccountDB
+from eth.db.account_cache import account_caches
 from eth.tools.builder.chain import (
     at_block_number,
     build,
     chain_split,
     copy,
     disable_pow_check,
+    disable_witness_tracking,
     frontier_at,
     genesis,
     import_block,
@@ -231,6 +234,45 @@ def test_chain_import_blocks_many(mining_chain):
     assert head == block_3.header
 
 
+def test_chain_import_blocks_without_witness_tracking(mining_chain_params,
+                                                      funded_address,
+                                                      funded_address_private_key):
+    mining_chain = build(*mining_chain_params)
+    tx = new_transaction(
+        mining_chain.get_vm(),
+        from_=funded_address,
+        to=ZERO_ADDRESS,
+        private_key=funded_address_private_key,
+    )
+    temp_chain = build(
+        mining_chain,
+        copy(),
+        mine_block(transactions=[tx]),
+        mine_block(),
+    )
+    block_1, block_2 = (
+        temp_chain.get_canonical_block_by_number(1),
+        temp_chain.get_canonical_block_by_number(2),
+    )
+
+    *chain_params, genesis_params = mining_chain_params
+    chain = build(*chain_params, disable_witness_tracking(), genesis_params)
+    assert isinstance(chain.get_vm().state._account_db, UntrackedAccountDB)
+
+    import_result = chain.import_block(block_1)
+    assert import_result.imported_block == block_1
+    assert len(import_result.meta_witness.hashes) == 0
+    # the next block starts from the accounts cached by this one
+    assert account_caches[chain.chaindb.db].state_root == block_1.header.state_root
+    (import_result, ) = chain.import_blocks((block_2, ))
+    assert import_result.imported_block == block_2
+    assert len(import_result.meta_witness.hashes) == 0
+
+    assert chain.get_canonical_head() == block_2.header
+    expected_balance = temp_chain.get_vm().state.get_balance(funded_address)
+    assert chain.get_vm().state.get_balance(funded_address) == expected_balance
+
+
 def test_chain_builder_chain_split(mining_chain):
     chain_a, chain_b = build(
         mining_chain,
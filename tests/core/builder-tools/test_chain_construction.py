@@ -4,6 +4,7 @@ from eth_utils import ValidationError
 
 from eth.chains.base import MiningChain
 from eth.consensus.pow import check_pow
+from eth.tools.mining import POWMiningMixin
 from eth.tools.builder.chain import (
     build,
     byzantium_at,
@@ -127,6 +128,17 @@ def test_chain_builder_enable_pow_mining():
     )
 
 
+def test_chain_builder_enable_pow_mining_workers():
+    chain = build(
+        MiningChain,
+        frontier_at(0),
+        enable_pow_mining(mining_workers=4),
+    )
+    vm_class = chain.get_vm_class_for_block_number(0)
+    assert issubclass(vm_class, POWMiningMixin)
+    assert vm_class.mining_workers == 4
+
+
 def test_chain_builder_without_any_mining_config():
     chain = build(
         MiningChain,
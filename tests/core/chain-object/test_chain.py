@@ -1,7 +1,10 @@
 import pytest
 import rlp
 
-from eth_utils import decode_hex
+from eth_utils import (
+    ValidationError,
+    decode_hex,
+)
 
 from eth import constants
 from eth.chains.mainnet import MAINNET_GENESIS_HEADER
@@ -105,3 +108,30 @@ def test_mainnet_genesis_hash():
 def test_ropsten_genesis_hash():
     assert ROPSTEN_GENESIS_HEADER.hash == decode_hex(
         '0x41941023680923e0fe4d74a34bdac8141f2540e3ae90623718e47d66d1ca4a2d')
+
+
+def test_validate_chain_checks_seals_together(chain, monkeypatch):
+    if not hasattr(chain, 'mine_block'):
+        pytest.skip('Need a mining chain')
+    genesis = chain.get_canonical_head()
+    headers = tuple(chain.mine_block().header for _ in range(3))
+
+    checked_seals = []
+    vm_class = type(chain.get_vm())
+    monkeypatch.setattr(
+        vm_class,
+        'validate_seals',
+        lambda vm, headers: checked_seals.append(headers),
+    )
+
+    chain.validate_chain(genesis, headers)
+    assert checked_seals == [headers]
+
+    chain.validate_chain(genesis, headers, seal_check_random_sample_rate=0)
+    assert checked_seals == [headers]
+
+    bad_headers = headers[:1] + (headers[2],)
+    with pytest.raises(ValidationError):
+        chain.validate_chain(genesis, bad_headers)
+    # seals are not checked if the chain of headers is invalid
+    assert checked_seals == [headers]
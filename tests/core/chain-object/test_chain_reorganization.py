@@ -80,6 +80,53 @@ def test_import_block_with_reorg(chain, funded_address_private_key):
     assert main_chain.get_canonical_head() == f_block_6.header
 
 
+def test_import_block_reads_reorganized_blocks_on_access(chain, monkeypatch):
+    main_chain, fork_chain = api.build(
+        chain,
+        api.chain_split(
+            (api.mine_blocks(2),),
+            (api.mine_block(extra_data=b'fork-it'), api.mine_blocks(2)),
+        ),
+    )
+    block_4, block_5 = (main_chain.get_canonical_block_by_number(n) for n in (4, 5))
+    f_block_4, f_block_5, f_block_6 = (
+        fork_chain.get_canonical_block_by_number(n) for n in (4, 5, 6)
+    )
+    main_chain.import_block(f_block_4)
+    main_chain.import_block(f_block_5)
+
+    read_hashes = []
+    original_get_block_by_hash = main_chain.get_block_by_hash
+
+    def get_block_by_hash(block_hash):
+        read_hashes.append(block_hash)
+        return original_get_block_by_hash(block_hash)
+
+    monkeypatch.setattr(main_chain, 'get_block_by_hash', get_block_by_hash)
+    block_import_result = main_chain.import_block(f_block_6)
+
+    new_canonical_blocks = block_import_result.new_canonical_blocks
+    old_canonical_blocks = block_import_result.old_canonical_blocks
+    assert new_canonical_blocks.hashes == (f_block_4.hash, f_block_5.hash, f_block_6.hash)
+    assert old_canonical_blocks.hashes == (block_4.hash, block_5.hash)
+    assert len(new_canonical_blocks) == 3
+    # the imported block is known, so nothing needs to be read
+    assert new_canonical_blocks[-1] == f_block_6
+    assert read_hashes == []
+
+    assert old_canonical_blocks[0] == block_4
+    assert old_canonical_blocks[0] == block_4
+    assert read_hashes == [block_4.hash]
+
+    assert new_canonical_blocks[:2] == (f_block_4, f_block_5)
+    assert old_canonical_blocks == [block_4, block_5]
+
+    # like a tuple of the same blocks, the result can be hashed
+    assert old_canonical_blocks == (block_4, block_5)
+    assert hash(old_canonical_blocks) == hash((block_4, block_5))
+    assert hash(block_import_result) == hash(tuple(block_import_result))
+
+
 def test_import_block_with_reorg_with_current_head_as_uncle(
         chain,
         funded_address_private_key):
@@ -117,3 +164,40 @@ def test_import_block_with_reorg_with_current_head_as_uncle(
     block = final_chain.get_canonical_block_by_number(header.block_number)
 
     assert len(block.uncles) == 1
+
+
+def test_import_block_previous_hashes_follow_reorg(chain):
+    main_chain = api.build(
+        chain,
+        api.copy(),
+        api.mine_blocks(3),
+    )
+    fork_chain = api.build(
+        chain,
+        api.copy(),
+        api.mine_block(extra_data=b'fork-it'),
+        api.mine_blocks(2),
+    )
+
+    def get_block(source_chain, block_number):
+        return source_chain.get_canonical_block_by_number(block_number)
+
+    blocks_to_import = (
+        get_block(main_chain, 4),
+        get_block(main_chain, 5),
+        get_block(fork_chain, 4),
+        get_block(fork_chain, 5),
+        get_block(fork_chain, 6),
+        get_block(main_chain, 6),
+    )
+    for block in blocks_to_import:
+        chain.import_block(block)
+
+        # siblings of the imported block get the window of hashes kept by the chain
+        parent_header = chain.get_block_header_by_hash(block.header.parent_hash)
+        vm = chain.get_vm(chain.create_header_from_parent(parent_header))
+        assert isinstance(vm.previous_hashes, tuple)
+
+        expected = tuple(vm.get_prev_hashes(parent_header.hash, chain.chaindb))
+        assert len(expected) == block.number
+        assert vm.previous_hashes == expected
@@ -1,5 +1,7 @@
 import pytest
 
+from eth_utils import ValidationError
+
 from eth.estimators.gas import binary_gas_search_1000_tolerance
 from eth.tools.factories.transaction import (
     new_transaction
@@ -713,3 +715,75 @@ def test_estimate_gas_on_full_block(
     next_pending_tx = mk_estimation_txn(chain, from_, from_key, data=garbage_data * 2)
 
     assert chain.estimate_gas(next_pending_tx, chain.header) == expected
+
+
+@pytest.mark.parametrize('max_workers', (1, 4))
+def test_estimate_gas_batch(
+        chain_without_block_validation_from_vm,
+        max_workers,
+        funded_address,
+        funded_address_private_key):
+    chain = chain_without_block_validation_from_vm(IstanbulVM)
+    vm = chain.get_vm()
+    transactions = (
+        new_transaction(vm, funded_address, ADDR_1010, private_key=funded_address_private_key),
+        new_transaction(vm, funded_address, ADDR_1010, data=b'\xff' * 10),
+        # The sender can't pay for the transfer
+        new_transaction(vm, ADDR_1010, ADDRESS_2, amount=1),
+        new_transaction(vm, funded_address, ADDRESS_2, data=b'\xff' * 32),
+    )
+
+    estimates = chain.estimate_gas_batch(transactions, max_workers=max_workers)
+
+    assert len(estimates) == len(transactions)
+    assert isinstance(estimates[2], ValidationError)
+    for transaction, estimate in zip(transactions, estimates):
+        if estimate is not estimates[2]:
+            assert estimate == chain.estimate_gas(transaction)
+
+
+def test_estimate_gas_batch_invalid_workers(chain_without_block_validation_from_vm):
+    chain = chain_without_block_validation_from_vm(IstanbulVM)
+    with pytest.raises(ValidationError):
+        chain.estimate_gas_batch((), max_workers=0)
+
+
+def test_estimate_gas_batch_concurrently_reads_code_sizes(
+        chain_without_block_validation_from_vm,
+        genesis_state,
+        funded_address,
+        funded_address_private_key):
+    # Stores the EXTCODESIZE of the address in the call data:
+    # PUSH1 0 CALLDATALOAD EXTCODESIZE PUSH1 0 SSTORE STOP
+    size_reader = force_bytes_to_address(b'\x20\x20')
+    genesis_state[size_reader] = {
+        'balance': 0,
+        'nonce': 0,
+        'code': bytes.fromhex('600035' '3b' '600055' '00'),
+        'storage': {},
+    }
+    targets = tuple(force_bytes_to_address(bytes([0x30, index])) for index in range(4))
+    for index, target in enumerate(targets):
+        genesis_state[target] = {
+            'balance': 0,
+            'nonce': 0,
+            'code': b'\x5b' * (index + 1),
+            'storage': {},
+        }
+
+    chain = chain_without_block_validation_from_vm(IstanbulVM)
+    vm = chain.get_vm()
+    transactions = tuple(
+        new_transaction(
+            vm,
+            funded_address,
+            size_reader,
+            private_key=funded_address_private_key,
+            data=targets[index % len(targets)].rjust(32, b'\0'),
+        )
+        for index in range(12)
+    )
+
+    estimates = chain.estimate_gas_batch(transactions, max_workers=4)
+
+    assert estimates == tuple(chain.estimate_gas(transaction) for transaction in transactions)
@@ -0,0 +1,206 @@
+import pytest
+
+from eth_utils import int_to_big_endian
+
+from eth.constants import CREATE_CONTRACT_ADDRESS
+from eth.estimators.gas import (
+    binary_gas_search_exact,
+    gas_needed_estimation,
+)
+from eth.tools.factories.transaction import (
+    new_transaction
+)
+from eth.vm.spoof import SpoofTransaction
+from eth.vm.forks import (
+    FrontierVM,
+    HomesteadVM,
+    TangerineWhistleVM,
+    SpuriousDragonVM,
+    ByzantiumVM,
+    ConstantinopleVM,
+    PetersburgVM,
+    IstanbulVM,
+    MuirGlacierVM,
+)
+
+
+def push(value):
+    encoded_value = int_to_big_endian(value)
+    return bytes([0x5f + len(encoded_value)]) + encoded_value
+
+
+def sstore(slot, value):
+    return push(value) + push(slot) + b'\x55'
+
+
+def call(to, gas=None, value=0):
+    # No input or output, the gas left is forwarded if no gas is given
+    gas_code = b'\x5a' if gas is None else push(gas)
+    return push(0) * 4 + push(value) + b'\x73' + to + gas_code + b'\xf1\x50'
+
+
+STOP = b'\x00'
+
+STORE = b'\x10' * 20
+CLEAR = b'\x11' * 20
+SAME_STORE = b'\x12' * 20
+FORWARD_ALL = b'\x13' * 20
+FORWARD_FIXED = b'\x14' * 20
+FORWARD_TWICE = b'\x15' * 20
+SEND_VALUE = b'\x16' * 20
+RECEIVE_VALUE = b'\x17' * 20
+BURN_CHILD_GAS = b'\x18' * 20
+GAS_GATED = b'\x19' * 20
+
+CONTRACTS = {
+    STORE: (sstore(0, 1) + STOP, {}),
+    CLEAR: (sstore(0, 0) + STOP, {0: 1}),
+    # Costs little after Istanbul, but needs more than the stipend left, per EIP-2200
+    SAME_STORE: (sstore(0, 5) + STOP, {0: 5}),
+    FORWARD_ALL: (call(STORE) + STOP, {}),
+    FORWARD_FIXED: (call(STORE, gas=30000) + STOP, {}),
+    FORWARD_TWICE: (call(FORWARD_ALL) + call(FORWARD_ALL) + STOP, {}),
+    # Only the stipend is forwarded
+    SEND_VALUE: (call(RECEIVE_VALUE, gas=0, value=1) + STOP, {}),
+    RECEIVE_VALUE: (push(0) * 2 + b'\xa0' + STOP, {}),
+    BURN_CHILD_GAS: (call(STORE, gas=5000) + STOP, {}),
+    # Fails unless 100000 gas is left: GAS PUSH3 100000 GT PUSH1 10 JUMPI STOP JUMPDEST INVALID
+    GAS_GATED: (b'\x5a' + push(100000) + b'\x11' + push(10) + b'\x57\x00\x5b\xfe', {}),
+}
+
+# Stores 1 and deploys a single STOP
+CREATE_CODE = sstore(0, 1) + push(1) + push(0) + b'\xf3'
+
+PRE_EIP150_VMS = (
+    FrontierVM,
+    HomesteadVM.configure(support_dao_fork=False),
+)
+
+EIP150_VMS = (
+    TangerineWhistleVM,
+    SpuriousDragonVM,
+    ByzantiumVM,
+    ConstantinopleVM,
+    PetersburgVM,
+    IstanbulVM,
+    MuirGlacierVM,
+)
+
+
+@pytest.fixture
+def genesis_state(base_genesis_state):
+    state = dict(base_genesis_state)
+    for address, (code, storage) in CONTRACTS.items():
+        state[address] = {
+            'balance': 1 if address == SEND_VALUE else 0,
+            'nonce': 0,
+            'code': code,
+            'storage': storage,
+        }
+    return state
+
+
+def run(state, transaction, gas):
+    snapshot = state.snapshot()
+    try:
+        return state.apply_transaction(SpoofTransaction(transaction, gas=gas, gas_price=0))
+    finally:
+        state.revert(snapshot)
+
+
+def least_gas_running_the_same(state, transaction):
+    """
+    Search for the least gas that runs the transaction like the block gas limit does,
+    including the calls that may fail without failing the transaction.
+    """
+    gas_used = run(state, transaction, state.gas_limit).get_gas_used()
+
+    def runs_the_same(gas):
+        computation = run(state, transaction, gas)
+        return computation.is_success and computation.get_gas_used() == gas_used
+
+    maximum_different = transaction.intrinsic_gas - 1
+    minimum_same = state.gas_limit
+    while minimum_same - maximum_different > 1:
+        midpoint = (minimum_same + maximum_different) // 2
+        if runs_the_same(midpoint):
+            minimum_same = midpoint
+        else:
+            maximum_different = midpoint
+
+    return minimum_same
+
+
+@pytest.mark.parametrize('vm_cls', PRE_EIP150_VMS + EIP150_VMS)
+@pytest.mark.parametrize(
+    'to, data',
+    (
+        (STORE, b''),
+        (CLEAR, b''),
+        (SAME_STORE, b''),
+        (FORWARD_FIXED, b''),
+        (SEND_VALUE, b''),
+        (CREATE_CONTRACT_ADDRESS, CREATE_CODE),
+        (b'\x20' * 20, b'\xff' * 10),
+    ),
+)
+def test_gas_needed_estimation_is_exact(
+        chain_without_block_validation_from_vm,
+        vm_cls,
+        to,
+        data,
+        funded_address):
+    chain = chain_without_block_validation_from_vm(vm_cls)
+    transaction = new_transaction(chain.get_vm(), funded_address, to, data=data)
+
+    with chain.get_vm().state_in_temp_block(ephemeral=True) as state:
+        estimate = gas_needed_estimation(state, transaction)
+        assert estimate == least_gas_running_the_same(state, transaction)
+
+
+@pytest.mark.parametrize('vm_cls', EIP150_VMS)
+@pytest.mark.parametrize('to', (FORWARD_ALL, FORWARD_TWICE))
+def test_gas_needed_estimation_with_the_gas_left_forwarded(
+        chain_without_block_validation_from_vm,
+        vm_cls,
+        to,
+        funded_address):
+    chain = chain_without_block_validation_from_vm(vm_cls)
+    transaction = new_transaction(chain.get_vm(), funded_address, to)
+
+    with chain.get_vm().state_in_temp_block(ephemeral=True) as state:
+        estimate = gas_needed_estimation(state, transaction)
+        assert estimate == least_gas_running_the_same(state, transaction)
+
+        # A binary search only looks for the least gas that doesn't fail the transaction,
+        # even if the call to store fails
+        assert binary_gas_search_exact(state, transaction) < estimate
+
+
+@pytest.mark.parametrize('vm_cls', PRE_EIP150_VMS + EIP150_VMS)
+@pytest.mark.parametrize('to', (BURN_CHILD_GAS, GAS_GATED))
+def test_gas_needed_estimation_falls_back_to_binary_search(
+        chain_without_block_validation_from_vm,
+        vm_cls,
+        to,
+        funded_address):
+    chain = chain_without_block_validation_from_vm(vm_cls)
+    transaction = new_transaction(chain.get_vm(), funded_address, to)
+
+    with chain.get_vm().state_in_temp_block(ephemeral=True) as state:
+        estimate = gas_needed_estimation(state, transaction)
+        assert estimate == binary_gas_search_exact(state, transaction)
+
+
+def test_gas_needed_estimation_as_chain_estimator(
+        chain_without_block_validation_from_vm,
+        funded_address):
+    chain = chain_without_block_validation_from_vm(IstanbulVM)
+    transaction = new_transaction(chain.get_vm(), funded_address, STORE)
+
+    binary_estimate = chain.estimate_gas(transaction)
+    chain.gas_estimator = gas_needed_estimation
+    estimate = chain.estimate_gas(transaction)
+
+    # The default binary search only looks to within the intrinsic gas
+    assert estimate <= binary_estimate < estimate + 21000
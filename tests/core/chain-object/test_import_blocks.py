@@ -0,0 +1,210 @@
+from contextlib import contextmanager
+
+import pytest
+
+from eth_utils import (
+    ValidationError,
+    to_wei,
+)
+import rlp
+
+from eth._utils.workers import WorkerPool
+from eth.chains.base import MiningChain
+from eth.constants import ZERO_ADDRESS
+from eth.tools.builder.chain import api
+from eth.tools.factories.transaction import new_transaction
+
+
+@pytest.fixture
+def chain():
+    return api.build(
+        MiningChain,
+        api.istanbul_at(0),
+        api.disable_pow_check(),
+        api.genesis(),
+    )
+
+
+def count_atomic_batches(chain, monkeypatch):
+    counter = []
+    db = chain.chaindb.db
+    original_atomic_batch = db.atomic_batch
+
+    @contextmanager
+    def counting_atomic_batch():
+        counter.append(None)
+        with original_atomic_batch() as batch:
+            yield batch
+
+    monkeypatch.setattr(db, 'atomic_batch', counting_atomic_batch)
+    return counter
+
+
+def test_import_blocks(chain, monkeypatch):
+    source_chain = api.build(chain, api.copy(), api.mine_blocks(5))
+    blocks = tuple(source_chain.get_canonical_block_by_number(number) for number in range(1, 6))
+
+    atomic_batches = count_atomic_batches(chain, monkeypatch)
+    import_results = chain.import_blocks(blocks, persist_every=2)
+
+    assert len(atomic_batches) == 3
+    assert tuple(result.imported_block for result in import_results) == blocks
+    assert tuple(result.new_canonical_blocks for result in import_results) == tuple(
+        (block,) for block in blocks
+    )
+    assert chain.get_canonical_head() == source_chain.get_canonical_head()
+    assert chain.header.parent_hash == blocks[-1].hash
+    for block in blocks:
+        assert chain.get_canonical_block_by_number(block.number) == block
+    assert chain.get_vm().state.state_root == blocks[-1].header.state_root
+
+
+def test_import_blocks_with_reorg(chain):
+    chain = api.build(chain, api.mine_blocks(2))
+    fork_chain = api.build(
+        chain,
+        api.copy(),
+        api.at_block_number(1),
+        api.mine_block(extra_data=b'fork-it'),
+        api.mine_blocks(3),
+    )
+    fork_blocks = tuple(
+        fork_chain.get_canonical_block_by_number(number) for number in range(2, 6)
+    )
+    old_block_2 = chain.get_canonical_block_by_number(2)
+
+    import_results = chain.import_blocks(fork_blocks, persist_every=3)
+
+    assert chain.get_canonical_head() == fork_blocks[-1].header
+    assert chain.get_canonical_block_by_number(2) == fork_blocks[0]
+    assert (old_block_2,) in tuple(result.old_canonical_blocks for result in import_results)
+
+
+def test_import_blocks_commits_blocks_before_failure(chain):
+    source_chain = api.build(chain, api.copy(), api.mine_blocks(3))
+    blocks = [source_chain.get_canonical_block_by_number(number) for number in range(1, 4)]
+    blocks[1] = blocks[1].copy(header=blocks[1].header.copy(gas_used=1))
+
+    with pytest.raises(ValidationError):
+        chain.import_blocks(blocks, persist_every=10)
+
+    assert chain.get_canonical_head() == blocks[0].header
+    assert chain.get_vm().state.state_root == blocks[0].header.state_root
+
+
+def test_import_blocks_drops_the_batch_on_interrupt(chain, monkeypatch):
+    source_chain = api.build(chain, api.copy(), api.mine_blocks(3))
+    blocks = tuple(source_chain.get_canonical_block_by_number(number) for number in range(1, 4))
+    genesis_header = chain.get_canonical_head()
+
+    def read_blocks():
+        yield from blocks[:2]
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(chain, 'import_prefetch_depth', 0)
+    with pytest.raises(KeyboardInterrupt):
+        chain.import_blocks(read_blocks(), persist_every=10)
+
+    assert chain.get_canonical_head() == genesis_header
+    assert chain.header.parent_hash == genesis_header.hash
+
+
+def test_import_blocks_leaves_the_chain_database_in_place(chain, monkeypatch):
+    source_chain = api.build(chain, api.copy(), api.mine_blocks(3))
+    blocks = tuple(source_chain.get_canonical_block_by_number(number) for number in range(1, 4))
+    chaindb = chain.chaindb
+    consensus_context = chain.consensus_context
+
+    def read_blocks():
+        for block in blocks:
+            # other users of the chain keep reading the committed chain during the import
+            assert chain.chaindb is chaindb
+            assert chain.consensus_context is consensus_context
+            assert chain.get_canonical_head().block_number == 0
+            yield block
+
+    # read each block while the previous one is imported
+    monkeypatch.setattr(chain, 'import_prefetch_depth', 0)
+    import_results = chain.import_blocks(read_blocks(), persist_every=10)
+
+    assert chain.chaindb is chaindb
+    assert chain.get_canonical_head() == blocks[-1].header
+    assert tuple(result.imported_block for result in import_results) == blocks
+
+
+def test_import_blocks_requires_positive_batch_size(chain):
+    with pytest.raises(ValidationError):
+        chain.import_blocks((), persist_every=0)
+
+
+def test_import_blocks_reads_ahead_a_bounded_number_of_blocks(chain, monkeypatch):
+    source_chain = api.build(chain, api.copy(), api.mine_blocks(5))
+    blocks = tuple(source_chain.get_canonical_block_by_number(number) for number in range(1, 6))
+
+    read_block_numbers = []
+
+    def read_blocks():
+        for block in blocks:
+            read_block_numbers.append(block.number)
+            yield block
+
+    blocks_read_at_import = []
+    original_import_block = type(chain).import_block
+
+    def import_block(self, block, *args, **kwargs):
+        blocks_read_at_import.append(len(read_block_numbers))
+        return original_import_block(self, block, *args, **kwargs)
+
+    monkeypatch.setattr(chain, 'import_prefetch_depth', 2)
+    # the blocks are imported by another chain instance of the same class
+    monkeypatch.setattr(type(chain), 'import_block', import_block)
+    import_results = chain.import_blocks(read_blocks(), persist_every=2)
+
+    assert tuple(result.imported_block for result in import_results) == blocks
+    assert blocks_read_at_import == [3, 4, 5, 5, 5]
+
+
+def test_import_blocks_recovers_senders_in_worker_processes(funded_address,
+                                                            funded_address_private_key,
+                                                            monkeypatch):
+    chain = api.build(
+        MiningChain,
+        api.istanbul_at(0),
+        api.disable_pow_check(),
+        api.genesis(
+            params={'gas_limit': 1000000},
+            state={funded_address: {'balance': to_wei(1000, 'ether')}},
+        ),
+    )
+    source_chain = api.build(chain, api.copy())
+    for _ in range(3):
+        transaction = new_transaction(
+            source_chain.get_vm(),
+            from_=funded_address,
+            to=ZERO_ADDRESS,
+            private_key=funded_address_private_key,
+        )
+        source_chain.apply_transaction(transaction)
+        source_chain.mine_block()
+    # decode the blocks again, so that no sender is known yet
+    blocks = tuple(
+        rlp.decode(rlp.encode(block), sedes=type(block))
+        for block in map(source_chain.get_canonical_block_by_number, range(1, 4))
+    )
+
+    def get_sender(transaction):
+        raise AssertionError("The sender should have been recovered in a worker process")
+
+    worker_pool = WorkerPool(1)
+    monkeypatch.setattr(chain.consensus_context, 'worker_pool', worker_pool)
+    monkeypatch.setattr(type(blocks[0].transactions[0]), 'get_sender', get_sender)
+    with worker_pool:
+        import_results = chain.import_blocks(blocks)
+        assert worker_pool.is_running
+
+    assert tuple(result.imported_block for result in import_results) == blocks
+    assert all(
+        transaction.sender == funded_address
+        for block in blocks
+        for transaction in block.transactions
+    )
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from eth_utils import (
@@ -25,6 +27,10 @@ from eth.consensus.clique.constants import (
     VANITY_LENGTH,
     SIGNATURE_LENGTH,
 )
+from eth.consensus.clique import (
+    _utils,
+    snapshot_manager as snapshot_manager_module,
+)
 from eth.consensus.clique._utils import (
     get_block_signer,
     sign_block_header,
@@ -32,6 +38,7 @@ from eth.consensus.clique._utils import (
 from eth.constants import (
     ZERO_ADDRESS
 )
+from eth.db.atomic import AtomicDB
 from eth.rlp.headers import BlockHeader
 from eth.tools.factories.keys import PublicKeyFactory
 from eth.tools.factories.transaction import new_transaction
@@ -283,6 +290,82 @@ def test_reapplies_headers_without_snapshots(paragon_chain):
     assert snapshot.signers == {BOB, RON}
 
 
+def test_reapplies_headers_with_signers_recovered_together(paragon_chain, monkeypatch):
+    voting_chain = alice_nominates_bob_and_ron_then_they_kick_her()
+    for i in range(5):
+        paragon_chain.chaindb.persist_header(voting_chain[i])
+
+    monkeypatch.setattr(_utils, 'MIN_PARALLEL_SIGNER_RECOVERIES', 2)
+
+    clique = get_clique(paragon_chain)
+    snapshot_manager = clique._snapshot_manager
+    with ThreadPoolExecutor(2) as executor:
+        monkeypatch.setattr(snapshot_manager, '_worker_pool', executor)
+        snapshot = validate_seal_and_get_snapshot(clique, voting_chain[5])
+    assert snapshot.signers == {BOB, RON}
+    assert all(
+        header.hash in snapshot_manager._signers_by_header_hash for header in voting_chain[:6]
+    )
+
+
+def test_signers_are_cached_per_snapshot_manager(paragon_chain, monkeypatch):
+    recovered = []
+
+    def recording_get_block_signer(header):
+        recovered.append(header)
+        return get_block_signer(header)
+
+    monkeypatch.setattr(snapshot_manager_module, 'get_block_signer', recording_get_block_signer)
+    header = alice_nominates_bob_and_ron_then_they_kick_her()[0]
+
+    snapshot_manager = get_clique(paragon_chain)._snapshot_manager
+    assert snapshot_manager.get_block_signer(header) == ALICE
+    assert snapshot_manager.get_block_signer(header) == ALICE
+    assert recovered == [header]
+
+    # another chain on another database does not share the cache
+    other_chain = MiningChain.configure(
+        vm_configuration=CliqueApplier().amend_vm_configuration(((0, PetersburgVM),)),
+        consensus_context_class=CliqueConsensusContext,
+        chain_id=5,
+    ).from_genesis(AtomicDB(), PARAGON_GENESIS_PARAMS, PARAGON_GENESIS_STATE)
+    assert get_clique(other_chain)._snapshot_manager.get_block_signer(header) == ALICE
+    assert recovered == [header, header]
+
+
+def test_signer_cache_size(base_db):
+    class SmallCliqueConsensusContext(CliqueConsensusContext):
+        signer_cache_size = 2
+
+    context = SmallCliqueConsensusContext(base_db)
+    snapshot_manager = context.snapshot_manager
+    for header in alice_nominates_bob_and_ron_then_they_kick_her()[:4]:
+        snapshot_manager.get_block_signer(header)
+    assert len(snapshot_manager._signers_by_header_hash) == 2
+
+
+def test_snapshot_cache_size(base_db):
+    class SmallCliqueConsensusContext(CliqueConsensusContext):
+        snapshot_cache_size = 2
+
+    chain = MiningChain.configure(
+        vm_configuration=CliqueApplier().amend_vm_configuration(((0, PetersburgVM),)),
+        consensus_context_class=SmallCliqueConsensusContext,
+        chain_id=5,
+    ).from_genesis(base_db, PARAGON_GENESIS_PARAMS, PARAGON_GENESIS_STATE)
+
+    voting_chain = alice_nominates_bob_and_ron_then_they_kick_her()
+    chain.validate_chain_extension((PARAGON_GENESIS_HEADER,) + voting_chain)
+
+    snapshot_manager = get_clique(chain)._snapshot_manager
+    assert len(snapshot_manager._snapshots) == 2
+    assert snapshot_manager.get_or_create_snapshot(
+        voting_chain[-1].block_number,
+        voting_chain[-1].hash,
+        (PARAGON_GENESIS_HEADER,) + voting_chain,
+    ).signers == {BOB, RON}
+
+
 def test_can_persist_and_restore_snapshot_from_db(paragon_chain):
     clique = get_clique(paragon_chain)
     snapshot = validate_seal_and_get_snapshot(clique, PARAGON_GENESIS_HEADER)
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from eth_utils import (
@@ -5,6 +7,7 @@ from eth_utils import (
 )
 
 from eth_keys import keys
+from eth_keys.exceptions import BadSignature
 
 from eth_typing import Address
 
@@ -15,9 +18,11 @@ from eth.consensus.clique.constants import (
     VANITY_LENGTH,
     SIGNATURE_LENGTH,
 )
+from eth.consensus.clique import _utils
 from eth.consensus.clique._utils import (
     get_block_signer,
     get_signers_at_checkpoint,
+    recover_block_signers,
     sign_block_header,
 )
 from eth.rlp.headers import BlockHeader
@@ -152,3 +157,23 @@ def test_can_sign_header(header, signer, expected_signers):
 def test_get_allowed_signers():
     signers = get_signers_at_checkpoint(GOERLI_GENESIS_HEADER)
     assert signers == (GOERLI_GENESIS_ALLOWED_SIGNER,)
+
+
+@pytest.mark.parametrize('use_executor', (True, False))
+def test_recover_block_signers(monkeypatch, use_executor):
+    monkeypatch.setattr(_utils, 'MIN_PARALLEL_SIGNER_RECOVERIES', 2)
+    monkeypatch.setattr(_utils, 'SIGNER_RECOVERY_WORKERS', 2)
+
+    headers = (GOERLI_HEADER_ONE, UNSIGNED_HEADER, GOERLI_HEADER_TWO, GOERLI_HEADER_5288_VOTE_IN)
+    with ThreadPoolExecutor(2) as executor:
+        signers = recover_block_signers(headers, executor if use_executor else None)
+
+    # the error of an invalid signature is raised when the signer is needed
+    assert signers == (
+        GOERLI_GENESIS_ALLOWED_SIGNER,
+        None,
+        GOERLI_GENESIS_ALLOWED_SIGNER,
+        GOERLI_GENESIS_ALLOWED_SIGNER,
+    )
+    with pytest.raises(BadSignature):
+        get_block_signer(UNSIGNED_HEADER)
@@ -89,3 +89,23 @@ def test_stateful_consensus_isnt_shared_across_chain_instances():
     # And the second chain's whitelist should also not interfere with the first one's
     with pytest.raises(ValidationError, match="Block isn't on whitelist"):
         chain.mine_block(extra_data=b"2000-2001")
+
+
+def test_seals_are_validated_in_turn_by_default():
+
+    class ChainClass(MiningChain):
+        vm_configuration = (
+            (0, IstanbulVM.configure(consensus_class=WhitelistConsensus)),
+        )
+
+    chain = genesis(ChainClass)
+    headers = tuple(
+        chain.mine_block(extra_data=extra_data).header
+        for extra_data in (b"root-1000", b"1000-1001")
+    )
+
+    # Each seal puts the next one on the whitelist, so they must be validated in order
+    with pytest.raises(ValidationError, match="Block isn't on whitelist"):
+        genesis(ChainClass).get_vm().validate_seals(headers[::-1])
+
+    genesis(ChainClass).get_vm().validate_seals(headers)
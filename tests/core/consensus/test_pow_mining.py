@@ -1,15 +1,26 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 import random
 import threading
 import time
 
+from eth_utils import ValidationError
+
 from eth.chains.base import MiningChain
 from eth.chains.mainnet import MAINNET_VMS
+from eth.consensus import pow
 from eth.consensus.pow import (
     CACHE_MAX_ITEMS,
     EPOCH_LENGTH,
+    EthashCacheStore,
+    PowConsensus,
+    PowSeal,
     check_pow,
+    check_pow_seals,
     get_cache,
+    get_cache_info,
+    mine_pow_nonce,
 )
 from eth.tools.mining import POWMiningMixin
 from eth.tools.builder.chain import (
@@ -46,6 +57,45 @@ def test_cache_turnover():
     _concurrently_run_to_completion(lookup_random_caches, 3)
 
 
+def test_ethash_cache_store(tmp_path):
+    store = EthashCacheStore(tmp_path / 'ethash')
+    assert store.load(3) is None
+    assert not store.exists(3)
+
+    store.save(3, b'cache')
+    assert store.exists(3)
+    assert store.load(3)[:] == b'cache'
+
+
+def test_get_cache_with_store(tmp_path, monkeypatch):
+    store = EthashCacheStore(tmp_path)
+    monkeypatch.setattr(pow, 'mkcache_bytes', lambda block_number: b'cache-%d' % block_number)
+    monkeypatch.setattr(pow, 'cache_by_epoch', OrderedDict())
+    monkeypatch.setattr(pow, '_cache_store', store)
+
+    start_info = get_cache_info()
+    assert get_cache(1) == b'cache-0'
+    assert store.load(0)[:] == b'cache-0'
+
+    # a new process would find the cache on disk
+    pow.cache_by_epoch.clear()
+    assert get_cache(2)[:] == b'cache-0'
+    assert get_cache(3)[:] == b'cache-0'
+
+    info = get_cache_info()
+    assert info.generated - start_info.generated == 1
+    assert info.disk_hits - start_info.disk_hits == 1
+    assert info.memory_hits - start_info.memory_hits == 1
+    assert info.generation_seconds >= start_info.generation_seconds
+
+    # close to the end of the epoch, the next cache is generated in the background
+    get_cache(EPOCH_LENGTH - 1)
+    deadline = time.monotonic() + 10
+    while not store.exists(1) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.load(1)[:] == b'cache-%d' % EPOCH_LENGTH
+
+
 def test_pow_across_epochs(ropsten_epoch_headers):
 
     def check():
@@ -63,6 +113,77 @@ def test_pow_across_epochs(ropsten_epoch_headers):
     _concurrently_run_to_completion(check, CACHE_MAX_ITEMS + 5)
 
 
+def test_pow_consensus_validate_seals(ropsten_epoch_headers):
+    consensus = PowConsensus(None)
+    consensus.validate_seals(ropsten_epoch_headers)
+
+    bad_header = ropsten_epoch_headers[-1].copy(mix_hash=b'\0' * 32)
+    with pytest.raises(ValidationError):
+        consensus.validate_seals(ropsten_epoch_headers[:-1] + (bad_header,))
+
+
+def test_check_pow_seals_in_chunks_by_epoch(monkeypatch):
+    checked_chunks = []
+    executor = ThreadPoolExecutor(1)
+
+    def submit(fn, settings, chunk):
+        checked_chunks.append(tuple(seal.block_number for seal in chunk))
+        return ThreadPoolExecutor.submit(executor, fn, settings, chunk)
+
+    def fake_check_pow(block_number, mining_hash, mix_hash, nonce, difficulty):
+        if nonce == b'bad':
+            raise ValidationError(f"bad seal at {block_number}")
+
+    monkeypatch.setattr(executor, 'submit', submit)
+    monkeypatch.setattr(pow, 'check_pow', fake_check_pow)
+    monkeypatch.setattr(pow, 'POW_WORKERS', 2)
+
+    block_numbers = tuple(range(EPOCH_LENGTH - 5, EPOCH_LENGTH + 3))
+    seals = tuple(PowSeal(number, b'', b'', b'', 1) for number in block_numbers)
+    check_pow_seals(seals)
+    # without an executor, the seals are checked in this process
+    assert checked_chunks == []
+
+    check_pow_seals(seals, executor)
+    assert tuple(checked_chunks) == (
+        block_numbers[:3],
+        block_numbers[3:5],
+        block_numbers[5:7],
+        block_numbers[7:],
+    )
+
+    bad_seals = list(seals)
+    for index in (6, 1):
+        bad_seals[index] = seals[index]._replace(nonce=b'bad')
+    with pytest.raises(ValidationError, match=f"bad seal at {block_numbers[1]}"):
+        check_pow_seals(bad_seals, executor)
+
+
+def test_mine_pow_nonce_in_workers(monkeypatch):
+    winning_nonces = {300, 700}
+
+    def fake_hashimoto(block_number, mining_hash, nonce):
+        if nonce in winning_nonces:
+            result = b'\0' * 32
+        else:
+            result = b'\xff' * 32
+        return {b'mix digest': nonce.to_bytes(32, 'big'), b'result': result}
+
+    monkeypatch.setattr(pow, '_hashimoto', fake_hashimoto)
+    monkeypatch.setattr(pow, 'NONCE_SEARCH_CHUNK_SIZE', 64)
+
+    with ThreadPoolExecutor(3) as executor:
+        for num_workers in (1, 3):
+            nonce, mix_hash = mine_pow_nonce(0, b'', 2, num_workers=num_workers, executor=executor)
+            assert nonce == (300).to_bytes(8, 'big')
+            assert mix_hash == (300).to_bytes(32, 'big')
+
+            with pytest.raises(Exception, match="Too many attempts"):
+                mine_pow_nonce(
+                    0, b'', 2, max_attempts=300, num_workers=num_workers, executor=executor,
+                )
+
+
 @pytest.mark.parametrize(
     'base_vm_class',
     MAINNET_VMS,
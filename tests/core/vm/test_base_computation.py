@@ -110,6 +110,38 @@ def test_prepare_child_message(computation, child_message):
     assert computation.msg.storage_address == child_message.sender
 
 
+def test_finished_children_release_their_frame(computation):
+    parent_memory = bytearray(b'\x01\x02')
+    child_message = computation.prepare_child_message(
+        gas=100,
+        to=CANONICAL_ADDRESS_B,
+        value=0,
+        data=memoryview(parent_memory),
+        code=b'\x00',
+    )
+    child_computation = computation.apply_child_computation(child_message)
+
+    assert child_computation._memory is None
+    assert child_computation._stack is None
+    assert child_computation.code is None
+    assert child_computation.msg.data == b'\x01\x02'
+    assert not isinstance(child_computation.msg.data, memoryview)
+    assert child_computation.get_gas_remaining() == 100
+
+
+def test_keep_child_frames(message, transaction_context, child_message):
+    computation = DummyComputation.configure(keep_child_frames=True)(
+        state=None,
+        message=message,
+        transaction_context=transaction_context,
+    )
+    child_computation = computation.apply_child_computation(child_message)
+
+    assert child_computation._memory is not None
+    assert child_computation._stack is not None
+    assert child_computation.code is not None
+
+
 def test_extend_memory_start_position_must_be_uint256(computation):
     with pytest.raises(ValidationError):
         computation.extend_memory("1", 1)
@@ -81,3 +81,47 @@ def child_computation(computation, child_message):
 def test_generate_child_computation(computation, child_computation):
     assert computation.transaction_context.gas_price == child_computation.transaction_context.gas_price  # noqa: E501
     assert computation.transaction_context.origin == child_computation.transaction_context.origin  # noqa: E501
+
+
+@pytest.mark.parametrize(
+    'code, is_created',
+    (
+        (b'', True),
+        # A failed call leaves no account behind
+        (b'\xfe', False),
+    ),
+)
+def test_apply_static_message_to_missing_account(state, transaction_context, code, is_created):
+    message = Message(
+        to=CANONICAL_ADDRESS_B,
+        sender=CANONICAL_ADDRESS_A,
+        value=0,
+        data=b'',
+        code=code,
+        gas=100,
+        is_static=True,
+    )
+    assert not state.account_exists(CANONICAL_ADDRESS_B)
+
+    FrontierComputation.apply_message(state, message, transaction_context)
+
+    assert state.account_exists(CANONICAL_ADDRESS_B) is is_created
+
+
+def test_apply_static_message_records_no_checkpoint(state, transaction_context):
+    message = Message(
+        to=CANONICAL_ADDRESS_A,
+        sender=CANONICAL_ADDRESS_B,
+        value=0,
+        data=b'',
+        # BALANCE of the account itself
+        code=b'\x30\x31',
+        gas=100,
+        is_static=True,
+    )
+    _, checkpoint = state.snapshot()
+
+    computation = FrontierComputation.apply_message(state, message, transaction_context)
+
+    assert computation.is_success
+    assert not state._account_db._journaldb.has_checkpoint(checkpoint)
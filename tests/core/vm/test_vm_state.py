@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from eth_utils import ValidationError
@@ -180,3 +182,76 @@ def test_lock_state(state):
 
     state.lock_changes()
     assert state.get_storage(ADDRESS, 1, from_journal=False) == 2
+
+
+def test_fork_state(state):
+    state.set_balance(ADDRESS, 10)
+    state.persist()
+
+    forked_state = state.fork()
+    assert type(forked_state) is type(state)
+    assert forked_state.execution_context is state.execution_context
+    assert forked_state.get_balance(ADDRESS) == 10
+
+    forked_state.set_balance(ADDRESS, 20)
+    assert state.get_balance(ADDRESS) == 10
+
+
+def test_fork_state_with_pending_changes(state):
+    state.set_balance(ADDRESS, 10)
+    with pytest.raises(ValidationError):
+        state.fork()
+
+
+def test_simulate_transactions_on_forks_in_threads(
+        chain_without_block_validation,
+        funded_address,
+        funded_address_private_key):
+    vm = chain_without_block_validation.get_vm()
+    tx = new_transaction(vm, funded_address, ADDRESS, 1, funded_address_private_key)
+    state = vm.state
+
+    def simulate(_):
+        forked_state = state.fork()
+        forked_state.apply_transaction(tx)
+        return forked_state.get_balance(ADDRESS), forked_state.make_state_root()
+
+    with ThreadPoolExecutor(4) as executor:
+        results = set(executor.map(simulate, range(16)))
+
+    assert len(results) == 1
+    balance, _ = results.pop()
+    assert balance == 1
+    assert state.get_balance(ADDRESS) == 0
+
+
+def test_ephemeral_fork_executes_like_a_fork(
+        chain_without_block_validation,
+        funded_address,
+        funded_address_private_key):
+    vm = chain_without_block_validation.get_vm()
+    tx = new_transaction(vm, funded_address, ADDRESS, 1, funded_address_private_key)
+
+    forked_state = vm.state.fork()
+    ephemeral_state = vm.state.fork(ephemeral=True)
+    computation = forked_state.apply_transaction(tx)
+    ephemeral_computation = ephemeral_state.apply_transaction(tx)
+
+    assert ephemeral_computation.get_gas_used() == computation.get_gas_used()
+    assert ephemeral_state.get_balance(ADDRESS) == 1
+    assert ephemeral_state.get_balance(funded_address) == forked_state.get_balance(funded_address)
+    assert ephemeral_state.make_state_root() == forked_state.make_state_root()
+    assert vm.state.get_balance(ADDRESS) == 0
+
+    with pytest.raises(ValidationError):
+        ephemeral_state.persist()
+
+
+def test_state_in_temp_block_ephemeral(chain_without_block_validation):
+    vm = chain_without_block_validation.get_vm()
+    with vm.state_in_temp_block(ephemeral=True) as state:
+        assert state.block_number == vm.get_header().block_number + 1
+        state.set_balance(ADDRESS, 10)
+        assert state.get_balance(ADDRESS) == 10
+
+    assert vm.state.get_balance(ADDRESS) == 0
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from eth._utils.workers import WorkerPool
+from eth.chains.base import MiningChain
+from eth.tools.builder.chain import (
+    build,
+    frontier_at,
+    genesis,
+)
+
+
+def test_worker_pool_starts_on_first_use():
+    worker_pool = WorkerPool(1)
+    assert not worker_pool.is_running
+
+    with worker_pool:
+        worker_pid = worker_pool.submit(os.getpid).result()
+        assert worker_pid != os.getpid()
+        assert worker_pool.is_running
+
+    assert not worker_pool.is_running
+    with pytest.raises(RuntimeError, match="shut down"):
+        worker_pool.submit(os.getpid)
+
+
+def test_unused_worker_pool_shuts_down():
+    worker_pool = WorkerPool(1)
+    worker_pool.shutdown()
+    assert not worker_pool.is_running
+    with pytest.raises(RuntimeError, match="shut down"):
+        worker_pool.submit(os.getpid)
+
+
+def test_chain_close_stops_consensus_workers():
+    chain = build(MiningChain, frontier_at(0), genesis())
+    worker_pool = chain.consensus_context.worker_pool
+    worker_pool.submit(os.getpid).result()
+    assert worker_pool.is_running
+
+    chain.close()
+    assert not worker_pool.is_running
@@ -0,0 +1,131 @@
+import pytest
+
+import rlp
+
+from eth.db.account import AccountDB
+from eth.db.account_cache import (
+    ACCOUNT_ENTRY_OVERHEAD,
+    AccountCache,
+    account_caches,
+)
+from eth.db.atomic import AtomicDB
+from eth.rlp.accounts import Account
+from eth.vm.interrupt import MissingAccountTrieNode
+
+
+ADDRESS = b'\xaa' * 20
+OTHER_ADDRESS = b'\xbb' * 20
+
+PARENT_ROOT = b'\x01' * 32
+CHILD_ROOT = b'\x02' * 32
+
+
+@pytest.fixture(autouse=True)
+def clear_account_caches():
+    account_caches.clear()
+    yield
+    account_caches.clear()
+
+
+def _encode(balance):
+    return rlp.encode(Account(balance=balance), sedes=Account)
+
+
+def test_account_cache_advances_along_persisted_blocks():
+    cache = AccountCache(max_size=10000)
+    cache.state_root = PARENT_ROOT
+    cache.set_encoded(PARENT_ROOT, ADDRESS, _encode(1))
+    cache.set_encoded(PARENT_ROOT, OTHER_ADDRESS, _encode(2))
+
+    cache.advance(PARENT_ROOT, CHILD_ROOT, {ADDRESS: _encode(3)})
+
+    assert cache.state_root == CHILD_ROOT
+    assert cache.get_encoded(CHILD_ROOT, ADDRESS) == _encode(3)
+    # accounts that the block didn't change stay cached
+    assert cache.get_encoded(CHILD_ROOT, OTHER_ADDRESS) == _encode(2)
+
+
+@pytest.mark.parametrize('cached_root, changed_accounts', (
+    (b'\x03' * 32, {ADDRESS: _encode(3)}),
+    (PARENT_ROOT, None),
+))
+def test_account_cache_starts_over_on_another_lineage(cached_root, changed_accounts):
+    cache = AccountCache(max_size=10000)
+    cache.state_root = cached_root
+    cache.set_encoded(cached_root, OTHER_ADDRESS, _encode(2))
+
+    cache.advance(PARENT_ROOT, CHILD_ROOT, changed_accounts)
+
+    assert cache.state_root == CHILD_ROOT
+    with pytest.raises(KeyError):
+        cache.get_encoded(CHILD_ROOT, OTHER_ADDRESS)
+    assert len(cache) == (0 if changed_accounts is None else 1)
+
+
+def test_account_cache_is_bounded_by_size():
+    encoded_account = _encode(1)
+    entry_size = len(encoded_account) + ACCOUNT_ENTRY_OVERHEAD
+    cache = AccountCache(max_size=entry_size * 2)
+    cache.state_root = PARENT_ROOT
+
+    cache.set_encoded(PARENT_ROOT, ADDRESS, encoded_account)
+    cache.set_encoded(PARENT_ROOT, OTHER_ADDRESS, encoded_account)
+    cache.get_encoded(PARENT_ROOT, ADDRESS)
+    cache.set_encoded(PARENT_ROOT, b'\xcc' * 20, encoded_account)
+
+    assert cache.size == entry_size * 2
+    assert cache.get_encoded(PARENT_ROOT, ADDRESS) == encoded_account
+    with pytest.raises(KeyError):
+        cache.get_encoded(PARENT_ROOT, OTHER_ADDRESS)
+
+
+def test_account_cache_ignores_other_state_roots():
+    cache = AccountCache(max_size=10000)
+    cache.state_root = CHILD_ROOT
+
+    cache.set_encoded(PARENT_ROOT, ADDRESS, _encode(1))
+    assert len(cache) == 0
+
+    cache.set_encoded(CHILD_ROOT, ADDRESS, _encode(2))
+    with pytest.raises(KeyError):
+        cache.get_encoded(PARENT_ROOT, ADDRESS)
+    assert cache.get_encoded(CHILD_ROOT, ADDRESS) == _encode(2)
+
+
+def test_account_cache_reuses_decoded_accounts():
+    cache = AccountCache(max_size=10000)
+    cache.state_root = PARENT_ROOT
+    cache.set_encoded(PARENT_ROOT, ADDRESS, _encode(1))
+
+    account = cache.decode(ADDRESS, _encode(1))
+    assert account == Account(balance=1)
+    assert cache.decode(ADDRESS, _encode(1)) is account
+
+    # a different encoding is decoded on its own
+    assert cache.decode(ADDRESS, _encode(2)) == Account(balance=2)
+
+
+def test_account_db_reads_accounts_of_the_previous_block_from_the_cache():
+    base_db = AtomicDB()
+    account_db = AccountDB(base_db, track_witness=False)
+    account_db.set_balance(ADDRESS, 10)
+    account_db.persist()
+    account_cache = account_caches[base_db]
+    assert account_cache.state_root == account_db.state_root
+
+    # the next block finds the account without walking the trie
+    next_account_db = AccountDB(base_db, account_db.state_root, track_witness=False)
+    assert next_account_db.get_balance(ADDRESS) == 10
+    assert account_cache.hits == 1
+
+
+@pytest.mark.parametrize('track_witness', (True, False))
+def test_account_cache_is_kept_per_database(track_witness):
+    account_db = AccountDB(AtomicDB(), track_witness=False)
+    account_db.set_balance(ADDRESS, 10)
+    account_db.persist()
+
+    # another database at the same state root doesn't have the trie nodes
+    other_account_db = AccountDB(AtomicDB(), account_db.state_root, track_witness=track_witness)
+    with pytest.raises(MissingAccountTrieNode):
+        other_account_db.get_balance(ADDRESS)
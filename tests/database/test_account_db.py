@@ -11,6 +11,8 @@ from eth.db.backends.memory import MemoryDB
 from eth.db.account import (
     AccountDB,
 )
+from eth.db.schema import SchemaV1
+from eth.vm.interrupt import MissingBytecode
 
 from eth.constants import (
     EMPTY_SHA3,
@@ -94,6 +96,84 @@ def test_code(state):
         state.set_code(ADDRESS, 'code')
 
 
+@pytest.mark.parametrize('track_witness', (True, False))
+def test_code_size_is_indexed(base_db, track_witness):
+    account_db = AccountDB(base_db)
+    assert account_db.get_code_size(ADDRESS) == 0
+
+    account_db.set_code(ADDRESS, b'code')
+    assert account_db.get_code_size(ADDRESS) == 4
+    account_db.persist()
+
+    size_key = SchemaV1.make_code_hash_to_size_lookup_key(keccak(b'code'))
+    assert size_key in base_db
+
+    # the size is read without loading the code
+    del base_db[keccak(b'code')]
+    fresh_account_db = AccountDB(base_db, account_db.state_root, track_witness=track_witness)
+    assert fresh_account_db.get_code_size(ADDRESS) == 4
+
+    with pytest.raises(ValidationError):
+        fresh_account_db.get_code_size(INVALID_ADDRESS)
+
+
+@pytest.mark.parametrize('track_witness', (True, False))
+def test_code_size_of_unindexed_code(base_db, track_witness):
+    code = b'unindexed code'
+    account_db = AccountDB(base_db)
+    account_db.set_code(ADDRESS, code)
+    account_db.persist()
+
+    # like code that was synced from a peer
+    size_key = SchemaV1.make_code_hash_to_size_lookup_key(keccak(code))
+    del base_db[size_key]
+
+    fresh_account_db = AccountDB(base_db, account_db.state_root, track_witness=track_witness)
+    assert fresh_account_db.get_code_size(ADDRESS) == len(code)
+    assert base_db[size_key] == bytes([len(code)])
+
+    # indexing the size is not a change, so the database can still be forked
+    assert fresh_account_db.fork().get_code_size(ADDRESS) == len(code)
+
+
+@pytest.mark.parametrize('is_indexed', (True, False))
+def test_code_size_in_witness(base_db, is_indexed):
+    code = b'witnessed code'
+    account_db = AccountDB(base_db)
+    account_db.set_code(ADDRESS, code)
+    account_db.persist()
+    if not is_indexed:
+        del base_db[SchemaV1.make_code_hash_to_size_lookup_key(keccak(code))]
+
+    fresh_account_db = AccountDB(base_db, account_db.state_root)
+    assert fresh_account_db.get_code_size(ADDRESS) == len(code)
+    meta_witness = fresh_account_db.persist()
+
+    assert ADDRESS in meta_witness.account_bytecodes_queried
+    assert keccak(code) in meta_witness.hashes
+    assert all(len(node_hash) == 32 for node_hash in meta_witness.hashes)
+
+
+@pytest.mark.parametrize('track_witness', (True, False))
+def test_code_read_from_another_database_is_missing(base_db, track_witness):
+    code = b'missing code'
+    account_db = AccountDB(base_db)
+    account_db.set_code(ADDRESS, code)
+    account_db.persist()
+    reading_db = AccountDB(base_db, account_db.state_root, track_witness=track_witness)
+    assert reading_db.get_code(ADDRESS) == code
+    assert reading_db.get_code_size(ADDRESS) == len(code)
+
+    other_db = AtomicDB(MemoryDB(dict(base_db.wrapped_db.kv_store)))
+    del other_db[keccak(code)]
+    del other_db[SchemaV1.make_code_hash_to_size_lookup_key(keccak(code))]
+    other_account_db = AccountDB(other_db, account_db.state_root, track_witness=track_witness)
+    with pytest.raises(MissingBytecode):
+        other_account_db.get_code(ADDRESS)
+    with pytest.raises(MissingBytecode):
+        other_account_db.get_code_size(ADDRESS)
+
+
 @pytest.mark.parametrize("state", [
     AccountDB(MemoryDB()),
 ])
@@ -140,6 +220,79 @@ def test_storage_deletion(account_db):
     assert account_db.get_storage(OTHER_ADDRESS, 1) == 321
 
 
+def test_original_storage_is_read_once_per_transaction(account_db, monkeypatch):
+    account_db.set_storage(ADDRESS, 0, 1)
+    account_db.lock_changes()
+
+    storage_db = account_db._get_address_store(ADDRESS)
+    lookups = []
+    original_get_from = storage_db._get_from
+
+    def counting_get_from(lookup_db, slot):
+        lookups.append(slot)
+        return original_get_from(lookup_db, slot)
+
+    monkeypatch.setattr(storage_db, '_get_from', counting_get_from)
+
+    for value in range(2, 5):
+        assert account_db.get_storage(ADDRESS, 0, from_journal=False) == 1
+        account_db.set_storage(ADDRESS, 0, value)
+    assert lookups == [0]
+
+    # a revert leaves the values from the start of the transaction in place
+    checkpoint = account_db.record()
+    account_db.set_storage(ADDRESS, 0, 5)
+    account_db.discard(checkpoint)
+    assert account_db.get_storage(ADDRESS, 0, from_journal=False) == 1
+    assert lookups == [0]
+
+    # the next transaction starts from the locked-in value
+    account_db.lock_changes()
+    assert account_db.get_storage(ADDRESS, 0, from_journal=False) == 4
+    assert lookups == [0, 0]
+
+
+def test_original_storage_after_reverting_a_deletion(account_db):
+    account_db.set_storage(ADDRESS, 0, 1)
+    account_db.lock_changes()
+
+    checkpoint = account_db.record()
+    account_db.delete_storage(ADDRESS)
+    assert account_db.get_storage(ADDRESS, 0, from_journal=False) == 1
+    account_db.discard(checkpoint)
+
+    assert account_db.get_storage(ADDRESS, 0, from_journal=False) == 1
+    assert account_db.get_storage(ADDRESS, 0) == 1
+
+
+def test_checkpoints_are_recorded_on_the_first_write(account_db):
+    account_db.set_balance(ADDRESS, 10)
+    account_db.set_storage(ADDRESS, 1, 100)
+
+    outer = account_db.record()
+    inner = account_db.record()
+    assert account_db.get_balance(ADDRESS) == 10
+    assert not account_db._journaldb.has_checkpoint(outer)
+    account_db.commit(inner)
+
+    inner = account_db.record()
+    account_db.set_balance(ADDRESS, 11)
+    account_db.set_storage(ADDRESS, 1, 101)
+    assert account_db._journaldb.has_checkpoint(outer)
+    assert account_db._journaldb.has_checkpoint(inner)
+
+    account_db.discard(inner)
+    assert account_db.get_balance(ADDRESS) == 10
+    assert account_db.get_storage(ADDRESS, 1) == 100
+
+    account_db.set_nonce(ADDRESS, 1)
+    account_db.discard(outer)
+    assert account_db.get_nonce(ADDRESS) == 0
+
+    with pytest.raises(ValidationError):
+        account_db.discard(outer)
+
+
 def test_account_db_storage_root(account_db):
     """
     Make sure that pruning doesn't screw up addresses that temporarily share storage roots
@@ -243,6 +396,66 @@ def test_has_changes_even_if_storage_root_returns_to_old_value(account_db):
     assert repeated_storage_root == original_storage_root
 
 
+def test_fork_is_independent(account_db):
+    account_db.set_balance(ADDRESS, 10)
+    account_db.set_storage(ADDRESS, 1, 2)
+    account_db.persist()
+
+    fork = account_db.fork()
+    assert fork.get_balance(ADDRESS) == 10
+    assert fork.get_storage(ADDRESS, 1) == 2
+
+    fork.set_balance(ADDRESS, 20)
+    fork.set_storage(ADDRESS, 1, 3)
+    account_db.set_balance(OTHER_ADDRESS, 30)
+
+    assert account_db.get_balance(ADDRESS) == 10
+    assert account_db.get_storage(ADDRESS, 1) == 2
+    assert fork.get_balance(OTHER_ADDRESS) == 0
+
+    # a fork can compute its own state root
+    assert fork.make_state_root() != account_db.make_state_root()
+
+
+def test_fork_of_subclass_with_other_signature(base_db):
+    class LabeledAccountDB(AccountDB):
+        def __init__(self, label, db, state_root):
+            super().__init__(db, state_root, track_witness=False)
+            self.label = label
+
+        @classmethod
+        def create_fork(cls, db, state_root):
+            return cls('fork', db, state_root)
+
+    account_db = LabeledAccountDB('original', base_db, AccountDB(base_db).state_root)
+    account_db.set_balance(ADDRESS, 10)
+    account_db.persist()
+
+    fork = account_db.fork()
+    assert isinstance(fork, LabeledAccountDB)
+    assert fork.label == 'fork'
+    assert fork.get_balance(ADDRESS) == 10
+
+
+@pytest.mark.parametrize('make_state_root', (True, False))
+@pytest.mark.parametrize('make_pending_change', (
+    lambda account_db: account_db.set_balance(ADDRESS, 10),
+    lambda account_db: account_db.set_storage(ADDRESS, 1, 2),
+    lambda account_db: account_db.set_code(ADDRESS, b'code'),
+))
+def test_fork_requires_persisted_changes(account_db, make_pending_change, make_state_root):
+    make_pending_change(account_db)
+    if make_state_root:
+        account_db.make_state_root()
+
+    with pytest.raises(ValidationError, match="persisted"):
+        account_db.fork()
+
+    account_db.make_state_root()
+    account_db.persist()
+    account_db.fork()
+
+
 def test_meta_witness_basic_stats(account_db):
     account_db.get_balance(ADDRESS)
     account_db.get_code(ADDRESS)
@@ -276,6 +489,21 @@ def test_meta_witness_basic_stats(account_db):
     assert meta_witness.get_slots_queried(THIRD_ADDRESS) == frozenset()
 
 
+def test_code_is_read_from_the_database_when_tracking_the_witness(base_db):
+    code = b'witnessed code'
+    account_db = AccountDB(base_db)
+    account_db.set_code(ADDRESS, code)
+    account_db.persist()
+
+    untracked_account_db = AccountDB(base_db, account_db.state_root, track_witness=False)
+    assert untracked_account_db.get_code(ADDRESS) == code
+
+    # the code cached by the untracked reader doesn't hide missing code from the witness
+    del base_db[keccak(code)]
+    with pytest.raises(MissingBytecode):
+        AccountDB(base_db, account_db.state_root).get_code(ADDRESS)
+
+
 def test_meta_witness_reset_stats_empty(account_db):
     # Do a variety of accesses that should not show up in the second
     #   persist() result.
@@ -325,3 +553,27 @@ def test_meta_witness_reset_stats_refilled(account_db):
     #   the code for this account must be listed in the witness
     assert THIRD_ADDRESS in meta_witness.account_bytecodes_queried
     assert meta_witness.get_slots_queried(THIRD_ADDRESS) == frozenset()
+
+
+def test_meta_witness_untracked_is_empty(base_db):
+    tracked_db = AccountDB(AtomicDB())
+    untracked_db = AccountDB(base_db, track_witness=False)
+    for account_db in (tracked_db, untracked_db):
+        account_db.set_storage(OTHER_ADDRESS, 1, 321)
+        account_db.set_code(ADDRESS, b'fake')
+        account_db.persist()
+
+    untracked_db = AccountDB(base_db, untracked_db.state_root, track_witness=False)
+    assert untracked_db.get_storage(OTHER_ADDRESS, 1) == 321
+    assert untracked_db.get_code(ADDRESS) == b'fake'
+    untracked_db.set_balance(ADDRESS, 10)
+
+    meta_witness = untracked_db.persist()
+
+    assert len(meta_witness.hashes) == 0
+    assert len(meta_witness.accounts_queried) == 0
+    assert len(meta_witness.account_bytecodes_queried) == 0
+
+    tracked_db.set_balance(ADDRESS, 10)
+    tracked_db.persist()
+    assert untracked_db.state_root == tracked_db.state_root
@@ -2,17 +2,25 @@ import pytest
 
 from eth.db.atomic import AtomicDB
 from eth.db.backends.level import LevelDB
+from eth.db.backends.segment import SegmentLogDB
+from eth.db.metrics import MetricsAtomicDB
 
 from eth.tools.db.base import DatabaseAPITestSuite
 from eth.tools.db.atomic import AtomicDatabaseBatchAPITestSuite
 
 
-@pytest.fixture(params=['atomic', 'level'])
+@pytest.fixture(params=['atomic', 'level', 'segment', 'metrics'])
 def atomic_db(request, tmpdir):
     if request.param == 'atomic':
-        return AtomicDB()
+        yield AtomicDB()
     elif request.param == 'level':
-        return LevelDB(db_path=tmpdir.mkdir("level_db_path"))
+        yield LevelDB(db_path=tmpdir.mkdir("level_db_path"))
+    elif request.param == 'segment':
+        segment_db = SegmentLogDB(db_path=tmpdir.mkdir("segment_db_path"))
+        yield segment_db
+        segment_db.close()
+    elif request.param == 'metrics':
+        yield MetricsAtomicDB(AtomicDB())
     else:
         raise ValueError(f"Unexpected database type: {request.param}")
 
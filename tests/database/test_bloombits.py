@@ -0,0 +1,109 @@
+import pytest
+
+from eth_bloom import BloomFilter
+
+from eth.db.bloombits import (
+    bloom_matches,
+    decode_bloom_bits,
+    encode_bloom_bits,
+    get_bloom_bit_indices,
+    get_section_bounds,
+    iter_vector_offsets,
+    log_matches,
+    make_bloom_criteria,
+    match_section,
+    rotate_blooms,
+)
+from eth.rlp.logs import Log
+
+
+A_ADDRESS = b"\xaa" * 20
+B_ADDRESS = b"\xbb" * 20
+
+
+def make_bloom(*logs):
+    bloom = BloomFilter()
+    for log in logs:
+        for value in log.bloomables:
+            bloom.add(value)
+    return int(bloom)
+
+
+def test_get_section_bounds():
+    assert get_section_bounds(0, 4) == (0, 3)
+    assert get_section_bounds(3, 4) == (12, 15)
+
+
+def test_get_bloom_bit_indices():
+    bloom = make_bloom(Log(A_ADDRESS, [], b''))
+    indices = get_bloom_bit_indices(A_ADDRESS)
+    assert sum(1 << index for index in indices) == bloom
+
+
+@pytest.mark.parametrize('vector', (0, 1, 0b1010, 2 ** 4095))
+def test_bloom_bits_encoding_round_trip(vector):
+    assert decode_bloom_bits(encode_bloom_bits(vector)) == vector
+
+
+def test_encode_empty_bloom_bits():
+    assert encode_bloom_bits(0) == b''
+
+
+def test_rotate_blooms():
+    vectors = rotate_blooms((0b101, 0, 0b100))
+    assert len(vectors) == 2048
+    assert vectors[0] == 0b001
+    assert vectors[2] == 0b101
+    assert not any(vectors[3:])
+    assert tuple(iter_vector_offsets(vectors[2])) == (0, 2)
+
+
+@pytest.mark.parametrize(
+    'addresses, topics',
+    (
+        ((), ()),
+        ((A_ADDRESS,), ()),
+        ((B_ADDRESS,), ()),
+        ((A_ADDRESS, B_ADDRESS), ()),
+        ((), ([1],)),
+        ((), (None, [2])),
+        ((), ([1, 3], [2])),
+        ((A_ADDRESS,), ([3],)),
+    ),
+)
+def test_match_section_agrees_with_blooms(addresses, topics):
+    logs = (
+        Log(A_ADDRESS, [1, 2], b''),
+        Log(B_ADDRESS, [3], b''),
+        Log(A_ADDRESS, [], b''),
+    )
+    blooms = tuple(make_bloom(log) for log in logs) + (0,)
+    vectors = rotate_blooms(blooms)
+    criteria = make_bloom_criteria(addresses, topics)
+
+    candidates = match_section(criteria, vectors.__getitem__, len(blooms))
+
+    assert tuple(iter_vector_offsets(candidates)) == tuple(
+        offset for offset, bloom in enumerate(blooms) if bloom_matches(bloom, criteria)
+    )
+    # blooms have no false negatives
+    for offset, log in enumerate(logs):
+        if log_matches(log, addresses, topics):
+            assert candidates & (1 << offset)
+
+
+@pytest.mark.parametrize(
+    'addresses, topics, expected',
+    (
+        ((), (), True),
+        ((A_ADDRESS,), (), True),
+        ((B_ADDRESS,), (), False),
+        ((), ([1, 5],), True),
+        ((), (None, [2]), True),
+        ((), ([], [3]), False),
+        ((), (None, None, [1]), False),
+    ),
+)
+def test_log_matches(addresses, topics, expected):
+    log = Log(A_ADDRESS, [1, 2], b'')
+    assert log_matches(log, addresses, topics) is expected
@@ -0,0 +1,143 @@
+import gc
+
+from eth_hash.auto import keccak
+
+from eth._utils.db import CachesByDatabase
+from eth.db.account import AccountDB
+from eth.db.atomic import AtomicDB
+from eth.db.code_cache import (
+    ANALYSIS_POSITION_SIZE,
+    CodeCache,
+    JumpdestAnalysisCache,
+    code_caches,
+)
+from eth.vm.code_stream import CodeStream
+
+
+ADDRESS = b'\xaa' * 20
+
+
+def test_code_cache_evicts_least_recently_used_code_by_size():
+    cache = CodeCache(max_size=10)
+    codes = (b'\x01' * 4, b'\x02' * 4, b'\x03' * 4)
+
+    cache.set(keccak(codes[0]), codes[0])
+    cache.set(keccak(codes[1]), codes[1])
+    assert cache.size == 8
+
+    # touch the first code, so the second one is the least recently used
+    assert cache.get(keccak(codes[0])) == codes[0]
+    cache.set(keccak(codes[2]), codes[2])
+
+    assert cache.size == 8
+    assert keccak(codes[0]) in cache
+    assert keccak(codes[1]) not in cache
+    assert keccak(codes[2]) in cache
+
+    # code larger than the whole cache is not kept
+    cache.set(keccak(b'\x04' * 11), b'\x04' * 11)
+    assert len(cache) == 2
+
+
+def test_code_cache_hit_rate():
+    cache = CodeCache(max_size=100)
+    assert cache.hit_rate == 0
+
+    code = b'\x60\x00'
+    assert cache.get(keccak(code)) is None
+    cache.set(keccak(code), code)
+    assert cache.get(keccak(code)) == code
+    assert cache.get(keccak(code)) == code
+
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.hit_rate == 2 / 3
+
+
+def test_code_cache_knows_the_size_of_cached_code():
+    cache = CodeCache(max_size=100)
+    code = b'\x60\x00'
+    assert cache.get_size(keccak(code)) is None
+
+    cache.set(keccak(code), code)
+    assert cache.get_size(keccak(code)) == 2
+
+    cache.set_size(keccak(b'other code'), 10)
+    assert cache.get_size(keccak(b'other code')) == 10
+
+
+def test_jumpdest_analysis_cache_shares_analysis_of_the_same_code():
+    cache = JumpdestAnalysisCache(max_size=1000)
+    code = b'\x60\x5b\x5b'
+
+    valid_positions, invalid_positions = cache.get(code)
+    valid_positions.add(2)
+    invalid_positions.add(1)
+    assert cache.get(code) == ({2}, {1})
+    assert cache.get(b'\x00\x00') == (set(), set())
+
+
+def test_jumpdest_analysis_cache_counts_the_positions():
+    code = b'\x60\x5b\x5b'
+    cache = JumpdestAnalysisCache(max_size=len(code) + 2 * ANALYSIS_POSITION_SIZE)
+
+    valid_positions, invalid_positions = cache.get(code)
+    assert cache.size == len(code)
+    valid_positions.add(2)
+    invalid_positions.add(1)
+    # the size is measured again on the next lookup
+    assert cache.get(code) == ({2}, {1})
+    assert cache.size == len(code) + 2 * ANALYSIS_POSITION_SIZE
+
+    # the analysis of other code doesn't fit next to it anymore
+    assert cache.get(b'\x00') == (set(), set())
+    assert len(cache) == 1
+    assert cache.get(code) == (set(), set())
+
+
+def test_code_streams_of_the_same_code_share_analysis(monkeypatch):
+    cache = JumpdestAnalysisCache(max_size=1000)
+    monkeypatch.setattr('eth.vm.code_stream.jumpdest_analysis_cache', cache)
+    code = b'\x60\x5b\x5b'
+
+    first_stream = CodeStream(code)
+    assert not first_stream.is_valid_opcode(1)
+    assert first_stream.is_valid_opcode(2)
+
+    second_stream = CodeStream(code)
+    assert second_stream.invalid_positions == {1}
+    assert second_stream.valid_positions == {0, 2}
+
+
+def test_code_cache_is_shared_by_the_account_dbs_of_a_database():
+    base_db = AtomicDB()
+    account_db = AccountDB(base_db)
+    account_db.set_code(ADDRESS, b'code')
+    # pending code is not cached, since it may be reverted
+    assert account_db.get_code(ADDRESS) == b'code'
+    assert len(code_caches[base_db]) == 0
+    account_db.persist()
+
+    AccountDB(base_db, account_db.state_root, track_witness=False).get_code(ADDRESS)
+    cache = code_caches[base_db]
+    assert keccak(b'code') in cache
+
+    # the next reader doesn't need the database
+    del base_db[keccak(b'code')]
+    assert AccountDB(
+        base_db,
+        account_db.state_root,
+        track_witness=False,
+    ).get_code(ADDRESS) == b'code'
+    assert cache.hits == 1
+
+
+def test_code_cache_is_dropped_with_its_database():
+    caches = CachesByDatabase(lambda: CodeCache(max_size=100))
+    db = AtomicDB()
+    cache = caches[db]
+    assert caches[db] is cache
+    assert caches[AtomicDB()] is not cache
+
+    del db
+    gc.collect()
+    assert len(caches) == 0
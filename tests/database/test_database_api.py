@@ -7,7 +7,12 @@ from eth.db.backends.memory import MemoryDB
 from eth.db.journal import JournalDB
 from eth.db.batch import BatchDB
 from eth.db.atomic import AtomicDB
+from eth.db.backends.segment import SegmentLogDB
 from eth.db.cache import CacheDB
+from eth.db.metrics import (
+    MetricsAtomicDB,
+    MetricsDB,
+)
 
 from eth.tools.db.base import DatabaseAPITestSuite
 
@@ -20,8 +25,11 @@ from eth.tools.db.base import DatabaseAPITestSuite
     CacheDB,
     KeyAccessLoggerAtomicDB,
     KeyAccessLoggerDB,
+    SegmentLogDB,
+    MetricsAtomicDB,
+    MetricsDB,
 ])
-def db(request):
+def db(request, tmpdir):
     base_db = MemoryDB()
     if request.param is JournalDB:
         yield JournalDB(base_db)
@@ -40,6 +48,15 @@ def db(request):
         yield KeyAccessLoggerAtomicDB(atomic_db)
     elif request.param is KeyAccessLoggerDB:
         yield KeyAccessLoggerDB(base_db)
+    elif request.param is SegmentLogDB:
+        segment_db = SegmentLogDB(db_path=tmpdir.mkdir("segment_db_path"))
+        yield segment_db
+        segment_db.close()
+    elif request.param is MetricsAtomicDB:
+        atomic_db = AtomicDB(base_db)
+        yield MetricsAtomicDB(atomic_db)
+    elif request.param is MetricsDB:
+        yield MetricsDB(base_db)
     else:
         raise Exception("Invariant")
 
@@ -0,0 +1,254 @@
+from hypothesis import (
+    given,
+    settings,
+    strategies as st,
+)
+import pytest
+
+from eth_hash.auto import keccak
+from eth_utils import (
+    ValidationError,
+)
+
+from eth.constants import (
+    EMPTY_SHA3,
+)
+from eth.db.account import AccountDB
+from eth.db.atomic import AtomicDB
+from eth.db.ephemeral import (
+    EphemeralAccountDB,
+)
+from eth.db.schema import SchemaV1
+
+
+ADDRESS = b'\xaa' * 20
+OTHER_ADDRESS = b'\xbb' * 20
+INVALID_ADDRESS = b'aa' * 20
+
+
+def make_base_account_db():
+    account_db = AccountDB(AtomicDB())
+    account_db.set_balance(ADDRESS, 10)
+    account_db.set_nonce(ADDRESS, 2)
+    account_db.set_code(ADDRESS, b'\x60\x00')
+    account_db.set_storage(ADDRESS, 1, 100)
+    account_db.set_storage(ADDRESS, 2, 200)
+    account_db.persist()
+    return account_db
+
+
+@pytest.fixture
+def base_account_db():
+    return make_base_account_db()
+
+
+@pytest.fixture
+def ephemeral_db(base_account_db):
+    return EphemeralAccountDB(base_account_db.fork())
+
+
+def test_reads_through_to_the_base(ephemeral_db, base_account_db):
+    assert ephemeral_db.state_root == base_account_db.state_root
+    assert ephemeral_db.get_balance(ADDRESS) == 10
+    assert ephemeral_db.get_nonce(ADDRESS) == 2
+    assert ephemeral_db.get_code(ADDRESS) == b'\x60\x00'
+    assert ephemeral_db.get_code_size(ADDRESS) == 2
+    assert ephemeral_db.get_storage(ADDRESS, 1) == 100
+    assert ephemeral_db.account_exists(ADDRESS)
+    assert not ephemeral_db.account_exists(OTHER_ADDRESS)
+
+    with pytest.raises(ValidationError):
+        ephemeral_db.get_balance(INVALID_ADDRESS)
+
+
+def test_writes_stay_out_of_the_base(ephemeral_db, base_account_db):
+    ephemeral_db.set_balance(ADDRESS, 11)
+    ephemeral_db.set_storage(ADDRESS, 1, 101)
+    ephemeral_db.set_code(OTHER_ADDRESS, b'\x00')
+    ephemeral_db.delete_storage(ADDRESS)
+
+    assert ephemeral_db.get_balance(ADDRESS) == 11
+    assert ephemeral_db.get_storage(ADDRESS, 1) == 0
+    assert ephemeral_db.get_storage(ADDRESS, 2) == 0
+    assert ephemeral_db.get_code(OTHER_ADDRESS) == b'\x00'
+
+    assert base_account_db.get_balance(ADDRESS) == 10
+    assert base_account_db.get_storage(ADDRESS, 1) == 100
+    assert base_account_db.get_storage(ADDRESS, 2) == 200
+    assert not base_account_db.account_exists(OTHER_ADDRESS)
+
+    with pytest.raises(ValidationError):
+        ephemeral_db.persist()
+
+
+def test_delete_account(ephemeral_db):
+    ephemeral_db.delete_account(ADDRESS)
+
+    assert not ephemeral_db.account_exists(ADDRESS)
+    assert ephemeral_db.get_balance(ADDRESS) == 0
+    assert ephemeral_db.get_code(ADDRESS) == b''
+    assert ephemeral_db.get_code_hash(ADDRESS) == EMPTY_SHA3
+    assert ephemeral_db.get_storage(ADDRESS, 1) == 0
+
+    ephemeral_db.touch_account(ADDRESS)
+    assert ephemeral_db.account_exists(ADDRESS)
+    assert ephemeral_db.account_is_empty(ADDRESS)
+
+
+def test_discard_and_commit(ephemeral_db):
+    outer = ephemeral_db.record()
+    ephemeral_db.set_storage(ADDRESS, 1, 101)
+
+    inner = ephemeral_db.record()
+    ephemeral_db.set_balance(ADDRESS, 11)
+    ephemeral_db.delete_account(ADDRESS)
+    ephemeral_db.discard(inner)
+
+    assert ephemeral_db.get_balance(ADDRESS) == 10
+    assert ephemeral_db.get_storage(ADDRESS, 1) == 101
+    assert ephemeral_db.get_storage(ADDRESS, 2) == 200
+
+    inner = ephemeral_db.record()
+    ephemeral_db.set_nonce(ADDRESS, 3)
+    ephemeral_db.commit(inner)
+    ephemeral_db.discard(outer)
+
+    assert ephemeral_db.get_nonce(ADDRESS) == 2
+    assert ephemeral_db.get_storage(ADDRESS, 1) == 100
+
+    with pytest.raises(ValidationError):
+        ephemeral_db.discard(outer)
+
+
+def test_original_storage(ephemeral_db):
+    ephemeral_db.set_storage(ADDRESS, 1, 101)
+    ephemeral_db.set_storage(ADDRESS, 1, 102)
+    assert ephemeral_db.get_storage(ADDRESS, 1, from_journal=False) == 100
+
+    ephemeral_db.lock_changes()
+    assert ephemeral_db.get_storage(ADDRESS, 1, from_journal=False) == 102
+
+    # Like with AccountDB, deleted storage is empty from the start of the transaction
+    ephemeral_db.delete_storage(ADDRESS)
+    ephemeral_db.set_storage(ADDRESS, 2, 202)
+    assert ephemeral_db.get_storage(ADDRESS, 1, from_journal=False) == 0
+    assert ephemeral_db.get_storage(ADDRESS, 2, from_journal=False) == 0
+
+
+def test_original_storage_after_reverting_a_deletion(ephemeral_db):
+    ephemeral_db.set_storage(ADDRESS, 1, 101)
+    ephemeral_db.lock_changes()
+
+    checkpoint = ephemeral_db.record()
+    ephemeral_db.delete_storage(ADDRESS)
+    ephemeral_db.discard(checkpoint)
+    ephemeral_db.set_storage(ADDRESS, 1, 102)
+
+    assert ephemeral_db.get_storage(ADDRESS, 1) == 102
+    assert ephemeral_db.get_storage(ADDRESS, 1, from_journal=False) == 101
+
+
+def test_forks_share_the_base(ephemeral_db):
+    forked_db = ephemeral_db.fork()
+    assert forked_db._base_db is ephemeral_db._base_db
+
+    forked_db.set_balance(ADDRESS, 11)
+    assert ephemeral_db.get_balance(ADDRESS) == 10
+
+    state_root = forked_db.make_state_root()
+    assert state_root != ephemeral_db.state_root
+    assert ephemeral_db.get_balance(ADDRESS) == 10
+    assert ephemeral_db.fork().get_balance(ADDRESS) == 10
+
+    with pytest.raises(ValidationError):
+        forked_db.fork()
+
+
+def test_make_state_root_after_reading_unindexed_code_size():
+    base_db = AtomicDB()
+    account_db = AccountDB(base_db)
+    account_db.set_code(ADDRESS, b'\x60\x01')
+    account_db.persist()
+    del base_db[SchemaV1.make_code_hash_to_size_lookup_key(keccak(b'\x60\x01'))]
+
+    ephemeral_db = EphemeralAccountDB(AccountDB(base_db, account_db.state_root))
+    forked_db = ephemeral_db.fork()
+    assert forked_db.get_code_size(ADDRESS) == 2
+
+    forked_db.set_balance(ADDRESS, 1)
+    assert forked_db.make_state_root() != ephemeral_db.state_root
+    assert ephemeral_db.get_code_size(ADDRESS) == 2
+
+
+ADDRESSES = st.sampled_from((ADDRESS, OTHER_ADDRESS, b'\xcc' * 20))
+
+CHANGES = st.lists(st.one_of(
+    st.tuples(st.just('set_balance'), ADDRESSES, st.integers(0, 3)),
+    st.tuples(st.just('set_nonce'), ADDRESSES, st.integers(0, 3)),
+    st.tuples(st.just('set_code'), ADDRESSES, st.sampled_from((b'', b'\x00', b'\x60\x00'))),
+    st.tuples(st.just('set_storage'), ADDRESSES, st.integers(0, 3), st.integers(0, 3)),
+    st.tuples(st.just('delete_code'), ADDRESSES),
+    st.tuples(st.just('touch_account'), ADDRESSES),
+    st.tuples(st.just('record')),
+    st.tuples(st.just('discard')),
+    st.tuples(st.just('commit')),
+    st.tuples(st.just('lock_changes')),
+), max_size=30)
+
+# AccountDB can only revert across a single deletion of the storage. It is made before the
+# first lock: after deleting the storage, AccountDB still reads the storage written by
+# earlier transactions as original, which execution never runs into. Only the storage of
+# accounts without code is deleted, which earlier transactions can't have written.
+DELETIONS = st.one_of(
+    st.none(),
+    st.tuples(st.sampled_from(('delete_storage', 'delete_account')), ADDRESSES),
+)
+
+
+@given(CHANGES, DELETIONS, st.integers(min_value=0))
+@settings(max_examples=200, deadline=None)
+def test_same_state_as_account_db(changes, deletion, deletion_index):
+    base_account_db = make_base_account_db()
+    account_db = base_account_db.fork()
+    ephemeral_db = EphemeralAccountDB(base_account_db.fork())
+
+    if deletion is not None:
+        first_lock_index = next(
+            (index for index, (name, *_) in enumerate(changes) if name == 'lock_changes'),
+            len(changes),
+        )
+        changes.insert(deletion_index % (first_lock_index + 1), deletion)
+
+    checkpoints = []
+    for name, *args in changes:
+        if name == 'record':
+            checkpoints.append((account_db.record(), ephemeral_db.record()))
+        elif name == 'lock_changes':
+            # Like the VM, only lock the changes between transactions
+            if not checkpoints:
+                account_db.lock_changes()
+                ephemeral_db.lock_changes()
+        elif name in ('discard', 'commit'):
+            if checkpoints:
+                checkpoint, ephemeral_checkpoint = checkpoints.pop()
+                getattr(account_db, name)(checkpoint)
+                getattr(ephemeral_db, name)(ephemeral_checkpoint)
+        else:
+            getattr(account_db, name)(*args)
+            getattr(ephemeral_db, name)(*args)
+
+        for address in (ADDRESS, OTHER_ADDRESS):
+            assert ephemeral_db.account_exists(address) == account_db.account_exists(address)
+            assert ephemeral_db.get_balance(address) == account_db.get_balance(address)
+            assert ephemeral_db.get_code(address) == account_db.get_code(address)
+            for slot in range(4):
+                assert (
+                    ephemeral_db.get_storage(address, slot)
+                    == account_db.get_storage(address, slot)
+                )
+                assert (
+                    ephemeral_db.get_storage(address, slot, from_journal=False)
+                    == account_db.get_storage(address, slot, from_journal=False)
+                )
+
+    assert ephemeral_db.make_state_root() == account_db.make_state_root()
@@ -22,6 +22,7 @@ from eth.db.chain import (
 )
 from eth.db.chain_gaps import GENESIS_CHAIN_GAPS
 from eth.db.schema import SchemaV1
+from eth.db.trie import make_trie_root_and_nodes
 from eth.exceptions import (
     BlockNotFound,
     HeaderNotFound,
@@ -32,6 +33,8 @@ from eth.exceptions import (
 from eth.rlp.headers import (
     BlockHeader,
 )
+from eth.rlp.logs import Log
+from eth.rlp.receipts import Receipt
 from eth.tools.builder.chain import api
 from eth.tools.rlp import (
     assert_headers_eq,
@@ -360,6 +363,124 @@ def test_chaindb_get_receipt_and_tx_by_index(chain, funded_address, funded_addre
         )
 
 
+def test_chaindb_reads_flat_receipts_and_transactions(
+        chain,
+        funded_address,
+        funded_address_private_key):
+    (block, receipts), = mine_blocks_with_receipts(
+        chain,
+        1,
+        3,
+        funded_address,
+        funded_address_private_key,
+    )
+    chaindb = chain.chaindb
+    header = block.header
+    tx_class = block.transaction_class
+    flat_keys = (
+        SchemaV1.make_transaction_root_to_transactions_lookup_key(header.transaction_root),
+        SchemaV1.make_receipt_root_to_receipts_lookup_key(header.receipt_root),
+    )
+
+    def assert_block_bodies_retrievable():
+        assert chaindb.get_receipts(header, type(receipts[0])) == tuple(receipts)
+        assert chaindb.get_block_transaction_hashes(header) == tuple(
+            transaction.hash for transaction in block.transactions
+        )
+        for index, (transaction, receipt) in enumerate(zip(block.transactions, receipts)):
+            assert chaindb.get_transaction_by_index(block.number, index, tx_class) == transaction
+            assert chaindb.get_receipt_by_index(block.number, index) == receipt
+
+        with pytest.raises(ReceiptNotFound):
+            chaindb.get_receipt_by_index(block.number, len(receipts))
+
+    assert all(chaindb.exists(key) for key in flat_keys)
+    assert_block_bodies_retrievable()
+
+    # the tries are still there, for databases written before the flat copies existed
+    for key in flat_keys:
+        del chaindb.db[key]
+    assert_block_bodies_retrievable()
+
+
+class SmallSectionChainDB(ChainDB):
+    bloom_bits_section_size = 4
+
+
+def persist_blocks_with_logs(chaindb, parent_header, logs_by_block, difficulty=1):
+    """
+    Persist a block on top of the parent for each entry of ``logs_by_block``, with a
+    single receipt holding the given logs.
+    """
+    header = parent_header
+    for logs in logs_by_block:
+        receipt = Receipt(b'', 0, logs)
+        receipt_root, _ = make_trie_root_and_nodes((receipt,))
+        header = BlockHeader(
+            difficulty,
+            header.block_number + 1,
+            1,
+            parent_hash=header.hash,
+            receipt_root=receipt_root,
+            bloom=receipt.bloom,
+        )
+        chaindb.persist_unexecuted_block(FrontierBlock(header), (receipt,))
+    return header
+
+
+def test_chaindb_get_logs(base_db):
+    chaindb = SmallSectionChainDB(base_db)
+    genesis = BlockHeader(difficulty=1, block_number=0, gas_limit=1)
+    chaindb.persist_unexecuted_block(FrontierBlock(genesis), ())
+
+    a_log = Log(A_ADDRESS, [1], b'a')
+    b_log = Log(B_ADDRESS, [2], b'b')
+    # blocks 1 to 9, so the sections of blocks 0-3 and 4-7 are indexed, but not 8-11
+    persist_blocks_with_logs(chaindb, genesis, (
+        (), (a_log,), (), (), (b_log,), (), (), (), (b_log, a_log),
+    ))
+    section_head_keys = tuple(
+        SchemaV1.make_bloom_bits_section_head_lookup_key(section) for section in range(3)
+    )
+    assert tuple(chaindb.exists(key) for key in section_head_keys) == (True, True, False)
+
+    def get_log_positions(from_block=0, to_block=100, addresses=(), topics=()):
+        return tuple(
+            (match.block_number, match.transaction_index, match.log_index)
+            for match in chaindb.get_logs(from_block, to_block, addresses, topics)
+        )
+
+    assert get_log_positions(addresses=[A_ADDRESS]) == ((2, 0, 0), (9, 0, 1))
+    assert get_log_positions(topics=[[2]]) == ((5, 0, 0), (9, 0, 0))
+    assert get_log_positions(addresses=[A_ADDRESS], topics=[[2]]) == ()
+    assert get_log_positions(addresses=[A_ADDRESS, B_ADDRESS]) == (
+        (2, 0, 0), (5, 0, 0), (9, 0, 0), (9, 0, 1),
+    )
+    assert get_log_positions(3, 8) == ((5, 0, 0),)
+    assert get_log_positions(6, 5) == ()
+
+    match, = chaindb.get_logs(0, 2)
+    assert match.log == a_log
+    assert match.block_hash == chaindb.get_canonical_block_hash(2)
+
+    # a heavier fork from block 3 replaces the indexed section of blocks 4-7
+    fork_head = persist_blocks_with_logs(
+        chaindb,
+        chaindb.get_canonical_block_header_by_number(3),
+        ((), (), (a_log,), ()),
+        difficulty=10,
+    )
+    assert chaindb.get_canonical_head() == fork_head
+    assert chaindb.get(section_head_keys[1]) == fork_head.hash
+    assert get_log_positions(addresses=[A_ADDRESS]) == ((2, 0, 0), (6, 0, 0))
+    assert get_log_positions(addresses=[B_ADDRESS]) == ()
+
+    # without the index, the blooms in the headers give the same results
+    for key in section_head_keys[:2]:
+        del chaindb.db[key]
+    assert get_log_positions(addresses=[A_ADDRESS]) == ((2, 0, 0), (6, 0, 0))
+
+
 @pytest.mark.parametrize(
     "use_persist_unexecuted_block",
     (
@@ -984,3 +984,110 @@ def test_headerdb_header_exists(headerdb, genesis_header):
     # both `chain_a` & `chain_b` should now all exist
     assert all(headerdb.header_exists(h.hash) for h in chain_a)
     assert all(headerdb.header_exists(h.hash) for h in chain_b)
+
+
+def test_headerdb_caches_headers_and_canonical_hashes(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+    headers = mk_header_chain(genesis_header, length=3)
+    headerdb.persist_header_chain(headers)
+
+    for _ in range(2):
+        for header in headers:
+            actual = headerdb.get_canonical_block_header_by_number(header.block_number)
+            assert_headers_eq(actual, header)
+
+    header_stats, canonical_hash_stats = headerdb.cache_info()
+    assert (header_stats.hits, header_stats.misses) == (3, 3)
+    assert (canonical_hash_stats.hits, canonical_hash_stats.misses) == (3, 3)
+    assert canonical_hash_stats.hit_rate == 0.5
+
+    # lookups of non-canonical numbers are not cached
+    for _ in range(2):
+        with pytest.raises(HeaderNotFound):
+            headerdb.get_canonical_block_hash(10)
+    assert headerdb.cache_info().canonical_hashes.misses == 5
+
+
+def test_headerdb_canonical_hash_cache_follows_reorg(headerdb, genesis_header):
+    headerdb.persist_header(genesis_header)
+    chain_a = mk_header_chain(genesis_header, 4)
+    chain_b = mk_header_chain(genesis_header, 2)
+    headerdb.persist_header_chain(chain_a)
+
+    # fill the cache with chain_a
+    assert_is_canonical_chain(headerdb, chain_a)
+
+    # fork away to a checkpoint on chain_b, so that the later numbers of chain_a are orphaned
+    checkpoint = chain_b[-1]
+    score = get_score(genesis_header, chain_a) + 1
+    headerdb.persist_checkpoint_header(checkpoint, score)
+
+    assert headerdb.get_canonical_head() == checkpoint
+    assert headerdb.get_canonical_block_hash(checkpoint.block_number) == checkpoint.hash
+    for orphan in chain_a[checkpoint.block_number:]:
+        with pytest.raises(HeaderNotFound):
+            headerdb.get_canonical_block_hash(orphan.block_number)
+
+
+def _persist_headers_one_by_one(db, headers):
+    headerdb = HeaderDB(db)
+    return tuple(headerdb.persist_header(header) for header in headers)
+
+
+@pytest.mark.parametrize('from_checkpoint', (False, True))
+def test_headerdb_persist_header_chain_on_head_matches_one_by_one(genesis_header, from_checkpoint):
+    headers = mk_header_chain(genesis_header, length=12)
+    if from_checkpoint:
+        base_headers = ()
+        checkpoint = headers[4]
+        new_headers = headers[5:]
+    else:
+        base_headers = (genesis_header,) + headers[:2]
+        new_headers = headers[2:]
+
+    one_by_one_db = AtomicDB()
+    bulk_db = AtomicDB()
+    for db in (one_by_one_db, bulk_db):
+        if from_checkpoint:
+            checkpoint_score = get_score(genesis_header, headers[:5])
+            HeaderDB(db).persist_checkpoint_header(checkpoint, checkpoint_score)
+        _persist_headers_one_by_one(db, base_headers)
+
+    results = _persist_headers_one_by_one(one_by_one_db, new_headers)
+    bulk_result = HeaderDB(bulk_db).persist_header_chain(new_headers)
+
+    assert bulk_result == (new_headers, ())
+    assert tuple(header for new, _ in results for header in new) == new_headers
+    assert bulk_db.wrapped_db.kv_store == one_by_one_db.wrapped_db.kv_store
+
+
+@pytest.mark.parametrize('batch_size', (1, 3, 20))
+def test_headerdb_persist_header_chain_in_batches(genesis_header, batch_size):
+    headers = mk_header_chain(genesis_header, length=10)
+
+    expected_db = AtomicDB()
+    _persist_headers_one_by_one(expected_db, (genesis_header,) + headers)
+
+    db = AtomicDB()
+    headerdb = HeaderDB(db)
+    headerdb.persist_header_chain_in_batches(
+        (header for header in (genesis_header,) + headers),
+        batch_size=batch_size,
+    )
+
+    assert_headers_eq(headerdb.get_canonical_head(), headers[-1])
+    assert db.wrapped_db.kv_store == expected_db.wrapped_db.kv_store
+
+
+def test_headerdb_persist_header_chain_in_batches_checks_links_between_batches(
+        headerdb,
+        genesis_header):
+    headerdb.persist_header(genesis_header)
+    headers = mk_header_chain(genesis_header, length=4)
+    non_contiguous_headers = headers[:2] + headers[3:]
+
+    with pytest.raises(ValidationError, match="Non-contiguous chain"):
+        headerdb.persist_header_chain_in_batches(non_contiguous_headers, batch_size=2)
+
+    # the first batch was committed
+    assert_headers_eq(headerdb.get_canonical_head(), headers[1])
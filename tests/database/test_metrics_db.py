@@ -0,0 +1,135 @@
+import inspect
+
+import pytest
+
+from eth_typing import Hash32
+
+from eth.db.atomic import AtomicDB
+from eth.db.backends.memory import MemoryDB
+from eth.db.metrics import (
+    BLOCK_RECEIPTS_CATEGORY,
+    BLOCK_TRANSACTIONS_CATEGORY,
+    BLOOM_BITS_CATEGORY,
+    CANONICAL_NUMBER_CATEGORY,
+    CHAIN_METADATA_CATEGORY,
+    CODE_SIZE_CATEGORY,
+    HASH_KEYED_CATEGORY,
+    OTHER_CATEGORY,
+    SCORE_CATEGORY,
+    TRANSACTION_LOOKUP_CATEGORY,
+    DBMetrics,
+    MetricsAtomicDB,
+    MetricsDB,
+    classify_key,
+)
+from eth.db.schema import SchemaV1
+
+
+A_HASH = b'\x01' * 32
+
+
+@pytest.mark.parametrize('key, expected', (
+    (SchemaV1.make_block_number_to_hash_lookup_key(3), CANONICAL_NUMBER_CATEGORY),
+    (SchemaV1.make_block_hash_to_score_lookup_key(A_HASH), SCORE_CATEGORY),
+    (SchemaV1.make_transaction_hash_to_block_lookup_key(A_HASH), TRANSACTION_LOOKUP_CATEGORY),
+    (
+        SchemaV1.make_transaction_root_to_transactions_lookup_key(A_HASH),
+        BLOCK_TRANSACTIONS_CATEGORY,
+    ),
+    (SchemaV1.make_receipt_root_to_receipts_lookup_key(A_HASH), BLOCK_RECEIPTS_CATEGORY),
+    (SchemaV1.make_bloom_bits_lookup_key(2047, 1), BLOOM_BITS_CATEGORY),
+    (SchemaV1.make_bloom_bits_section_head_lookup_key(1), BLOOM_BITS_CATEGORY),
+    (SchemaV1.make_code_hash_to_size_lookup_key(A_HASH), CODE_SIZE_CATEGORY),
+    (SchemaV1.make_canonical_head_hash_lookup_key(), CHAIN_METADATA_CATEGORY),
+    (SchemaV1.make_header_chain_gaps_lookup_key(), CHAIN_METADATA_CATEGORY),
+    (A_HASH, HASH_KEYED_CATEGORY),
+    (b'unknown', OTHER_CATEGORY),
+))
+def test_classify_key(key, expected):
+    assert classify_key(key) == expected
+
+
+@pytest.mark.parametrize('make_key', (
+    getattr(SchemaV1, name) for name in dir(SchemaV1) if name.startswith('make_')
+))
+def test_every_schema_key_is_classified(make_key):
+    arguments = {
+        name: A_HASH if parameter.annotation is Hash32 else 1
+        for name, parameter in inspect.signature(make_key).parameters.items()
+    }
+    assert classify_key(make_key(**arguments)) not in (HASH_KEYED_CATEGORY, OTHER_CATEGORY)
+
+
+@pytest.mark.parametrize('DB', (
+    lambda: MetricsDB(MemoryDB()),
+    lambda: MetricsAtomicDB(AtomicDB()),
+))
+def test_metrics_counts(DB):
+    db = DB()
+    number_key = SchemaV1.make_block_number_to_hash_lookup_key(0)
+
+    db[number_key] = A_HASH
+    db[A_HASH] = b'node'
+    assert db[number_key] == A_HASH
+    assert A_HASH in db
+    assert b'missing' not in db
+    with pytest.raises(KeyError):
+        db[b'missing']
+    del db[A_HASH]
+
+    report = db.metrics.as_dict()
+    assert set(report.keys()) == {CANONICAL_NUMBER_CATEGORY, HASH_KEYED_CATEGORY, OTHER_CATEGORY}
+
+    canonical = report[CANONICAL_NUMBER_CATEGORY]
+    assert canonical['reads'] == canonical['hits'] == 1
+    assert canonical['writes'] == 1
+    assert canonical['bytes_read'] == canonical['bytes_written'] == 32
+    assert sum(canonical['read_latency_histogram']) == 1
+
+    hashed = report[HASH_KEYED_CATEGORY]
+    assert hashed['reads'] == 0
+    assert hashed['existence_checks'] == hashed['existence_hits'] == 1
+    assert hashed['bytes_written'] == 4
+    assert hashed['deletes'] == 1
+    assert sum(hashed['write_latency_histogram']) == 2
+
+    other = report[OTHER_CATEGORY]
+    assert other['reads'] == other['misses'] == 1
+    assert other['hits'] == 0
+    assert other['existence_checks'] == 1
+    assert other['existence_hits'] == 0
+
+    db.metrics.reset()
+    assert db.metrics.as_dict() == {}
+
+
+def test_metrics_atomic_batch_is_recorded():
+    db = MetricsAtomicDB(AtomicDB())
+    with db.atomic_batch() as batch:
+        batch[A_HASH] = b'node'
+        assert batch[A_HASH] == b'node'
+
+    assert db[A_HASH] == b'node'
+    hashed = db.metrics.as_dict()[HASH_KEYED_CATEGORY]
+    assert hashed['writes'] == 1
+    assert hashed['hits'] == 2
+
+
+def test_metrics_shared_between_layers():
+    metrics = DBMetrics(classify=lambda key: 'everything')
+    base_db = MetricsDB(MemoryDB(), metrics)
+    outer_db = MetricsDB(base_db, metrics)
+
+    outer_db[b'key'] = b'value'
+
+    assert metrics.as_dict()['everything']['writes'] == 2
+
+
+def test_metrics_format_report():
+    db = MetricsDB(MemoryDB())
+    db[A_HASH] = b'node'
+    assert db[A_HASH] == b'node'
+
+    header, row = db.metrics.format_report().splitlines()
+    assert header.split()[0] == 'category'
+    assert row.split()[:8] == [HASH_KEYED_CATEGORY, '1', '1', '0', '1', '0', '4', '4']
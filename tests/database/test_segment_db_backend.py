@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+
+from eth_utils import ValidationError
+
+from eth.db.backends import segment
+from eth.db.backends.segment import (
+    SEGMENT_SUFFIX,
+    SegmentLogDB,
+)
+
+
+@pytest.fixture
+def db_path(tmpdir):
+    return tmpdir.mkdir("segment_db_path")
+
+
+def _segment_files(db_path):
+    return sorted(path.basename for path in db_path.listdir() if path.ext == SEGMENT_SUFFIX)
+
+
+def test_index_is_rebuilt_on_reopen(db_path):
+    db = SegmentLogDB(db_path)
+    db[b'key-1'] = b'value-1'
+    db[b'key-2'] = b'value-2'
+    db[b'key-1'] = b'value-1b'
+    del db[b'key-2']
+    with db.atomic_batch() as batch:
+        batch[b'key-3'] = b'value-3'
+        batch[b'key-4'] = b'value-4'
+    db.close()
+
+    reopened = SegmentLogDB(db_path)
+    assert reopened[b'key-1'] == b'value-1b'
+    assert b'key-2' not in reopened
+    assert reopened[b'key-3'] == b'value-3'
+    assert reopened[b'key-4'] == b'value-4'
+    assert len(reopened) == 3
+
+
+def test_incomplete_write_is_dropped_on_reopen(db_path):
+    db = SegmentLogDB(db_path)
+    db[b'key-1'] = b'value-1'
+    with db.atomic_batch() as batch:
+        batch[b'key-2'] = b'value-2'
+        batch[b'key-3'] = b'value-3'
+    db.close()
+
+    # simulate a crash in the middle of writing the batch
+    segment_path = db_path.join(_segment_files(db_path)[-1])
+    segment_data = segment_path.read_binary()
+    segment_path.write_binary(segment_data[:-3])
+
+    reopened = SegmentLogDB(db_path)
+    assert reopened[b'key-1'] == b'value-1'
+    assert b'key-2' not in reopened
+    assert b'key-3' not in reopened
+
+    # the log remains writable after dropping the partial write
+    reopened[b'key-2'] = b'value-2b'
+    reopened.close()
+    assert SegmentLogDB(db_path)[b'key-2'] == b'value-2b'
+
+
+def test_corrupt_sealed_segment_raises(db_path):
+    db = SegmentLogDB(db_path, max_segment_size=1)
+    db[b'key-1'] = b'value-1'
+    db[b'key-2'] = b'value-2'
+    db.close()
+
+    oldest_path = db_path.join(_segment_files(db_path)[0])
+    oldest_path.write_binary(oldest_path.read_binary()[:-1])
+
+    with pytest.raises(ValidationError):
+        SegmentLogDB(db_path)
+
+
+def test_segments_rotate(db_path):
+    db = SegmentLogDB(db_path, max_segment_size=64)
+    for index in range(10):
+        db[b'key-%d' % index] = b'value' * 4
+
+    assert len(_segment_files(db_path)) > 1
+    for index in range(10):
+        assert db[b'key-%d' % index] == b'value' * 4
+
+
+def test_compaction_reclaims_dead_values(db_path):
+    db = SegmentLogDB(db_path, max_segment_size=64, compaction_ratio=0.25)
+    for index in range(10):
+        db[b'key-%d' % index] = b'original'
+    for index in range(0, 10, 2):
+        db[b'key-%d' % index] = b'overwritten'
+    for index in range(1, 10, 2):
+        del db[b'key-%d' % index]
+
+    assert db.garbage_ratio > 0.25
+    assert db.compact_if_needed()
+    assert db.garbage_ratio == 0
+    assert not db.compact_if_needed()
+
+    def assert_compacted_values(db):
+        for index in range(0, 10, 2):
+            assert db[b'key-%d' % index] == b'overwritten'
+        for index in range(1, 10, 2):
+            assert b'key-%d' % index not in db
+
+    assert_compacted_values(db)
+    db.close()
+
+    # deleted values must not be resurrected when replaying the compacted log
+    assert_compacted_values(SegmentLogDB(db_path))
+
+
+def test_writes_continue_during_compaction(db_path, monkeypatch):
+    monkeypatch.setattr(segment, 'COMPACTION_CHUNK_SIZE', 2)
+    db = SegmentLogDB(db_path, max_segment_size=64)
+    for index in range(10):
+        db[b'key-%d' % index] = b'original'
+
+    rewrite_live_values = db._rewrite_live_values
+
+    def write_from_another_thread():
+        db[b'key-8'] = b'overwritten'
+        del db[b'key-9']
+        db[b'key-10'] = b'new'
+
+    def rewrite_and_write_concurrently(keys, sealed_ids):
+        num_rewritten = rewrite_live_values(keys, sealed_ids)
+        if b'key-0' in keys:
+            # would block if compaction held the lock between chunks
+            writer = threading.Thread(target=write_from_another_thread)
+            writer.start()
+            writer.join(timeout=5)
+            assert not writer.is_alive()
+        return num_rewritten
+
+    monkeypatch.setattr(db, '_rewrite_live_values', rewrite_and_write_concurrently)
+    db.compact()
+
+    def assert_values(db):
+        for index in range(8):
+            assert db[b'key-%d' % index] == b'original'
+        assert db[b'key-8'] == b'overwritten'
+        assert b'key-9' not in db
+        assert db[b'key-10'] == b'new'
+
+    assert_values(db)
+    db.close()
+
+    # the compacted values must not shadow the writes made during compaction
+    assert_values(SegmentLogDB(db_path))